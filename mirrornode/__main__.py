@@ -1,4 +1,17 @@
 import argparse
+import os
+
+def add_mock_provider_args(parser) -> None:
+    """Options read by mock_provider.config_from_args (kept here so parsing stays light)."""
+    parser.add_argument("--latency", default="lognormal:50:0.5",
+                        help="kind[:ms[:spread]], kind in fixed|uniform|exponential|lognormal")
+    parser.add_argument("--token-ms", type=float, default=2.0, help="Delay between streamed tokens")
+    parser.add_argument("--completion-tokens", type=int, default=32)
+    parser.add_argument("--error-429", type=float, default=0.0, help="Fraction of requests answered 429")
+    parser.add_argument("--error-5xx", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--error-timeout", type=float, default=0.0, help="Fraction of requests that hang")
+    parser.add_argument("--timeout-s", type=float, default=30.0, help="How long a hanging request hangs")
+    parser.add_argument("--seed", type=int, default=0)
 
 def main() -> int:
     p = argparse.ArgumentParser(prog="mirrornode")
@@ -7,15 +20,54 @@ def main() -> int:
     sweep = sub.add_parser("sweep", help="Run Osiris system sweep and write artifacts")
     sweep.add_argument("--out", default="artifacts")
     sweep.add_argument("--oracle", choices=["off", "auto", "on"], default="off")
-    sweep.add_argument("--ray", choices=["off", "validate", "local"], default="validate")
+    sweep.add_argument("--ray", choices=["off", "validate", "local"], default="validate",
+                       help="Orchestrator backend: off=asyncio, local=ray, "
+                            "validate=asyncio, reporting whether ray is installed")
     sweep.add_argument("--fail-fast", action="store_true")
 
+    replay = sub.add_parser("replay", help="Re-dispatch persisted events to adapters")
+    replay.add_argument("--log", default=os.getenv("MIRRORNODE_EVENT_LOG_DIR", "logs/events"))
+    replay.add_argument("--since", help="ISO timestamp, inclusive")
+    replay.add_argument("--until", help="ISO timestamp, exclusive")
+    replay.add_argument("--trace", action="append", help="Only this trace_id (repeatable)")
+    replay.add_argument("--speed", default="1", help="Speed multiplier, or 'max'")
+    replay.add_argument("--adapters", help="Comma-separated adapter names (default: all)")
+    replay.add_argument("--checkpoint", help="Checkpoint file for resumable replays")
+
+    mock = sub.add_parser("mock-provider", help="Serve a local OpenAI/Anthropic mock for load tests")
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=8099)
+
+    bench = sub.add_parser("bench", help="Benchmark router/orchestrator against the mock provider")
+    bench.add_argument("--target", choices=["router", "orchestrator", "all"], default="all")
+    bench.add_argument("--requests", type=int, default=500)
+    bench.add_argument("--concurrency", type=int, default=32)
+    bench.add_argument("--adapters", help="Router adapters, comma-separated (default: claude,gpt)")
+    bench.add_argument("--backend", choices=["asyncio", "process", "ray"], default="asyncio",
+                       help="Orchestrator backend")
+    bench.add_argument("--out", help="Write the JSON report here")
+
+    add_mock_provider_args(mock)
+    add_mock_provider_args(bench)
+
     args = p.parse_args()
 
     if args.cmd == "sweep":
         from mirrornode.sweep import run_sweep
         return run_sweep(args)
 
+    if args.cmd == "replay":
+        from mirrornode.core.bridge.replay import run_replay
+        return run_replay(args)
+
+    if args.cmd == "mock-provider":
+        from mirrornode.core.bench.mock_provider import run_mock_provider
+        return run_mock_provider(args)
+
+    if args.cmd == "bench":
+        from mirrornode.core.bench.harness import run_bench
+        return run_bench(args)
+
     return 2
 
 if __name__ == "__main__":
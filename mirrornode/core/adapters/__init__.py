@@ -1,19 +1,4 @@
-from abc import ABC, abstractmethod
-from typing import Any
-from mirrornode.core.events.schema import MirrorNodeEvent
-
-
-class BaseAdapter(ABC):
-    name: str = "base"
-
-    @abstractmethod
-    async def handle(self, event: MirrorNodeEvent) -> None:
-        """
-        Handle an incoming MirrorNodeEvent.
-        Implementations should be non-blocking and return quickly.
-        """
-        raise NotImplementedError()
-
+from .base import BaseAdapter
 
 # Export all adapters
 from .gpt import GptAdapter
@@ -28,4 +13,3 @@ __all__ = [
     "GrokAdapter",
     "TheiaAdapter",
 ]
-
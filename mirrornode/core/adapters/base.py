@@ -1,79 +1,300 @@
-from abc import ABC, abstractmethod
-from datetime import datetime, timezone
-from typing import Dict, Any, Tuple, Optional
+import asyncio
+import logging
+import math
+import time
+from abc import ABC
+from typing import AsyncIterator, Dict, Any, Sequence, Tuple, Optional
 
+from mirrornode.core.adapters.resilience import Admission, CircuitBreaker, RetryPolicy
 from mirrornode.core.contracts.adapter_response import (
     AdapterResponse,
     AdapterStatus,
 )
+from mirrornode.core.events.schema import MirrorNodeEvent
+from mirrornode.core.metering import BudgetExceeded, UsageMeter, estimate_tokens
+
+logger = logging.getLogger(__name__)
 
 
 class BaseAdapter(ABC):
     """
     Canonical base adapter.
     Enforces AdapterResponse contract.
+    Subclasses implement _ainvoke() (native async) or _invoke() (blocking).
+
+    Prompts are split into static system segments (the event's `agent`
+    canon prompt and `system` text) and the dynamic user turn. Every
+    _invoke()/_ainvoke() takes `system` and receives the segments in order
+    (empty for events without them), so
+    providers with prompt caching can cache the shared prefix.
+
+    Calls go through a per-adapter CircuitBreaker (fast-fail UNAVAILABLE
+    while open) and a RetryPolicy for transient errors.
+
+    When a UsageMeter is attached (`meter`), handle() reserves the
+    submitting key's token budget before the provider call and records
+    token usage and latency after it; metered_stream() does the same
+    around a streaming adapter's stream().
+
+    Every adapter's handle() returns an AdapterResponse.
     """
 
-    def __init__(self, node_id: str):
-        self.node_id = node_id
+    name: str = "base"
+    max_tokens: int = 512
+    meter: Optional[UsageMeter] = None
+
+    def __init__(
+        self,
+        node_id: Optional[str] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        self.node_id = node_id or self.name
+        self.breaker = breaker or CircuitBreaker()
+        self.retry = retry or RetryPolicy()
 
-    @abstractmethod
-    def _invoke(self, prompt: str) -> Dict[str, Any]:
+    def _invoke(self, prompt: str, system: Sequence[str] = ()) -> Dict[str, Any]:
         """
-        Provider-specific implementation.
+        Blocking provider implementation.
         May raise exceptions.
         """
         raise NotImplementedError
 
-    def invoke(self, prompt: str) -> AdapterResponse:
+    async def _ainvoke(self, prompt: str, system: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        Async provider implementation.
+        Adapters with native async clients override this; the default
+        runs _invoke() on a worker thread.
+        """
+        return await asyncio.to_thread(self._invoke, prompt, system)
+
+    async def handle(self, event: MirrorNodeEvent) -> AdapterResponse:
+        """
+        Event entrypoint used by the router and orchestrator.
+        Delegates to ainvoke() with the event's prompt (or message) and
+        system segments.
+        """
+        logger.info("[%s] handling event %s", self.name.upper(), event.trace_id)
+        logger.debug("[%s] payload=%r", self.name.upper(), event.payload)
+
+        prompt = (
+            event.payload.get("prompt")
+            or event.payload.get("message")
+            or ""
+        )
+        try:
+            system = await self._system_segments(event)
+        except (RuntimeError, ValueError) as e:
+            return self._failure(
+                e, time.perf_counter(), "prompt_not_found", None,
+                status=AdapterStatus.ERROR,
+            )
+        if self.meter is None:
+            return await self.ainvoke(prompt, system)
+
+        key_id = event._api_key_id
+        try:
+            reservation = self.meter.admit(key_id, "".join(system) + prompt, self.max_tokens)
+        except BudgetExceeded as e:
+            return self._failure(
+                e, time.perf_counter(), "budget_exceeded", None,
+                status=AdapterStatus.UNAVAILABLE,
+            )
+        try:
+            response = await self.ainvoke(prompt, system)
+            payload = response.payload or {}
+            self.meter.record(
+                self.name,
+                key_id,
+                event.trace_id,
+                prompt_tokens=payload.get("prompt_tokens") or 0,
+                completion_tokens=payload.get("completion_tokens") or 0,
+                latency_ms=response.latency_ms or 0.0,
+                error=not response.ok,
+                reservation=reservation,
+            )
+        finally:
+            self.meter.release(reservation)
+        return response
+
+    async def metered_stream(
+        self,
+        prompt: str,
+        key_id: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        system: Sequence[str] = (),
+    ) -> AsyncIterator[str]:
+        """
+        stream() under the submitting key's token budget.
+        Reserves before the provider stream opens (raises BudgetExceeded),
+        records the streamed usage when the stream ends, fails or is
+        abandoned, then releases what the reservation still holds.
         """
-        Public entrypoint.
+        if self.meter is None:
+            async for text in self.stream(prompt, system):
+                yield text
+            return
+
+        sent = "".join(system) + prompt
+        reservation = self.meter.admit(key_id, sent, self.max_tokens)
+        start = time.perf_counter()
+        parts = []
+        ok = False
+        try:
+            async for text in self.stream(prompt, system):
+                parts.append(text)
+                yield text
+            ok = True
+        finally:
+            # streams carry no usage block; charge what was delivered
+            self.meter.record(
+                self.name,
+                key_id,
+                trace_id,
+                prompt_tokens=estimate_tokens(sent),
+                completion_tokens=estimate_tokens("".join(parts)) if parts else 0,
+                latency_ms=(time.perf_counter() - start) * 1000,
+                error=not ok,
+                reservation=reservation,
+            )
+            self.meter.release(reservation)
+
+    async def _system_segments(self, event: MirrorNodeEvent) -> Tuple[str, ...]:
+        """
+        Static prompt segments for an event: the canon prompt named by
+        payload["agent"] (prompt_loader), then payload["system"] (a string
+        or list of strings).
+        """
+        segments = []
+        agent = event.payload.get("agent")
+        if agent:
+            from mirrornode.core.prompt_loader import PROMPT_CACHE_FILE, load_prompt
+            segments.append(await asyncio.to_thread(load_prompt, agent, PROMPT_CACHE_FILE))
+
+        system = event.payload.get("system")
+        if isinstance(system, str):
+            segments.append(system)
+        elif isinstance(system, list):
+            segments.extend(str(part) for part in system)
+        return tuple(part for part in segments if part)
+
+    def invoke(self, prompt: str, system: Sequence[str] = ()) -> AdapterResponse:
+        """
+        Blocking entrypoint.
         Never returns None.
         Never throws uncaught exceptions.
         """
-        start = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        admission = self.breaker.allow()
+        if not admission:
+            return self._circuit_open(start)
+        probe = admission is Admission.PROBE
 
+        attempt = 0
         try:
-            result = self._invoke(prompt)
-            latency_ms = (
-                datetime.now(timezone.utc) - start
-            ).total_seconds() * 1000
-
-            return AdapterResponse(
-                status=AdapterStatus.OK,
-                node_id=self.node_id,
-                payload=result,
-                error=None,
-                latency_ms=latency_ms,
-            )
+            while True:
+                try:
+                    result = self._invoke(prompt, system)
+                except Exception as e:
+                    code, retry_after = self._classify_error(e)
+                    if self.retry.should_retry(code, attempt):
+                        time.sleep(self.retry.delay(attempt))
+                        attempt += 1
+                        continue
+                    self.breaker.record_failure(code, retry_after)
+                    return self._failure(e, start, code, retry_after)
+                self.breaker.record_success()
+                return self._success(result, start)
+        except BaseException:
+            if probe:
+                self.breaker.release_probe()
+            raise
 
-        except Exception as e:
-            latency_ms = (
-                datetime.now(timezone.utc) - start
-            ).total_seconds() * 1000
-
-            code, retry_after = self._classify_error(e)
-
-            return AdapterResponse(
-                status=(
-                    AdapterStatus.ERROR
-                    if retry_after is not None
-                    else AdapterStatus.UNAVAILABLE
-                ),
-                node_id=self.node_id,
-                payload={
-                    "content": None,
-                    "model": None,
-                    "tokens_used": None,
-                },
-                error={
-                    "code": code,
-                    "message": str(e),
-                    "retry_after": retry_after,
-                },
-                latency_ms=latency_ms,
+    async def ainvoke(self, prompt: str, system: Sequence[str] = ()) -> AdapterResponse:
+        """
+        Async entrypoint, same contract as invoke().
+        """
+        start = time.perf_counter()
+        admission = self.breaker.allow()
+        if not admission:
+            return self._circuit_open(start)
+        probe = admission is Admission.PROBE
+
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = await self._ainvoke(prompt, system)
+                except Exception as e:
+                    code, retry_after = self._classify_error(e)
+                    if self.retry.should_retry(code, attempt):
+                        await asyncio.sleep(self.retry.delay(attempt))
+                        attempt += 1
+                        continue
+                    self.breaker.record_failure(code, retry_after)
+                    return self._failure(e, start, code, retry_after)
+                self.breaker.record_success()
+                return self._success(result, start)
+        except BaseException:
+            # cancelled (router timeout, client gone): no outcome to record,
+            # but a HALF_OPEN probe slot must not stay taken
+            if probe:
+                self.breaker.release_probe()
+            raise
+
+    def _success(self, result: Dict[str, Any], start: float) -> AdapterResponse:
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        return AdapterResponse(
+            status=AdapterStatus.OK,
+            node_id=self.node_id,
+            payload=result,
+            error=None,
+            latency_ms=latency_ms,
+        )
+
+    def _failure(
+        self,
+        e: Exception,
+        start: float,
+        code: str,
+        retry_after: Optional[int],
+        status: Optional[AdapterStatus] = None,
+    ) -> AdapterResponse:
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        if status is None:
+            status = (
+                AdapterStatus.ERROR
+                if retry_after is not None
+                else AdapterStatus.UNAVAILABLE
             )
 
+        return AdapterResponse(
+            status=status,
+            node_id=self.node_id,
+            payload={
+                "content": None,
+                "model": None,
+                "tokens_used": None,
+            },
+            error={
+                "code": code,
+                "message": str(e),
+                "retry_after": retry_after,
+            },
+            latency_ms=latency_ms,
+        )
+
+    def _circuit_open(self, start: float) -> AdapterResponse:
+        return self._failure(
+            RuntimeError(f"circuit open for {self.node_id}"),
+            start,
+            "circuit_open",
+            math.ceil(self.breaker.retry_in()) or 1,
+            status=AdapterStatus.UNAVAILABLE,
+        )
+
     def _classify_error(self, e: Exception) -> Tuple[str, Optional[int]]:
         """
         Map exceptions to canonical error codes.
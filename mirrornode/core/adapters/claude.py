@@ -1,76 +1,116 @@
-import asyncio
 import logging
 import os
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Sequence
 
-from mirrornode.core.events.schema import MirrorNodeEvent
-from . import BaseAdapter
+from mirrornode.core.adapters.base import BaseAdapter
+from mirrornode.core.adapters.http import shared_http_client
+from mirrornode.core.metering import token_cap
 
 logger = logging.getLogger(__name__)
 
+MODEL = "claude-3-5-sonnet-20241022"
+
 
 class ClaudeAdapter(BaseAdapter):
+    """
+    Canonical Claude adapter.
+    Fully compliant with AdapterResponse contract.
+    """
+
     name = "claude"
 
     def __init__(self):
-        self.client = None
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if api_key:
-            try:
-                import anthropic  # local import to avoid hard dependency when not configured
-                self.client = anthropic.Anthropic(api_key=api_key)
-            except Exception:
-                logger.exception("Failed to initialize Anthropic client")
-                self.client = None
-
-    async def handle(self, event: MirrorNodeEvent) -> Dict[str, Any]:
-        logger.info("[CLAUDE] handling event %s payload=%r", event.trace_id, event.payload)
-
-        if not self.client:
-            logger.warning("[CLAUDE] No API key, returning stub response")
-            return {
-                "node": self.name,
-                "response": "STUB: No API key configured",
-                "vote": None,
-            }
-
-        prompt = event.payload.get("prompt") or event.payload.get("message") or ""
+        super().__init__()
+        self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        # None = provider default; point at a local mock provider for load tests
+        self.base_url = os.getenv("ANTHROPIC_BASE_URL")
+        self._client = None
+        self._client_http = None
 
-        try:
-            response = await asyncio.to_thread(
-                self.client.messages.create,
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=512,
-                messages=[{"role": "user", "content": prompt}],
+    @property
+    def client(self):
+        """
+        AsyncAnthropic bound to the shared pooled HTTP client of the
+        running loop; None when no API key is configured.
+        """
+        if not self.api_key:
+            return None
+        http = shared_http_client()
+        if self._client is None or self._client_http is not http:
+            import anthropic  # local import to avoid hard dependency when not configured
+            self._client = anthropic.AsyncAnthropic(
+                api_key=self.api_key, base_url=self.base_url, http_client=http
             )
+            self._client_http = http
+        return self._client
 
-            result = None
-            if hasattr(response, "content"):
-                content = response.content
-                if isinstance(content, (list, tuple)) and len(content) > 0:
-                    first = content[0]
-                    if isinstance(first, dict) and "text" in first:
-                        result = first["text"]
-                    elif hasattr(first, "text"):
-                        result = getattr(first, "text")
-                elif isinstance(content, str):
-                    result = content
+    def _request(self, prompt: str, system: Sequence[str]) -> Dict[str, Any]:
+        """
+        messages.create / messages.stream arguments.
+        System segments become text blocks ahead of the user turn; the
+        last one carries a cache_control breakpoint so the provider
+        caches the whole static prefix across calls.
+        """
+        request: Dict[str, Any] = {
+            "model": MODEL,
+            "max_tokens": token_cap(self.max_tokens),
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system:
+            blocks = [{"type": "text", "text": part} for part in system]
+            blocks[-1]["cache_control"] = {"type": "ephemeral"}
+            request["system"] = blocks
+        return request
 
-            if result is None:
-                result = str(response)
+    async def _ainvoke(self, prompt: str, system: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        Provider-specific logic.
+        May raise exceptions — BaseAdapter.ainvoke() handles them.
+        """
+        client = self.client
+        if not client:
+            raise RuntimeError("API key not configured")
 
-            logger.info("[CLAUDE] response: %s", (result[:100] if result else ""))
+        response = await client.messages.create(**self._request(prompt, system))
 
+        text = "".join(
+            block.text for block in response.content if getattr(block, "text", None)
+        )
+        logger.info("[CLAUDE] response: %s", text[:100])
+
+        usage = getattr(response, "usage", None)
+        if usage is None:
             return {
-                "node": self.name,
-                "response": result,
-                "vote": result if getattr(event, "request_consensus", False) else None,
+                "content": text,
+                "model": response.model,
+                "tokens_used": None,
+                "prompt_tokens": None,
+                "completion_tokens": None,
+                "cached_tokens": None,
             }
 
-        except Exception as e:
-            logger.exception("[CLAUDE] API error")
-            return {
-                "node": self.name,
-                "response": f"ERROR: {str(e)}",
-                "vote": None,
-            }
\ No newline at end of file
+        # input_tokens excludes the cached prefix, whether written or read
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        prompt_tokens = usage.input_tokens + cache_write + cache_read
+        return {
+            "content": text,
+            "model": response.model,
+            "tokens_used": prompt_tokens + usage.output_tokens,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": usage.output_tokens,
+            "cached_tokens": cache_read,
+        }
+
+    async def stream(self, prompt: str, system: Sequence[str] = ()) -> AsyncIterator[str]:
+        """
+        Yield response text deltas as the provider produces them.
+        Raises like _ainvoke(); callers report errors themselves.
+        """
+        client = self.client
+        if not client:
+            raise RuntimeError("API key not configured")
+
+        async with client.messages.stream(**self._request(prompt, system)) as stream:
+            async for text in stream.text_stream:
+                yield text
@@ -1,13 +1,15 @@
-import asyncio
 import logging
 import os
+from typing import Any, AsyncIterator, Dict, Sequence
 
-from mirrornode.core.events.schema import MirrorNodeEvent
 from mirrornode.core.adapters.base import BaseAdapter
-from mirrornode.core.contracts.adapter_response import AdapterResponse
+from mirrornode.core.adapters.http import shared_http_client
+from mirrornode.core.metering import token_cap
 
 logger = logging.getLogger(__name__)
 
+MODEL = "gpt-3.5-turbo"
+
 
 class GptAdapter(BaseAdapter):
     """
@@ -18,52 +20,79 @@ class GptAdapter(BaseAdapter):
     name = "gpt"
 
     def __init__(self):
-        super().__init__(node_id="gpt")
-        self.client = None
+        super().__init__()
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        # None = provider default; point at a local mock provider for load tests
+        self.base_url = os.getenv("OPENAI_BASE_URL")
+        self._client = None
+        self._client_http = None
 
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
+    @property
+    def client(self):
+        """
+        AsyncOpenAI bound to the shared pooled HTTP client of the
+        running loop; None when no API key is configured.
+        """
+        if not self.api_key:
+            return None
+        http = shared_http_client()
+        if self._client is None or self._client_http is not http:
             import openai
-            self.client = openai.OpenAI(api_key=api_key)
+            self._client = openai.AsyncOpenAI(
+                api_key=self.api_key, base_url=self.base_url, http_client=http
+            )
+            self._client_http = http
+        return self._client
 
-    def _invoke(self, prompt: str) -> dict:
+    def _request(self, prompt: str, system: Sequence[str]) -> Dict[str, Any]:
+        """
+        chat.completions.create arguments.
+        System segments lead the message list, unchanged between calls,
+        so the provider's automatic prefix caching applies to them.
+        """
+        messages = [{"role": "system", "content": part} for part in system]
+        messages.append({"role": "user", "content": prompt})
+        return {
+            "model": MODEL,
+            "max_tokens": token_cap(self.max_tokens),
+            "messages": messages,
+        }
+
+    async def _ainvoke(self, prompt: str, system: Sequence[str] = ()) -> dict:
         """
         Provider-specific logic.
-        May raise exceptions — BaseAdapter.invoke() handles them.
+        May raise exceptions — BaseAdapter.ainvoke() handles them.
         """
-        if not self.client:
+        client = self.client
+        if not client:
             raise RuntimeError("API key not configured")
 
-        response = self.client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            max_tokens=512,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        response = await client.chat.completions.create(**self._request(prompt, system))
 
+        usage = response.usage
+        details = getattr(usage, "prompt_tokens_details", None)
         return {
             "content": response.choices[0].message.content,
             "model": response.model,
-            "tokens_used": response.usage.total_tokens if response.usage 
-else None,
+            "tokens_used": usage.total_tokens if usage else None,
+            "prompt_tokens": usage.prompt_tokens if usage else None,
+            "completion_tokens": usage.completion_tokens if usage else None,
+            "cached_tokens": getattr(details, "cached_tokens", None),
         }
 
-    async def handle(self, event: MirrorNodeEvent) -> AdapterResponse:
+    async def stream(self, prompt: str, system: Sequence[str] = ()) -> AsyncIterator[str]:
         """
-        Event entrypoint.
-        Delegates to canonical invoke() safely.
+        Yield response text deltas as the provider produces them.
+        Raises like _ainvoke(); callers report errors themselves.
         """
-        logger.info(
-            "[GPT] handling event %s payload=%r",
-            event.trace_id,
-            event.payload,
-        )
+        client = self.client
+        if not client:
+            raise RuntimeError("API key not configured")
 
-        prompt = (
-            event.payload.get("prompt")
-            or event.payload.get("message")
-            or ""
+        chunks = await client.chat.completions.create(
+            **self._request(prompt, system),
+            stream=True,
         )
-
-        # Run synchronous invoke() in a worker thread
-        return await asyncio.to_thread(self.invoke, prompt)
-
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import os
+import weakref
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# One pooled client per event loop: httpx connections are bound to the
+# loop that opened them, and tests / CLIs may run several loops.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _http2_enabled() -> bool:
+    setting = os.getenv("MIRRORNODE_HTTP2", "auto").lower()
+    if setting in ("0", "false", "no"):
+        return False
+    try:
+        import h2  # noqa: F401  (httpx[http2])
+    except ImportError:
+        if setting != "auto":
+            logger.warning("[http] MIRRORNODE_HTTP2 set but h2 is not installed")
+        return False
+    return True
+
+
+def pool_limits() -> httpx.Limits:
+    """Connection pool limits, configurable through the environment."""
+    return httpx.Limits(
+        max_connections=int(os.getenv("MIRRORNODE_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("MIRRORNODE_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("MIRRORNODE_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+def shared_http_client() -> httpx.AsyncClient:
+    """
+    Keep-alive AsyncClient shared by every provider SDK on the running
+    loop, so concurrent fan-out reuses warm connections (HTTP/2 when h2
+    is installed) instead of one pool per adapter.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=pool_limits(),
+            http2=_http2_enabled(),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running loop's shared client (app shutdown)."""
+    client: Optional[httpx.AsyncClient] = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
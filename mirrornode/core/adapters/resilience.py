@@ -0,0 +1,123 @@
+import random
+import threading
+import time
+from enum import Enum
+from typing import Optional
+
+# Error codes from BaseAdapter._classify_error
+RETRYABLE_CODES = frozenset({"model_unavailable"})  # transient: retry in-request
+TRIP_CODES = frozenset({"quota_exceeded"})          # provider said stop: open now
+IGNORED_CODES = frozenset({"auth_not_configured"})  # local config, not provider health
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class Admission(Enum):
+    """CircuitBreaker.allow() verdict; falsy only when the call is refused."""
+    REFUSED = "refused"
+    ALLOWED = "allowed"
+    PROBE = "probe"  # this call holds the HALF_OPEN probe slot
+
+    def __bool__(self) -> bool:
+        return self is not Admission.REFUSED
+
+
+class CircuitBreaker:
+    """
+    Per-adapter circuit breaker.
+
+    - CLOSED: calls pass; `failure_threshold` consecutive failures open it
+    - OPEN: calls fail fast until the open period ends; the period is the
+      provider's retry_after when it gave one (capped at `max_open`),
+      otherwise `reset_timeout`
+    - HALF_OPEN: one probe call at a time; success closes, failure re-opens
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_open: float = 600.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_open = max_open
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> Admission:
+        """
+        Whether a call may go to the provider now, and whether it took
+        the probe slot (decided under the lock, so the caller need not
+        re-read `state`, which other threads may have moved on).
+        """
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                return Admission.ALLOWED
+            if self.state is CircuitState.OPEN:
+                if time.monotonic() < self._open_until:
+                    return Admission.REFUSED
+                self.state = CircuitState.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return Admission.REFUSED
+            self._probing = True
+            return Admission.PROBE
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker will let a probe through."""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """
+        Give back a HALF_OPEN probe slot whose call ended without an
+        outcome (cancelled, e.g. by the router's timeout).
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self, code: str, retry_after: Optional[float] = None) -> None:
+        if code in IGNORED_CODES:
+            with self._lock:
+                self._probing = False
+            return
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if (
+                code in TRIP_CODES
+                or self.state is CircuitState.HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                period = min(self.max_open, retry_after) if retry_after else self.reset_timeout
+                self.state = CircuitState.OPEN
+                self._open_until = time.monotonic() + period
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for RETRYABLE_CODES."""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.2, max_delay: float = 2.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, code: str, attempt: int) -> bool:
+        """`attempt` counts from 0 for the first call."""
+        return code in RETRYABLE_CODES and attempt + 1 < self.attempts
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
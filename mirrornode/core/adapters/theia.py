@@ -1,16 +1,18 @@
-import asyncio
-import logging
-from mirrornode.core.events.schema import MirrorNodeEvent
-from . import BaseAdapter
+from typing import Any, Dict, Sequence
 
-logger = logging.getLogger(__name__)
+from mirrornode.core.adapters.base import BaseAdapter
 
 
 class TheiaAdapter(BaseAdapter):
-    name = "theia"
+    """
+    Local node: acknowledges events without calling a provider.
+    """
 
-    async def handle(self, event: MirrorNodeEvent) -> None:
-        logger.info("[THEIA] handling event %s payload=%r", event.trace_id, 
-event.payload)
-        await asyncio.sleep(0)
+    name = "theia"
 
+    async def _ainvoke(self, prompt: str, system: Sequence[str] = ()) -> Dict[str, Any]:
+        return {
+            "content": None,
+            "model": None,
+            "tokens_used": None,
+        }
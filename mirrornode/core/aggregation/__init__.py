@@ -0,0 +1,7 @@
+from .aggregate import aggregate_responses, normalize_response, similarity_matrix
+
+__all__ = [
+    "aggregate_responses",
+    "normalize_response",
+    "similarity_matrix",
+]
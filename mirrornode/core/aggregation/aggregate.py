@@ -0,0 +1,180 @@
+"""
+Vote aggregation for lattice fan-out and consensus.
+
+Response texts are turned into TF-IDF vectors over hashed character
+shingles, compared by cosine similarity, and weighted per node by
+reliability and latency. NumPy is used when installed; a pure-Python
+path gives the same scores for small batches.
+"""
+import math
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python fallback below
+    np = None
+
+from mirrornode.core.contracts.adapter_response import AdapterResponse
+
+SHINGLE = 3
+DIMENSIONS = 1 << 12      # hashed feature space
+AGREE_THRESHOLD = 0.8     # cosine similarity counted as agreement
+LATENCY_SCALE_MS = 5000.0  # a response this slow counts half
+
+
+def normalize_response(response: Optional[AdapterResponse]) -> Optional[Dict[str, Any]]:
+    """{"node", "status", "text", "latency_ms"} view of a response, or None."""
+    if response is None:
+        return None
+    payload = response.payload or {}
+    return {
+        "node": response.node_id,
+        "status": response.status.value,
+        "text": payload.get("vote") or payload.get("content"),
+        "latency_ms": response.latency_ms,
+    }
+
+
+def _shingles(text: str) -> List[int]:
+    norm = " ".join(text.casefold().split())
+    if len(norm) < SHINGLE:
+        norm = norm.ljust(SHINGLE)
+    return [
+        zlib.crc32(norm[i:i + SHINGLE].encode()) % DIMENSIONS
+        for i in range(len(norm) - SHINGLE + 1)
+    ]
+
+
+def similarity_matrix(texts: List[str]) -> List[List[float]]:
+    """Pairwise cosine similarity of TF-IDF shingle vectors."""
+    features = [_shingles(t) for t in texts]
+    if np is not None:
+        return _similarity_numpy(features).tolist()
+    return _similarity_python(features)
+
+
+def _similarity_numpy(features: List[List[int]]):
+    n = len(features)
+    rows = np.repeat(np.arange(n), [len(f) for f in features])
+    cols = np.fromiter((c for f in features for c in f), dtype=np.int64, count=len(rows))
+    tf = np.zeros((n, DIMENSIONS), dtype=np.float32)
+    np.add.at(tf, (rows, cols), 1.0)
+
+    df = np.count_nonzero(tf, axis=0)
+    tf *= (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    tf /= np.maximum(np.linalg.norm(tf, axis=1, keepdims=True), 1e-12)
+    return tf @ tf.T
+
+
+def _similarity_python(features: List[List[int]]) -> List[List[float]]:
+    n = len(features)
+    counts = []
+    df: Dict[int, int] = {}
+    for f in features:
+        c: Dict[int, float] = {}
+        for col in f:
+            c[col] = c.get(col, 0.0) + 1.0
+        counts.append(c)
+        for col in c:
+            df[col] = df.get(col, 0) + 1
+
+    vectors = []
+    for c in counts:
+        v = {col: tf * (math.log((1 + n) / (1 + df[col])) + 1) for col, tf in c.items()}
+        norm = math.sqrt(sum(x * x for x in v.values())) or 1e-12
+        vectors.append({col: x / norm for col, x in v.items()})
+
+    sim = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i, n):
+            a, b = vectors[i], vectors[j]
+            if len(a) > len(b):
+                a, b = b, a
+            s = sum(x * b.get(col, 0.0) for col, x in a.items())
+            sim[i][j] = sim[j][i] = s
+    return sim
+
+
+def _agreement(texts: List[str], weights: List[float]) -> Tuple[List[List[float]], List[float]]:
+    """Similarity matrix and each voter's weighted mean similarity to the others."""
+    features = [_shingles(t) for t in texts]
+    total = sum(weights)
+
+    if np is not None:
+        sim = _similarity_numpy(features).astype(np.float64)
+        w = np.asarray(weights, dtype=np.float64)
+        others = total - w
+        raw = sim @ w - np.diag(sim) * w
+        scores = np.divide(raw, others, out=np.ones_like(raw), where=others > 0)
+        return sim.tolist(), scores.tolist()
+
+    sim = _similarity_python(features)
+    scores = []
+    for i, row in enumerate(sim):
+        others = total - weights[i]
+        raw = sum(w * x for j, (w, x) in enumerate(zip(weights, row)) if j != i)
+        scores.append(raw / others if others > 0 else 1.0)
+    return sim, scores
+
+
+def node_weight(
+    node: str,
+    latency_ms: Optional[float],
+    reliability: Optional[Dict[str, float]] = None,
+) -> float:
+    """Reliability (default 1.0) discounted by latency."""
+    weight = (reliability or {}).get(node, 1.0)
+    if latency_ms:
+        weight /= 1.0 + latency_ms / LATENCY_SCALE_MS
+    return weight
+
+
+def aggregate_responses(
+    responses: Iterable[Optional[AdapterResponse]],
+    reliability: Optional[Dict[str, float]] = None,
+    threshold: float = AGREE_THRESHOLD,
+    quorum: float = 0.5,
+) -> Dict[str, Any]:
+    """
+    Score votes and pick the best-supported answer.
+
+    Each voter's agreement score is the weighted mean similarity to every
+    other voter. The answer with the highest weighted score wins; its
+    support is the weight share of voters within `threshold` similarity.
+    Consensus is reached when support >= `quorum`.
+
+    Returns:
+        {"success", "responses": [{"node", "status", "text", "latency_ms"}],
+         "agreed_payload": {"vote", "node", "support", "supporters",
+                            "scores"} or None}
+    """
+    normalized = [r for r in map(normalize_response, responses) if r is not None]
+    voters = [r for r in normalized if r["status"] == "ok" and r["text"]]
+    result: Dict[str, Any] = {
+        "success": False,
+        "responses": normalized,
+        "agreed_payload": None,
+    }
+    if not voters:
+        return result
+
+    weights = [node_weight(v["node"], v["latency_ms"], reliability) for v in voters]
+    total = sum(weights)
+    sim, scores = _agreement([str(v["text"]) for v in voters], weights)
+
+    best = max(range(len(voters)), key=lambda i: (weights[i] * scores[i], weights[i]))
+    supporters: List[Tuple[str, float]] = [
+        (voters[j]["node"], weights[j]) for j in range(len(voters)) if sim[best][j] >= threshold
+    ]
+    support = sum(w for _, w in supporters) / total if total > 0 else 0.0
+
+    result["success"] = support >= quorum
+    result["agreed_payload"] = {
+        "vote": voters[best]["text"],
+        "node": voters[best]["node"],
+        "support": round(support, 4),
+        "supporters": [node for node, _ in supporters],
+        "scores": {v["node"]: round(s, 4) for v, s in zip(voters, scores)},
+    }
+    return result
@@ -0,0 +1,206 @@
+import asyncio
+import importlib.util
+import logging
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Type
+
+from mirrornode.core.events.schema import MirrorNodeEvent
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("ray", "asyncio", "process")
+
+
+class ExecutionBackend(ABC):
+    """
+    Where the orchestrator's adapters run.
+
+    start() builds one instance per adapter class, call() runs
+    adapter.handle(event) and must be cancellable from asyncio.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def start(self, adapters: Dict[str, Type], env: Dict[str, str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def names(self) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def call(self, name: str, event: MirrorNodeEvent) -> Any:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+# ------------------------------------------------------------
+# IN-PROCESS (asyncio)
+# ------------------------------------------------------------
+
+class AsyncioBackend(ExecutionBackend):
+    """Adapters live in this process and run on the caller's loop."""
+
+    name = "asyncio"
+
+    def __init__(self):
+        self._adapters: Dict[str, Any] = {}
+
+    def start(self, adapters: Dict[str, Type], env: Dict[str, str]) -> None:
+        self._adapters = {name: cls() for name, cls in adapters.items()}
+
+    def names(self) -> List[str]:
+        return list(self._adapters)
+
+    async def call(self, name: str, event: MirrorNodeEvent) -> Any:
+        return await self._adapters[name].handle(event)
+
+
+# ------------------------------------------------------------
+# PROCESS POOL
+# ------------------------------------------------------------
+
+# per worker process: adapters and the loop they run on
+_worker_adapters: Dict[str, Any] = {}
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(adapters: Dict[str, Type], env: Dict[str, str]) -> None:
+    global _worker_loop
+    for key, value in env.items():
+        if value:
+            os.environ[key] = value
+    _worker_loop = asyncio.new_event_loop()
+    _worker_adapters.update({name: cls() for name, cls in adapters.items()})
+
+
+def _worker_handle(name: str, event: MirrorNodeEvent) -> Any:
+    return _worker_loop.run_until_complete(_worker_adapters[name].handle(event))
+
+
+class ProcessPoolBackend(ExecutionBackend):
+    """
+    Adapters run in a pool of worker processes (CPU-heavy adapters,
+    isolation from the bridge). Cancelling a call only drops it if it
+    has not started in a worker yet.
+    """
+
+    name = "process"
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._names: List[str] = []
+
+    def start(self, adapters: Dict[str, Type], env: Dict[str, str]) -> None:
+        self._names = list(adapters)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(adapters, env),
+        )
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    async def call(self, name: str, event: MirrorNodeEvent) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _worker_handle, name, event)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+# ------------------------------------------------------------
+# RAY ACTORS
+# ------------------------------------------------------------
+
+class DistributedAdapter:
+    """Actor body: one adapter instance per Ray actor."""
+
+    def __init__(self, adapter_class, api_keys: Dict[str, str]):
+        for key, value in api_keys.items():
+            if value:
+                os.environ[key] = value
+
+        self.adapter = adapter_class()
+        self.name = self.adapter.name
+
+    async def handle(self, event: MirrorNodeEvent) -> Any:
+        return await self.adapter.handle(event)
+
+
+class RayBackend(ExecutionBackend):
+    """One Ray actor per adapter; results are awaited, never ray.get."""
+
+    name = "ray"
+
+    def __init__(self):
+        self._actors: Dict[str, Any] = {}
+
+    def start(self, adapters: Dict[str, Type], env: Dict[str, str]) -> None:
+        import ray
+
+        if not ray.is_initialized():
+            ray.init(ignore_reinit_error=True)
+        actor_cls = ray.remote(DistributedAdapter)
+        self._actors = {
+            name: actor_cls.remote(cls, env) for name, cls in adapters.items()
+        }
+
+    def names(self) -> List[str]:
+        return list(self._actors)
+
+    async def call(self, name: str, event: MirrorNodeEvent) -> Any:
+        import ray
+
+        ref = self._actors[name].handle.remote(event)
+        try:
+            return await ref
+        except asyncio.CancelledError:
+            ray.cancel(ref)
+            raise
+
+    def shutdown(self) -> None:
+        import ray
+
+        ray.shutdown()
+
+
+def ray_installed() -> bool:
+    return importlib.util.find_spec("ray") is not None
+
+
+def create_backend(kind: Optional[str] = None) -> ExecutionBackend:
+    """
+    Backend by name; defaults to MIRRORNODE_ORCHESTRATOR_BACKEND, else
+    "ray" when it is installed and "asyncio" when it is not.
+    """
+    kind = kind or os.getenv("MIRRORNODE_ORCHESTRATOR_BACKEND") or (
+        "ray" if ray_installed() else "asyncio"
+    )
+    if kind == "ray":
+        return RayBackend()
+    if kind == "asyncio":
+        return AsyncioBackend()
+    if kind == "process":
+        return ProcessPoolBackend()
+    raise ValueError(f"Unknown orchestrator backend {kind!r} (expected one of {BACKENDS})")
+
+
+def backend_for_ray_flag(flag: str) -> str:
+    """
+    Map the sweep's --ray flag to a backend name:
+    off -> asyncio, local -> ray, validate -> asyncio (the sweep only
+    checks that Ray is importable; it does not start a cluster).
+    """
+    if flag == "local":
+        return "ray"
+    return "asyncio"
@@ -0,0 +1,13 @@
+from .harness import BenchResult, bench_orchestrator, bench_router, measure
+from .mock_provider import LatencyModel, MockProviderConfig, MockProviderServer, create_mock_provider
+
+__all__ = [
+    "BenchResult",
+    "LatencyModel",
+    "MockProviderConfig",
+    "MockProviderServer",
+    "bench_orchestrator",
+    "bench_router",
+    "create_mock_provider",
+    "measure",
+]
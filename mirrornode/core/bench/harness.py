@@ -0,0 +1,174 @@
+"""
+Load benchmark for EventRouter.dispatch and the orchestrator.
+
+Requests are driven at a fixed concurrency and each call's wall time is
+recorded; results report throughput and p50/p95/p99. `run_bench` points
+the Claude and GPT adapters at a MockProviderServer so no provider keys
+or network are needed.
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from mirrornode.core.events.schema import EventType, MirrorNodeEvent, create_event
+
+logger = logging.getLogger(__name__)
+
+BenchCall = Callable[[int], Awaitable[bool]]
+
+
+@dataclass
+class BenchResult:
+    target: str
+    requests: int
+    errors: int
+    concurrency: int
+    elapsed_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, min(len(ordered), math.ceil(q * len(ordered))))
+    return ordered[rank - 1]
+
+
+async def measure(target: str, call: BenchCall, requests: int, concurrency: int) -> BenchResult:
+    """
+    Run `call(i)` for i in range(requests), at most `concurrency` at a
+    time. `call` returns False (or raises) to count an error.
+    """
+    latencies: List[float] = []
+    errors = 0
+    indices = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in indices:
+            started = time.perf_counter()
+            try:
+                ok = await call(i)
+            except Exception as exc:
+                logger.debug("[bench] request %d failed: %s", i, exc)
+                ok = False
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, requests)))))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return BenchResult(
+        target=target,
+        requests=requests,
+        errors=errors,
+        concurrency=concurrency,
+        elapsed_s=round(elapsed, 3),
+        throughput_rps=round(requests / elapsed, 2) if elapsed > 0 else 0.0,
+        p50_ms=round(percentile(ordered, 0.50), 3),
+        p95_ms=round(percentile(ordered, 0.95), 3),
+        p99_ms=round(percentile(ordered, 0.99), 3),
+        max_ms=round(ordered[-1], 3) if ordered else 0.0,
+    )
+
+
+def bench_event(i: int) -> MirrorNodeEvent:
+    return create_event(
+        event_type=EventType.INTEGRATION,
+        node="bench",
+        source={"node": "bench", "surface": "cli", "origin": "mirrornode.bench"},
+        payload={"prompt": f"benchmark request {i}"},
+    )
+
+
+async def bench_router(router, requests: int, concurrency: int) -> BenchResult:
+    """EventRouter.dispatch; a request fails if any adapter did not return ok."""
+    async def call(i: int) -> bool:
+        outcomes = await router.dispatch(bench_event(i), record=False, publish=False)
+        return all(o["status"] == "ok" for o in outcomes.values())
+
+    return await measure("router", call, requests, concurrency)
+
+
+async def bench_orchestrator(orchestrator, requests: int, concurrency: int,
+                             timeout: Optional[float] = None) -> BenchResult:
+    """MirrorNodeOrchestrator.route_event; fails unless every adapter answered ok."""
+    async def call(i: int) -> bool:
+        result = await orchestrator.route_event(bench_event(i), timeout=timeout)
+        responses = result["responses"]
+        return len(responses) == len(orchestrator.adapters) and all(
+            r["status"] == "ok" for r in responses
+        )
+
+    return await measure("orchestrator", call, requests, concurrency)
+
+
+def run_bench(args) -> int:
+    """`python -m mirrornode bench` — benchmark against the mock provider."""
+    from mirrornode.core.bench.mock_provider import MockProviderServer, config_from_args
+
+    targets: Iterable[str] = ("router", "orchestrator") if args.target == "all" else (args.target,)
+    results: List[Dict[str, Any]] = []
+
+    with MockProviderServer(config_from_args(args)) as server:
+        # adapters read these when constructed
+        os.environ.update({
+            "ANTHROPIC_BASE_URL": server.url,
+            "OPENAI_BASE_URL": server.url + "/v1",
+            "ANTHROPIC_API_KEY": "mock-key",
+            "OPENAI_API_KEY": "mock-key",
+        })
+        for target in targets:
+            result = asyncio.run(_bench_target(target, args))
+            results.append(result.to_dict())
+            print(json.dumps(results[-1]))
+        provider_stats = server.stats
+
+    report = {"results": results, "mock_provider": provider_stats}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+async def _bench_target(target: str, args) -> BenchResult:
+    from mirrornode.core.adapters.http import close_http_client
+
+    try:
+        if target == "router":
+            from mirrornode.core.bridge.router import EventRouter
+            from mirrornode.core.orchestrator import ADAPTERS
+
+            names = args.adapters.split(",") if args.adapters else ["claude", "gpt"]
+            router = EventRouter(history_size=1)
+            for name in names:
+                router.register_adapter(name, ADAPTERS[name]())
+            try:
+                return await bench_router(router, args.requests, args.concurrency)
+            finally:
+                router.close()
+
+        from mirrornode.core.orchestrator import create_orchestrator
+
+        orchestrator = create_orchestrator(args.backend)
+        try:
+            return await bench_orchestrator(orchestrator, args.requests, args.concurrency)
+        finally:
+            orchestrator.shutdown()
+    finally:
+        await close_http_client()
@@ -0,0 +1,356 @@
+"""
+Deterministic local stand-in for the OpenAI and Anthropic HTTP APIs.
+
+Serves POST /v1/chat/completions and POST /v1/messages (plain and
+streamed) with seeded latency, injected faults and generated text, so
+the adapters can be load tested offline by pointing OPENAI_BASE_URL /
+ANTHROPIC_BASE_URL at it. The n-th request always draws the same
+latency, fault and completion for a given seed.
+"""
+import asyncio
+import itertools
+import json
+import math
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "mirror node oracle lattice signal canon ledger audit theia grok "
+    "merlin osiris thoth bridge event trace vote quorum echo prism"
+).split()
+
+LATENCY_KINDS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+@dataclass
+class LatencyModel:
+    """
+    Time to first byte.
+
+    fixed:        always `ms`
+    uniform:      `ms` +/- `spread` * `ms`
+    exponential:  mean `ms`
+    lognormal:    median `ms`, sigma `spread`
+    """
+    kind: str = "lognormal"
+    ms: float = 50.0
+    spread: float = 0.5
+
+    def __post_init__(self):
+        if self.kind not in LATENCY_KINDS:
+            raise ValueError(f"latency kind must be one of {', '.join(LATENCY_KINDS)}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """"kind[:ms[:spread]]", e.g. "lognormal:80:0.6" or "fixed:20"."""
+        kind, *params = spec.split(":")
+        values = [float(p) for p in params]
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        """Seconds."""
+        if self.kind == "fixed":
+            ms = self.ms
+        elif self.kind == "uniform":
+            ms = rng.uniform(self.ms * (1 - self.spread), self.ms * (1 + self.spread))
+        elif self.kind == "exponential":
+            ms = rng.expovariate(1 / self.ms) if self.ms > 0 else 0.0
+        else:
+            ms = self.ms * math.exp(rng.gauss(0, self.spread))
+        return max(0.0, ms) / 1000
+
+
+@dataclass
+class MockProviderConfig:
+    """
+    latency:        LatencyModel for the time to first byte
+    token_ms:       delay between streamed tokens
+    completion_tokens: tokens per completion (capped by max_tokens)
+    rate_429 / rate_5xx / rate_timeout: fault probabilities per request
+    timeout_s:      how long a "timeout" request hangs before a 504
+    seed:           same seed, same sequence of latencies/faults/texts
+    """
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    token_ms: float = 2.0
+    completion_tokens: int = 32
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    rate_timeout: float = 0.0
+    timeout_s: float = 30.0
+    seed: int = 0
+
+
+@dataclass
+class _Plan:
+    latency: float
+    fault: Optional[str]
+    words: List[str]
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def create_mock_provider(config: Optional[MockProviderConfig] = None) -> FastAPI:
+    """FastAPI app speaking the OpenAI and Anthropic wire formats."""
+    config = config or MockProviderConfig()
+    app = FastAPI(title="MIRRORNODE mock provider")
+    sequence = itertools.count()
+    stats: Counter = Counter()
+    app.state.config = config
+    app.state.stats = stats
+
+    def plan(max_tokens: Optional[int]) -> _Plan:
+        rng = random.Random(f"{config.seed}:{next(sequence)}")
+        latency = config.latency.sample(rng)
+        roll = rng.random()
+        fault = None
+        if roll < config.rate_429:
+            fault = "429"
+        elif roll < config.rate_429 + config.rate_5xx:
+            fault = "5xx"
+        elif roll < config.rate_429 + config.rate_5xx + config.rate_timeout:
+            fault = "timeout"
+        count = min(config.completion_tokens, max_tokens or config.completion_tokens)
+        words = [rng.choice(WORDS) for _ in range(max(1, count))]
+        return _Plan(latency, fault, words)
+
+    async def fault_response(fault: str, anthropic: bool) -> JSONResponse:
+        stats[fault] += 1
+        if fault == "timeout":
+            await asyncio.sleep(config.timeout_s)
+            status, kind, message = 504, "timeout", "upstream timeout"
+        elif fault == "429":
+            status, kind, message = 429, "rate_limit_error", "429 rate limit (mock quota)"
+        else:
+            status, kind, message = 503, "overloaded_error", "service unavailable"
+        body = (
+            {"type": "error", "error": {"type": kind, "message": message}}
+            if anthropic
+            else {"error": {"message": message, "type": kind, "code": status}}
+        )
+        return JSONResponse(body, status_code=status, headers={"retry-after": "1"})
+
+    async def tokens(words: List[str]) -> AsyncIterator[str]:
+        for i, word in enumerate(words):
+            if i and config.token_ms:
+                await asyncio.sleep(config.token_ms / 1000)
+            yield word if i == 0 else " " + word
+
+    # --------------------------------------------------------
+    # OPENAI: POST /v1/chat/completions
+    # --------------------------------------------------------
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        p = plan(body.get("max_tokens"))
+        await asyncio.sleep(p.latency)
+        if p.fault:
+            return await fault_response(p.fault, anthropic=False)
+        stats["ok"] += 1
+
+        model = body.get("model", "mock")
+        prompt_tokens = sum(_estimate_tokens(str(m.get("content", ""))) for m in body.get("messages", []))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(p.words),
+            "total_tokens": prompt_tokens + len(p.words),
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(p.words)},
+                    "finish_reason": "stop",
+                    "logprobs": None,
+                }],
+                "usage": usage,
+            })
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+            return "data: " + json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }) + "\n\n"
+
+        async def frames() -> AsyncIterator[str]:
+            yield chunk({"role": "assistant", "content": ""})
+            async for text in tokens(p.words):
+                yield chunk({"content": text})
+            yield chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    # --------------------------------------------------------
+    # ANTHROPIC: POST /v1/messages
+    # --------------------------------------------------------
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        p = plan(body.get("max_tokens"))
+        await asyncio.sleep(p.latency)
+        if p.fault:
+            return await fault_response(p.fault, anthropic=True)
+        stats["ok"] += 1
+
+        model = body.get("model", "mock")
+        system = body.get("system") or []
+        if isinstance(system, str):
+            system = [{"type": "text", "text": system}]
+        input_tokens = sum(_estimate_tokens(b.get("text", "")) for b in system) + sum(
+            _estimate_tokens(json.dumps(m.get("content", ""))) for m in body.get("messages", [])
+        )
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": len(p.words),
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": " ".join(p.words)}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+        if not body.get("stream"):
+            return JSONResponse(message)
+
+        def event(kind: str, data: Dict[str, Any]) -> str:
+            return f"event: {kind}\ndata: {json.dumps({'type': kind, **data})}\n\n"
+
+        async def frames() -> AsyncIterator[str]:
+            start = dict(message, content=[], stop_reason=None,
+                         usage=dict(usage, output_tokens=0))
+            yield event("message_start", {"message": start})
+            yield event("content_block_start",
+                        {"index": 0, "content_block": {"type": "text", "text": ""}})
+            async for text in tokens(p.words):
+                yield event("content_block_delta",
+                            {"index": 0, "delta": {"type": "text_delta", "text": text}})
+            yield event("content_block_stop", {"index": 0})
+            yield event("message_delta", {
+                "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                "usage": {"output_tokens": len(p.words)},
+            })
+            yield event("message_stop", {})
+
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return dict(stats)
+
+    return app
+
+
+class MockProviderServer:
+    """
+    Runs the mock provider with uvicorn on a background thread.
+
+        with MockProviderServer(config) as server:
+            os.environ["OPENAI_BASE_URL"] = server.url + "/v1"
+    """
+
+    def __init__(self, config: Optional[MockProviderConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        import uvicorn
+
+        self.app = create_mock_provider(config)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self.host, self.port = self._socket.getsockname()[:2]
+        self._server = uvicorn.Server(uvicorn.Config(
+            self.app, log_level="warning", access_log=False, timeout_keep_alive=30,
+        ))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self.app.state.stats)
+
+    def start(self) -> "MockProviderServer":
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [self._socket]},
+            name="mock-provider", daemon=True,
+        )
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("mock provider failed to start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._socket.close()
+
+    def __enter__(self) -> "MockProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def config_from_args(args) -> MockProviderConfig:
+    """Config from the options __main__ adds to `mock-provider` and `bench`."""
+    return MockProviderConfig(
+        latency=LatencyModel.parse(args.latency),
+        token_ms=args.token_ms,
+        completion_tokens=args.completion_tokens,
+        rate_429=args.error_429,
+        rate_5xx=args.error_5xx,
+        rate_timeout=args.error_timeout,
+        timeout_s=args.timeout_s,
+        seed=args.seed,
+    )
+
+
+def run_mock_provider(args) -> int:
+    """`python -m mirrornode mock-provider` — serve until interrupted."""
+    import uvicorn
+
+    print(f"mock provider on http://{args.host}:{args.port}")
+    print(f"  OPENAI_BASE_URL=http://{args.host}:{args.port}/v1")
+    print(f"  ANTHROPIC_BASE_URL=http://{args.host}:{args.port}")
+    uvicorn.run(create_mock_provider(config_from_args(args)), host=args.host, port=args.port,
+                log_level="warning")
+    return 0
@@ -0,0 +1,134 @@
+# mirrornode/core/bridge/cache.py
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import re
+import time
+import unicodedata
+
+_WS = re.compile(r"\s+")
+
+
+def oracle_cache_key(
+    mode: str,
+    prompt: str,
+    ritual_state: str,
+    context: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Hash of the parts of an oracle request that determine its answer.
+
+    Prompts are NFC-normalized and whitespace-collapsed, and context is
+    serialized with sorted keys, so cosmetic differences share an entry.
+    Session ids are deliberately not part of the key.
+    """
+    norm_prompt = _WS.sub(" ", unicodedata.normalize("NFC", prompt)).strip()
+    material = json.dumps(
+        [mode, norm_prompt, ritual_state, context or {}],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    In-process TTL + LRU cache for expensive async calls.
+
+    - entries expire `ttl` seconds after they were stored
+    - least recently used entries are evicted past `max_entries` or
+      once the stored values exceed `max_bytes` (JSON-encoded size)
+    - concurrent misses for the same key share one in-flight call
+      (single-flight); failures are not cached
+    - the shared call runs as its own task, so cancelling any caller,
+      including the one that started it, leaves the others waiting
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024, max_bytes: int = 8 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (expires_at, size, value)
+        self._entries: OrderedDict[str, Tuple[float, int, Any]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, size, value = entry
+        if expires_at <= time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        size = len(json.dumps(value, default=str).encode())
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._evict(key)
+        self._entries[key] = (time.monotonic() + self.ttl, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, str]:
+        """
+        Return (value, status) where status is "hit", "coalesced" (joined
+        an identical in-flight call) or "miss" (this call computed it).
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value, "hit"
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending), "coalesced"
+
+        self.misses += 1
+        task = asyncio.create_task(self._compute(key, compute))
+        task.add_done_callback(_retrieve)
+        self._inflight[key] = task
+        return await asyncio.shield(task), "miss"
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await compute()
+            self.put(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _evict(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+def _retrieve(task: asyncio.Task) -> None:
+    """Mark a failure retrieved in case every waiter was cancelled."""
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,162 @@
+# mirrornode/core/bridge/history.py
+
+from __future__ import annotations
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mirrornode.core.events.schema import EventType, MirrorNodeEvent
+
+
+class EventHistory:
+    """
+    Fixed-capacity ring buffer of recent MirrorNodeEvent objects.
+
+    - appends are O(1); the oldest event is overwritten when full
+    - secondary indexes by trace_id, node, event_type and (node, event_type)
+    - index queries walk only the matching events, newest first: O(k)
+
+    Every slot is addressed by a monotonically increasing sequence number,
+    so index entries are plain ints and eviction is a popleft on each
+    index deque the evicted event belongs to.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._slots: List[Optional[MirrorNodeEvent]] = [None] * capacity
+        self._next_seq = 0  # sequence number of the next append
+
+        self._by_trace: Dict[str, Deque[int]] = {}
+        self._by_node: Dict[str, Deque[int]] = {}
+        self._by_type: Dict[str, Deque[int]] = {}
+        self._by_node_type: Dict[Tuple[str, str], Deque[int]] = {}
+
+    # --------------------------------------------------------
+    # WRITE
+    # --------------------------------------------------------
+
+    def append(self, event: MirrorNodeEvent) -> int:
+        """Store an event and return its sequence number."""
+        seq = self._next_seq
+        pos = seq % self.capacity
+
+        evicted = self._slots[pos]
+        if evicted is not None:
+            self._unindex(evicted, seq - self.capacity)
+
+        self._slots[pos] = event
+        self._index(event, seq)
+        self._next_seq = seq + 1
+        return seq
+
+    def extend(self, events: Iterable[MirrorNodeEvent]) -> List[int]:
+        """Store events in order and return their sequence numbers."""
+        return [self.append(event) for event in events]
+
+    def clear(self) -> None:
+        self._slots = [None] * self.capacity
+        self._next_seq = 0
+        self._by_trace.clear()
+        self._by_node.clear()
+        self._by_type.clear()
+        self._by_node_type.clear()
+
+    # --------------------------------------------------------
+    # READ
+    # --------------------------------------------------------
+
+    def recent(
+        self,
+        limit: int = 50,
+        node: Optional[str] = None,
+        event_type: Optional[EventType | str] = None,
+    ) -> List[MirrorNodeEvent]:
+        """
+        Return up to `limit` most recent events, oldest first,
+        optionally restricted to a node and/or event type.
+        """
+        if limit <= 0:
+            return []
+
+        etype = _type_key(event_type) if event_type is not None else None
+        if node is not None and etype is not None:
+            seqs = self._by_node_type.get((node, etype))
+        elif node is not None:
+            seqs = self._by_node.get(node)
+        elif etype is not None:
+            seqs = self._by_type.get(etype)
+        else:
+            start = max(self._oldest_seq, self._next_seq - limit)
+            return [self._at(s) for s in range(start, self._next_seq)]
+
+        if not seqs:
+            return []
+        out = [self._at(s) for s in _tail(seqs, limit)]
+        out.reverse()
+        return out
+
+    def by_trace(self, trace_id: str) -> List[MirrorNodeEvent]:
+        """Return all retained events for a trace, oldest first."""
+        seqs = self._by_trace.get(trace_id)
+        return [self._at(s) for s in seqs] if seqs else []
+
+    def latest_for_trace(self, trace_id: str) -> Optional[MirrorNodeEvent]:
+        """Return the most recent event for a trace, if retained."""
+        seqs = self._by_trace.get(trace_id)
+        return self._at(seqs[-1]) if seqs else None
+
+    def __len__(self) -> int:
+        return self._next_seq - self._oldest_seq
+
+    def __iter__(self) -> Iterator[MirrorNodeEvent]:
+        for s in range(self._oldest_seq, self._next_seq):
+            yield self._at(s)
+
+    # --------------------------------------------------------
+    # INTERNALS
+    # --------------------------------------------------------
+
+    @property
+    def _oldest_seq(self) -> int:
+        return max(0, self._next_seq - self.capacity)
+
+    def _at(self, seq: int) -> MirrorNodeEvent:
+        return self._slots[seq % self.capacity]  # type: ignore[return-value]
+
+    def _keys(self, event: MirrorNodeEvent):
+        etype = _type_key(event.event_type)
+        yield self._by_node, event.node
+        yield self._by_type, etype
+        yield self._by_node_type, (event.node, etype)
+        if event.trace_id:
+            yield self._by_trace, event.trace_id
+
+    def _index(self, event: MirrorNodeEvent, seq: int) -> None:
+        for index, key in self._keys(event):
+            bucket = index.get(key)
+            if bucket is None:
+                bucket = index[key] = deque()
+            bucket.append(seq)
+
+    def _unindex(self, event: MirrorNodeEvent, seq: int) -> None:
+        # The evicted event is the oldest overall, hence the oldest
+        # entry in every bucket it belongs to.
+        for index, key in self._keys(event):
+            bucket = index.get(key)
+            if bucket and bucket[0] == seq:
+                bucket.popleft()
+                if not bucket:
+                    del index[key]
+
+
+def _type_key(event_type: EventType | str) -> str:
+    return event_type.value if isinstance(event_type, EventType) else str(event_type)
+
+
+def _tail(seqs: Deque[int], limit: int) -> Iterator[int]:
+    """Yield up to `limit` sequence numbers from the right, newest first."""
+    for i, seq in enumerate(reversed(seqs)):
+        if i >= limit:
+            break
+        yield seq
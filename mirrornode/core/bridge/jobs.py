@@ -0,0 +1,273 @@
+# mirrornode/core/bridge/jobs.py
+
+from __future__ import annotations
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import logging
+import sqlite3
+
+from mirrornode.core.bridge.router import EventRouter
+from mirrornode.core.bridge.scheduler import DispatchScheduler, SchedulerSaturated
+from mirrornode.core.events.schema import EventType, MirrorNodeEvent
+
+logger = logging.getLogger(__name__)
+
+AUDIT_PRIORITY = -1  # bulk audit jobs yield to interactive events (default 0)
+
+
+class SQLiteAuditJobStore:
+    """Persistent audit job table: queued -> processing -> completed | failed."""
+
+    def __init__(self, db_path: str = "mirrornode_audit.db") -> None:
+        self.path = Path(db_path)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS audit_jobs (
+                    trace_id TEXT PRIMARY KEY,
+                    event TEXT,
+                    status TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    origin TEXT,
+                    pipeline_config TEXT,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS audit_jobs_status ON audit_jobs (status)"
+            )
+
+    def create(self, trace_id: str, event: str, pipeline_config: Dict[str, Any], origin: str) -> None:
+        now = _now()
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("""
+                INSERT INTO audit_jobs
+                (trace_id, event, status, created_at, updated_at, origin, pipeline_config)
+                VALUES (?, ?, 'queued', ?, ?, ?, ?)
+            """, (trace_id, event, now, now, origin, json.dumps(pipeline_config)))
+
+    def set_status(
+        self,
+        trace_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("""
+                UPDATE audit_jobs SET status = ?, updated_at = ?, result = ?, error = ?
+                WHERE trace_id = ?
+            """, (status, _now(), json.dumps(result) if result is not None else None, error, trace_id))
+
+    def load(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        with sqlite3.connect(self.path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                "SELECT * FROM audit_jobs WHERE trace_id = ?", (trace_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["pipeline_config"] = json.loads(job["pipeline_config"] or "{}")
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def unfinished(self) -> List[str]:
+        """Jobs that were queued or in flight when the process last stopped."""
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute("""
+                SELECT trace_id FROM audit_jobs
+                WHERE status IN ('queued', 'processing')
+                ORDER BY created_at
+            """).fetchall()
+        return [r[0] for r in rows]
+
+
+class AuditJobQueue:
+    """
+    Runs audit jobs outside the HTTP request.
+
+    - submit() records the job and returns immediately
+    - `workers` tasks move jobs through processing -> completed/failed,
+      dispatching through the DispatchScheduler at AUDIT_PRIORITY
+    - every status change is published to router subscribers (/stream)
+      as an ANALYSIS event carrying the job's trace_id
+    - unfinished jobs from a previous run are re-queued by start(),
+      called from the app's startup hook (and lazily on first submit);
+      `store` may be attached there too, so importing the app opens no DB
+    - a submit holds its queue slot across the store write, so a full
+      queue is a 503 before anything is persisted
+    """
+
+    def __init__(
+        self,
+        store: Optional[SQLiteAuditJobStore],
+        scheduler: DispatchScheduler,
+        router: EventRouter,
+        workers: int = 2,
+        max_pending: int = 1000,
+    ):
+        self.store = store
+        self.scheduler = scheduler
+        self.router = router
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._ready: Optional[asyncio.Event] = None
+        self._claimed = 0  # slots held by submits still writing to the store
+
+    async def submit(
+        self,
+        trace_id: str,
+        event: str,
+        pipeline_config: Dict[str, Any],
+        origin: str,
+    ) -> Dict[str, Any]:
+        await self.start()
+        if self._queue.qsize() + self._claimed >= self.max_pending:
+            raise SchedulerSaturated(503, "Audit queue is full", 5)
+
+        self._claimed += 1
+        try:
+            await asyncio.to_thread(self.store.create, trace_id, event, pipeline_config, origin)
+            self._queue.put_nowait(trace_id)  # the claimed slot guarantees room
+        finally:
+            self._claimed -= 1
+        await self._publish(trace_id, "queued")
+        return await asyncio.to_thread(self.store.load, trace_id)
+
+    async def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.load, trace_id)
+
+    # --------------------------------------------------------
+    # WORKERS
+    # --------------------------------------------------------
+
+    async def start(self) -> None:
+        """
+        Start the workers on the running loop and re-queue jobs left
+        unfinished by a previous run. Idempotent; concurrent callers wait
+        for the first one instead of starting a second worker set.
+        """
+        if self.store is None:
+            raise RuntimeError("AuditJobQueue has no store; attach one before start()")
+        loop = asyncio.get_running_loop()
+        while self._loop is loop:
+            if self._ready.is_set():
+                return
+            await self._ready.wait()
+
+        # claim the loop before awaiting so no other caller recovers jobs too
+        self._loop = loop
+        self._ready = ready = asyncio.Event()
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        try:
+            for trace_id in await asyncio.to_thread(self.store.unfinished):
+                if self._queue.full():
+                    break
+                self._queue.put_nowait(trace_id)
+            self._tasks = [
+                asyncio.create_task(self._worker(i), name=f"audit-worker-{i}")
+                for i in range(self.workers)
+            ]
+        except BaseException:
+            self._loop = None
+            raise
+        finally:
+            ready.set()
+        logger.info(
+            f"[jobs] Started {self.workers} audit workers ({self._queue.qsize()} recovered)"
+        )
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            trace_id = await self._queue.get()
+            try:
+                await self._run(trace_id)
+            except Exception as exc:
+                logger.exception(f"[jobs] worker {n} failed on {trace_id}")
+                await asyncio.to_thread(self.store.set_status, trace_id, "failed", None, str(exc))
+                await self._publish(trace_id, "failed", error=str(exc))
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, trace_id: str) -> None:
+        job = await asyncio.to_thread(self.store.load, trace_id)
+        if job is None or job["status"] in ("completed", "failed"):
+            return
+
+        await asyncio.to_thread(self.store.set_status, trace_id, "processing")
+        await self._publish(trace_id, "processing")
+
+        event = MirrorNodeEvent(
+            event_type="ANALYSIS",
+            node="osiris",
+            source={"node": "osiris-hud", "surface": "web", "origin": job["origin"]},
+            payload={
+                "audit_event": job["event"],
+                "pipeline_config": job["pipeline_config"],
+            },
+            trace_id=trace_id,
+            priority=AUDIT_PRIORITY,
+        )
+        event.ensure_metadata()
+
+        while True:
+            try:
+                outcomes = await self.scheduler.submit(event)
+                break
+            except SchedulerSaturated as exc:
+                # jobs are not user-facing: wait our turn instead of failing
+                await asyncio.sleep(exc.retry_after)
+
+        result = {
+            "adapters": {
+                name: {"status": o["status"], "latency_ms": round(o["latency_ms"], 3), "error": o["error"]}
+                for name, o in outcomes.items()
+            }
+        }
+        ok = not outcomes or any(o["status"] == "ok" for o in outcomes.values())
+        status = "completed" if ok else "failed"
+        error = None if ok else "all adapters failed"
+
+        await asyncio.to_thread(self.store.set_status, trace_id, status, result, error)
+        await self._publish(trace_id, status, result=result, error=error)
+
+    async def _publish(
+        self,
+        trace_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        # status updates go to history and streams only, not to adapters
+        update = MirrorNodeEvent(
+            event_type=EventType.ANALYSIS,
+            node="osiris",
+            source={"node": "bridge", "surface": "jobs", "origin": "audit"},
+            payload={"audit_status": status, "result": result, "error": error},
+            trace_id=trace_id,
+        )
+        update.ensure_metadata()
+        await self.router.dispatch(update, adapters=())
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
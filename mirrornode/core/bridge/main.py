@@ -6,29 +6,46 @@ Authority: THOTH Security Commander
 Date: 2025-01-09
 Status: LOCKDOWN PASS ACTIVE
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, Request
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.errors import RateLimitExceeded
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any, Literal
-from pydantic import BaseModel, Field
+import os
+import json
+import sqlite3
+import time
+from typing import AsyncIterator, List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, Field, ValidationError
 from datetime import datetime
 import uuid
 
-from mirrornode.core.events.schema import MirrorNodeEvent
+from mirrornode.core.events.schema import MirrorNodeEvent, EventType
 from mirrornode.core.events.validator import validate_event
+from mirrornode.core.events.log import EventLog
 from mirrornode.core.bridge.router import EventRouter
+from mirrornode.core.bridge.cache import ResponseCache, oracle_cache_key
+from mirrornode.core.bridge.scheduler import DispatchScheduler, SchedulerSaturated
+from mirrornode.core.bridge.jobs import AuditJobQueue, SQLiteAuditJobStore
+from mirrornode.core.bridge.ratelimit import RouteRateLimiter, create_bucket_store, identity_of
+from mirrornode.core.bridge.subscription import OverflowPolicy, SubscriberOverflow
 from mirrornode.core.adapters.claude import ClaudeAdapter
 from mirrornode.core.adapters.theia import TheiaAdapter
 from mirrornode.core.adapters.grok import GrokAdapter
 from mirrornode.core.adapters.gpt import GptAdapter
-from mirrornode.core.bridge.security import require_api_key, get_api_key
-from mirrornode.core.bridge.schemas import AuditRequest, AuditResponse
+from mirrornode.core.adapters.http import close_http_client
+from mirrornode.core.metering import BudgetExceeded, UsageMeter
+from mirrornode.core.bridge.security import key_registry, require_scope
+from mirrornode.core.bridge.schemas import (
+    AuditRequest,
+    AuditResponse,
+    StreamFilter,
+    StreamBatchConfig,
+)
 
 # Initialize rate limiter
 limiter = Limiter(
@@ -37,13 +54,65 @@ limiter = Limiter(
     storage_uri="memory://",
 )
 
+# Token-bucket limits for the expensive routes, charged per API key and
+# shared across workers when MIRRORNODE_RATELIMIT_BACKEND=sqlite:///<dir>
+# (relative; sqlite:////<dir> for an absolute path)
+rate_limits = RouteRateLimiter(
+    create_bucket_store(os.getenv("MIRRORNODE_RATELIMIT_BACKEND", "memory://")),
+    routes={
+        "oracle": "10/minute",  # Very strict for Oracle invocations
+        "event": "30/minute",   # Stricter than default for event submission
+        "audit": "20/minute",   # Moderate limit for audit jobs
+        "batch": "10/minute",   # /events/batch requests...
+        "batch_items": "10000/minute",  # ...and the events inside them
+    },
+)
+MAX_BATCH_EVENTS = 5000
+RATELIMIT_OVERRIDES = json.loads(os.getenv("MIRRORNODE_RATELIMIT_OVERRIDES", "{}"))
+
+def _apply_key_quotas(registry) -> None:
+    """Per-key quotas from the key registry win over env overrides."""
+    rate_limits.set_overrides({**RATELIMIT_OVERRIDES, **registry.quotas()})
+
+rate_limits.set_overrides(RATELIMIT_OVERRIDES)
+key_registry.on_reload(_apply_key_quotas)
+key_registry.install_sighup()
+
+# Durable event log (enabled when MIRRORNODE_EVENT_LOG_DIR is set)
+EVENT_LOG_DIR = os.getenv("MIRRORNODE_EVENT_LOG_DIR")
+event_log = EventLog(EVENT_LOG_DIR) if EVENT_LOG_DIR else None
+
 # Router instance
-router = EventRouter(history_size=100)
+router = EventRouter(history_size=100, event_log=event_log)
+# Priority/fair-share scheduler between HTTP handlers and router.dispatch
+scheduler = DispatchScheduler(router, workers=8, max_queue=1000, per_source_limit=250)
+
+# Audit job pipeline (persistent job table + background workers);
+# the job table is opened by the startup hook, not at import
+AUDIT_DB = os.getenv("MIRRORNODE_AUDIT_DB", "mirrornode_audit.db")
+audit_jobs = AuditJobQueue(None, scheduler, router, workers=2)
+# Oracle responses keyed on (mode, prompt, ritualState, context)
+oracle_cache = ResponseCache(
+    ttl=float(os.getenv("MIRRORNODE_ORACLE_CACHE_TTL", "300")),
+    max_entries=1024,
+    max_bytes=8 * 1024 * 1024,
+)
+STREAM_QUEUE_SIZE = 256  # per-client /stream backlog before overflow policy applies
 router.register_adapter("claude", ClaudeAdapter())
 router.register_adapter("theia", TheiaAdapter())
 router.register_adapter("grok", GrokAdapter())
 router.register_adapter("gpt", GptAdapter())
 
+# Token/latency accounting; daily per-key token budgets as
+# MIRRORNODE_TOKEN_BUDGETS='{"<key_id>": 200000, "*": 50000}'
+usage_meter = UsageMeter(
+    db_path=os.getenv("MIRRORNODE_USAGE_DB"),
+    budgets=json.loads(os.getenv("MIRRORNODE_TOKEN_BUDGETS", "{}")),
+    flush_interval=float(os.getenv("MIRRORNODE_USAGE_FLUSH_INTERVAL", "30")),
+)
+for adapter in router.adapters.values():
+    adapter.meter = usage_meter
+
 # FastAPI application
 app = FastAPI(
     title="MIRRORNODE Bridge",
@@ -57,6 +126,16 @@ app.state.limiter = limiter
 # Register rate limit exception handler
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+async def _scheduler_saturated_handler(request: Request, exc: SchedulerSaturated):
+    """Admission control: tell clients when to come back."""
+    return JSONResponse(
+        {"error": str(exc), "code": exc.status_code},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+app.add_exception_handler(SchedulerSaturated, _scheduler_saturated_handler)
+
 # Add rate limiting middleware
 app.add_middleware(SlowAPIMiddleware)
 
@@ -121,17 +200,22 @@ async def health():
 @app.post(
     "/oracle",
     response_model=OracleResponse,
-    dependencies=[Depends(require_api_key)],
+    dependencies=[Depends(require_scope("oracle")), Depends(rate_limits.limit("oracle"))],
     tags=["oracle"]
 )
-@limiter.limit("10/minute")  # Very strict for Oracle invocations
+@limiter.exempt  # limited by rate_limits instead
 async def oracle(request: Request, oracle_request: OracleRequest):
     """
     Oracle invocation endpoint for Mirror Mirror.
     
     Security:
         - Requires X-API-Key header
-        - Rate limit: 10 requests/minute
+        - Rate limit: 10 requests/minute per API key (token bucket)
+    
+    Caching:
+        Identical (mode, prompt, ritualState, context) requests share a
+        cached answer; concurrent duplicates wait on a single call.
+        metadata["cache"] is "hit", "coalesced" or "miss".
     
     Args:
         oracle_request: Oracle invocation parameters
@@ -143,59 +227,278 @@ async def oracle(request: Request, oracle_request: OracleRequest):
     
     logger.info(f"Oracle invoked: mode={oracle_request.mode}, session={oracle_request.sessionId}")
     
-    # Stub response - will be replaced with actual oracle logic
-    response_text = f"[ORACLE STUB - {oracle_request.mode.upper()}] {oracle_request.prompt}"
+    key = oracle_cache_key(
+        oracle_request.mode,
+        oracle_request.prompt,
+        oracle_request.ritualState,
+        oracle_request.context,
+    )
+    result, cache_status = await oracle_cache.get_or_compute(
+        key, lambda: _invoke_oracle(oracle_request)
+    )
     
     return OracleResponse(
-        text=response_text,
+        text=result["text"],
         traceId=trace_id,
-        audioUrl=None,
+        audioUrl=result.get("audioUrl"),
         metadata={
             "mode": oracle_request.mode,
             "ritualState": oracle_request.ritualState,
-            "sessionId": oracle_request.sessionId
+            "sessionId": oracle_request.sessionId,
+            "cache": cache_status,
         }
     )
 
+async def _invoke_oracle(oracle_request: OracleRequest) -> Dict[str, Any]:
+    """Produce the cacheable part of an oracle answer."""
+    # Stub response - will be replaced with actual oracle logic
+    response_text = f"[ORACLE STUB - {oracle_request.mode.upper()}] {oracle_request.prompt}"
+    return {"text": response_text, "audioUrl": None}
+
+OracleProvider = Literal["claude", "gpt"]
+
+async def _oracle_frames(
+    oracle_request: OracleRequest,
+    provider: str,
+    key_id: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Token frames for a streamed oracle answer, then one final frame.
+    Charged to `key_id`'s token budget like /oracle (metered_stream).
+    
+    Frames:
+        {"type": "token", "text": "..."}              per provider delta
+        {"type": "done", "traceId", "text", "metadata"} on success
+        {"type": "error", "traceId", "detail"}        on provider failure
+        {"type": "error", "traceId", "code": "budget_exceeded", "detail"}
+    """
+    trace_id = str(uuid.uuid4())
+    started = time.perf_counter()
+    ttft_ms: Optional[float] = None
+    parts: List[str] = []
+    
+    logger.info(
+        f"Oracle stream: mode={oracle_request.mode}, provider={provider}, "
+        f"session={oracle_request.sessionId}"
+    )
+    
+    try:
+        async for text in router.adapters[provider].metered_stream(
+            oracle_request.prompt, key_id=key_id, trace_id=trace_id
+        ):
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+            parts.append(text)
+            yield {"type": "token", "text": text}
+    except BudgetExceeded as exc:
+        yield {"type": "error", "traceId": trace_id, "code": "budget_exceeded", "detail": str(exc)}
+        return
+    except Exception as exc:
+        logger.error(f"Oracle stream error ({provider}): {exc}")
+        yield {"type": "error", "traceId": trace_id, "detail": str(exc)}
+        return
+    
+    yield {
+        "type": "done",
+        "traceId": trace_id,
+        "text": "".join(parts),
+        "metadata": {
+            "mode": oracle_request.mode,
+            "ritualState": oracle_request.ritualState,
+            "sessionId": oracle_request.sessionId,
+            "provider": provider,
+            "ttft_ms": round(ttft_ms, 3) if ttft_ms is not None else None,
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+        },
+    }
+
+@app.post(
+    "/oracle/stream",
+    dependencies=[Depends(require_scope("oracle")), Depends(rate_limits.limit("oracle"))],
+    tags=["oracle"]
+)
+@limiter.exempt  # limited by rate_limits instead
+async def oracle_stream(
+    request: Request,
+    oracle_request: OracleRequest,
+    provider: OracleProvider = Query("claude"),
+):
+    """
+    Streaming oracle invocation over Server-Sent Events.
+    
+    Security:
+        - Requires X-API-Key header
+        - Rate limit: shares the /oracle bucket
+    
+    Each frame from _oracle_frames is sent as `event: <type>` with the
+    frame as JSON data. Streamed answers bypass the oracle cache.
+    
+    Args:
+        oracle_request: Oracle invocation parameters
+        provider: Adapter that generates the answer
+    
+    Returns:
+        text/event-stream response
+    """
+    async def events():
+        async for frame in _oracle_frames(oracle_request, provider, request.state.api_key.key_id):
+            yield f"event: {frame['type']}\ndata: {json.dumps(frame)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.post(
     "/event",
-    dependencies=[Depends(require_api_key)],
+    dependencies=[Depends(require_scope("events")), Depends(rate_limits.limit("event"))],
     tags=["events"]
 )
-@limiter.limit("30/minute")  # Stricter than default for event submission
+@limiter.exempt  # limited by rate_limits instead
 async def post_event(request: Request, event: MirrorNodeEvent):
     """
     Submit event to MIRRORNODE event router.
     
     Security:
         - Requires X-API-Key header
-        - Rate limit: 30 requests/minute
+        - Rate limit: 30 requests/minute per API key (token bucket)
+        - Admission control: 429 (source backlog) or 503 (scheduler
+          full) with Retry-After
     
     Args:
-        event: MirrorNodeEvent to route
+        event: MirrorNodeEvent to route; higher priority is dispatched first
     
     Returns:
-        JSON with status="routed"
+        JSON with status="routed", trace_id and per-adapter status/latency
     """
     valid, msg = validate_event(event)
     if not valid:
         raise HTTPException(status_code=400, detail=msg)
 
     event.ensure_metadata()
-    await router.dispatch(event)
+    event._api_key_id = request.state.api_key.key_id
+    outcomes = await scheduler.submit(event)
     
     logger.info(f"Event routed: type={event.event_type}, node={event.node}")
 
-    return JSONResponse({"status": "routed"})
+    return JSONResponse({
+        "status": "routed",
+        "trace_id": event.trace_id,
+        "adapters": {
+            name: {"status": o["status"], "latency_ms": round(o["latency_ms"], 3)}
+            for name, o in outcomes.items()
+        },
+    })
+
+@app.post(
+    "/events/batch",
+    dependencies=[Depends(require_scope("events")), Depends(rate_limits.limit("batch"))],
+    tags=["events"]
+)
+@limiter.exempt  # limited by rate_limits instead
+async def post_event_batch(request: Request):
+    """
+    Submit many events in one request.
+    
+    Security:
+        - Requires X-API-Key header
+        - Rate limit: 10 batches/minute plus 10000 events/minute per API key
+          (token buckets; a batch is charged one token per valid event)
+    
+    Body:
+        application/x-ndjson (one event per line) or a JSON array of
+        events, at most MAX_BATCH_EVENTS items
+    
+    Each item is validated on its own; valid events go through the
+    DispatchScheduler as one batch (submit_many): priority and per-source
+    fair share apply, the batch is admitted whole or refused with
+    429/503, and each queued unit is one dispatch_many history/log write.
+    
+    Returns:
+        JSON with accepted/rejected counts, per-adapter outcome counts
+        and one {"index", "status", "trace_id", "error"} per item
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        raw_items = [line for line in body.splitlines() if line.strip()]
+    else:
+        try:
+            raw_items = json.loads(body)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {exc}")
+        if not isinstance(raw_items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of events")
+    
+    if len(raw_items) > MAX_BATCH_EVENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(raw_items)} events exceeds {MAX_BATCH_EVENTS}",
+        )
+    
+    items: List[Dict[str, Any]] = []
+    events: List[MirrorNodeEvent] = []
+    for index, raw in enumerate(raw_items):
+        try:
+            if isinstance(raw, bytes):
+                event = MirrorNodeEvent.model_validate_json(raw)
+            else:
+                event = MirrorNodeEvent.model_validate(raw)
+        except ValidationError as exc:
+            first = exc.errors(include_url=False)[0]
+            loc = ".".join(str(part) for part in first["loc"])
+            items.append({"index": index, "status": "invalid", "trace_id": None,
+                          "error": f"{loc}: {first['msg']}" if loc else first["msg"]})
+            continue
+        valid, msg = validate_event(event)
+        if not valid:
+            items.append({"index": index, "status": "invalid",
+                          "trace_id": event.trace_id, "error": msg})
+            continue
+        event.ensure_metadata()
+        event._api_key_id = request.state.api_key.key_id
+        events.append(event)
+        items.append({"index": index, "status": "routed",
+                      "trace_id": event.trace_id, "error": None})
+    
+    if events:
+        await rate_limits.acheck("batch_items", identity_of(request), cost=len(events))
+    
+    outcomes = await scheduler.submit_many(events)
+    
+    adapter_counts: Dict[str, Dict[str, int]] = {}
+    for per_event in outcomes:
+        for name, o in per_event.items():
+            counts = adapter_counts.setdefault(name, {"ok": 0, "timeout": 0, "error": 0})
+            counts[o["status"]] += 1
+    
+    logger.info(f"Event batch routed: accepted={len(events)}, rejected={len(items) - len(events)}")
+    
+    return JSONResponse({
+        "status": "routed",
+        "accepted": len(events),
+        "rejected": len(items) - len(events),
+        "adapters": adapter_counts,
+        "items": items,
+    })
 
 @app.get(
     "/events/recent",
     response_model=List[dict],
-    dependencies=[Depends(require_api_key)],
+    dependencies=[Depends(require_scope("events"))],
     tags=["events"]
 )
 @limiter.limit("60/minute")
-async def get_recent_events(request: Request):
+async def get_recent_events(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    node: Optional[str] = None,
+    event_type: Optional[EventType] = None,
+    trace_id: Optional[str] = None,
+    source: Literal["memory", "log"] = "memory",
+):
     """
     Retrieve recent events routed through MIRRORNODE.
     
@@ -203,53 +506,73 @@ async def get_recent_events(request: Request):
         - Requires X-API-Key header
         - Rate limit: 60 requests/minute
     
+    Args:
+        limit: Maximum number of events to return
+        node: Only events from this node
+        event_type: Only events of this type
+        trace_id: Only events for this trace (overrides node/event_type)
+        source: "memory" (indexed ring buffer) or "log" (durable event
+            log tail; reaches past the in-memory window, no filters)
+    
     Returns:
-        List of recent events (last 100)
+        List of recent events, oldest first
     """
-    return [jsonable_encoder(e) for e in router.history]
+    if source == "log":
+        if router.event_log is None:
+            raise HTTPException(status_code=404, detail="Event log not configured")
+        if node or event_type or trace_id:
+            raise HTTPException(status_code=400, detail="Filters require source=memory")
+        records = router.event_log.tail(limit)
+        return Response(
+            content=b"[" + b",".join(records) + b"]",
+            media_type="application/json",
+        )
+    
+    if trace_id:
+        events = router.get_trace(trace_id)[-limit:]
+    else:
+        events = router.get_recent(limit, node=node, event_type=event_type)
+    # Splice the cached per-event JSON instead of re-encoding each event
+    return Response(
+        content=b"[" + b",".join(e.json_bytes() for e in events) + b"]",
+        media_type="application/json",
+    )
 
 @app.post(
     "/audit",
     response_model=AuditResponse,
-    dependencies=[Depends(require_api_key)],
+    dependencies=[Depends(require_scope("audit")), Depends(rate_limits.limit("audit"))],
     tags=["osiris"]
 )
-@limiter.limit("20/minute")  # Moderate limit for audit jobs
+@limiter.exempt  # limited by rate_limits instead
 async def submit_audit(request: Request, audit: AuditRequest):
     """
     Submit audit job from Osiris HUD.
     
     Security:
         - Requires X-API-Key header
-        - Rate limit: 20 requests/minute
+        - Rate limit: 20 requests/minute per API key (token bucket)
         - Validates pipeline_config size (max 10KB)
     
     Args:
         audit: AuditRequest with trace_id, event, pipeline_config
     
     Returns:
-        AuditResponse with trace_id and status
+        AuditResponse with trace_id and status="queued"; poll
+        GET /audit/{trace_id} or watch /stream for progress
     """
     logger.info(f"Audit submitted: event={audit.event}, trace_id={audit.trace_id}")
     
-    # Create MirrorNodeEvent from audit request
-    mirror_event = MirrorNodeEvent(
-        event_type="ANALYSIS",
-        node="osiris",
-        source={
-            "node": "osiris-hud",
-            "surface": "web",
-            "origin": request.client.host if request.client else "unknown"
-        },
-        payload={
-            "audit_event": audit.event,
-            "pipeline_config": audit.pipeline_config
-        },
-        trace_id=str(audit.trace_id)
-    )
-    
-    # Route through event system
-    await router.dispatch(mirror_event)
+    # Persist and enqueue; workers dispatch outside this request
+    try:
+        await audit_jobs.submit(
+            trace_id=str(audit.trace_id),
+            event=audit.event,
+            pipeline_config=audit.pipeline_config,
+            origin=request.client.host if request.client else "unknown",
+        )
+    except sqlite3.IntegrityError:
+        raise HTTPException(status_code=409, detail="Audit trace_id already submitted")
     
     return AuditResponse(
         trace_id=audit.trace_id,
@@ -258,6 +581,63 @@ async def submit_audit(request: Request, audit: AuditRequest):
         message="Audit job queued for processing"
     )
 
+@app.get(
+    "/audit/{trace_id}",
+    response_model=AuditResponse,
+    dependencies=[Depends(require_scope("audit"))],
+    tags=["osiris"]
+)
+@limiter.limit("120/minute")  # Polling endpoint
+async def get_audit(request: Request, trace_id: uuid.UUID):
+    """
+    Poll an audit job's status.
+    
+    Security:
+        - Requires X-API-Key header
+        - Rate limit: 120 requests/minute
+    
+    Args:
+        trace_id: trace_id returned by POST /audit
+    
+    Returns:
+        AuditResponse with status queued | processing | completed | failed,
+        plus per-adapter results once completed
+    """
+    job = await audit_jobs.get(str(trace_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Audit job not found")
+    
+    return AuditResponse(
+        trace_id=trace_id,
+        status=job["status"],
+        timestamp=job["updated_at"],
+        message=job["error"],
+        result=job["result"],
+    )
+
+@app.get(
+    "/metrics/usage",
+    dependencies=[Depends(require_scope("metrics"))],
+    tags=["metrics"]
+)
+@limiter.limit("60/minute")
+async def get_usage(request: Request, trace_id: Optional[str] = None):
+    """
+    Provider token and latency usage since process start.
+    
+    Security:
+        - Requires X-API-Key header with the "metrics" scope
+        - Rate limit: 60 requests/minute
+    
+    Args:
+        trace_id: Also return the counters for this trace
+    
+    Returns:
+        JSON with per-adapter and per-API-key counters (requests, errors,
+        prompt/completion tokens, latency) and today's budget usage
+    """
+    return JSONResponse(usage_meter.snapshot(trace_id))
+
 @app.websocket("/stream")
 async def websocket_stream(ws: WebSocket):
     """
@@ -270,9 +650,27 @@ async def websocket_stream(ws: WebSocket):
     Protocol:
         1. Client connects
         2. Server accepts connection
-        3. Client sends: {"api_key": "mnk_live_..."}
-        4. Server validates key
-        5. Server streams events as JSON
+        3. Client sends:
+           {"api_key": "mnk_live_...",
+            "overflow": "drop_oldest",
+            "filter": {"node": ["osiris"], "event_type": ["ANALYSIS"],
+                       "min_priority": 5, "payload_equals": {"k": "v"},
+                       "payload_exists": ["audit_event"]},
+            "batch": {"max_size": 100, "flush_ms": 50}}
+           Only "api_key" is required.
+        4. Server validates key and stream options
+        5. Server streams {"type": "batch", "events": [...], "lagged": n}
+    
+    Filtering:
+        The filter is compiled once and evaluated by the router for each
+        event before it is queued, so non-matching events are never
+        serialized for this client.
+    
+    Backpressure:
+        Each client gets its own bounded queue (STREAM_QUEUE_SIZE).
+        "overflow" selects drop_oldest (default), drop_newest or
+        disconnect (close 1013). "lagged" is the number of events this
+        client has lost so far.
     """
     await ws.accept()
     
@@ -282,8 +680,8 @@ async def websocket_stream(ws: WebSocket):
         api_key = auth_msg.get("api_key")
         
         # Validate API key
-        expected_key = get_api_key()
-        if not api_key or api_key != expected_key:
+        record = key_registry.verify(api_key) if api_key else None
+        if record is None or not record.allows("stream"):
             await ws.send_json({
                 "error": "Invalid API key",
                 "code": 401,
@@ -295,19 +693,142 @@ async def websocket_stream(ws: WebSocket):
         
         logger.info(f"WebSocket authenticated from {ws.client}")
         
-        # Stream events
-        async for event in router.subscribe():
+        try:
+            policy = OverflowPolicy(auth_msg.get("overflow", OverflowPolicy.DROP_OLDEST))
+        except ValueError:
+            policy = OverflowPolicy.DROP_OLDEST
+        
+        # Filter and batching options
+        try:
+            stream_filter = StreamFilter(**(auth_msg.get("filter") or {}))
+            batching = StreamBatchConfig(**(auth_msg.get("batch") or {}))
+        except (TypeError, ValidationError) as exc:
             await ws.send_json({
-                "type": "event",
-                "event": jsonable_encoder(event)
+                "error": "Invalid stream options",
+                "code": 400,
+                "detail": str(exc)
             })
+            await ws.close(code=1008)
+            return
+        
+        # Stream events from a bounded, pre-filtered per-client queue
+        sub = router.open_subscription(
+            maxsize=STREAM_QUEUE_SIZE,
+            policy=policy,
+            name=f"ws:{ws.client}",
+            predicate=stream_filter.compile(),
+        )
+        try:
+            while True:
+                batch = await sub.get_batch(
+                    max_size=batching.max_size,
+                    flush_interval=batching.flush_ms / 1000,
+                )
+                # Events arrive pre-encoded; only the envelope is built here
+                frame = b"".join((
+                    b'{"type":"batch","events":[',
+                    b",".join(e.json_bytes() for e in batch),
+                    b'],"lagged":%d}' % sub.lagged,
+                ))
+                await ws.send_text(frame.decode("utf-8"))
+        except StopAsyncIteration:
+            pass
+        finally:
+            router.close_subscription(sub)
             
+    except SubscriberOverflow:
+        logger.warning(f"WebSocket client {ws.client} too slow; disconnecting")
+        await ws.close(code=1013)  # Try again later
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
     except Exception as exc:
         logger.exception("WebSocket stream error: %s", exc)
         await ws.close(code=1011)  # Internal error
 
+@app.websocket("/oracle/stream")
+async def websocket_oracle_stream(ws: WebSocket):
+    """
+    Streaming oracle invocation over WebSocket.
+    
+    Security:
+        - Expects API key in first message; key needs the "oracle" scope
+        - Charged to the same rate limit bucket as /oracle
+    
+    Protocol:
+        1. Client sends:
+           {"api_key": "...", "provider": "claude",
+            "request": {OracleRequest fields}}
+        2. Server sends one JSON frame per token, then a "done" or
+           "error" frame (see _oracle_frames), then closes
+    """
+    await ws.accept()
+    
+    try:
+        msg = await ws.receive_json()
+        api_key = msg.get("api_key")
+        
+        record = key_registry.verify(api_key) if api_key else None
+        if record is None or not record.allows("oracle"):
+            await ws.send_json({
+                "error": "Invalid API key",
+                "code": 401,
+                "detail": "WebSocket authentication failed"
+            })
+            await ws.close(code=1008)  # Policy violation
+            logger.warning(f"WebSocket auth failed from {ws.client}")
+            return
+        
+        try:
+            await rate_limits.acheck("oracle", record.key_id)
+        except HTTPException as exc:
+            await ws.send_json({"error": exc.detail, "code": exc.status_code})
+            await ws.close(code=1013)  # Try again later
+            return
+        
+        provider = msg.get("provider", "claude")
+        try:
+            oracle_request = OracleRequest(**(msg.get("request") or {}))
+            if provider not in OracleProvider.__args__:
+                raise ValueError(f"Unknown provider '{provider}'")
+        except (TypeError, ValueError) as exc:
+            await ws.send_json({
+                "error": "Invalid oracle request",
+                "code": 400,
+                "detail": str(exc)
+            })
+            await ws.close(code=1008)
+            return
+        
+        async for frame in _oracle_frames(oracle_request, provider, record.key_id):
+            await ws.send_json(frame)
+        await ws.close()
+    
+    except WebSocketDisconnect:
+        logger.info("Oracle WebSocket disconnected")
+    except Exception as exc:
+        logger.exception("Oracle WebSocket error: %s", exc)
+        await ws.close(code=1011)  # Internal error
+
+@app.on_event("startup")
+async def start_audit_workers():
+    """Open the audit job table, start its workers and resume unfinished jobs."""
+    if audit_jobs.store is None:
+        audit_jobs.store = await asyncio.to_thread(SQLiteAuditJobStore, AUDIT_DB)
+    await audit_jobs.start()
+
+@app.on_event("shutdown")
+async def close_provider_pool():
+    """
+    Stop audit workers, drain the dispatch scheduler, release pooled
+    provider connections, flush usage counters and close the router
+    (which flushes and closes the event log).
+    """
+    await audit_jobs.stop()
+    await scheduler.stop()
+    await close_http_client()
+    usage_meter.close()
+    router.close()
+
 # ============================================================
 # APPLICATION STARTUP
 # ============================================================
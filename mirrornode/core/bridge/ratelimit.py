@@ -0,0 +1,247 @@
+"""
+MIRRORNODE Rate Limiting
+Token buckets shared across uvicorn workers, keyed per route + API key
+
+Backends:
+    memory://          a per-process dict (single worker / tests)
+    sqlite:///<dir>    WAL-mode SQLite shards shared by every local worker;
+                       relative to the working directory, as in SQLAlchemy
+    sqlite:////<dir>   the same, with an absolute path
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Protocol, Tuple
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)\s*$")
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class BucketSpec:
+    """Refill `rate` tokens per second up to `burst` tokens."""
+    rate: float
+    burst: float
+
+    @classmethod
+    def parse(cls, limit: str) -> "BucketSpec":
+        """'30/minute' -> burst of 30, refilled evenly over a minute."""
+        m = _RATE_RE.match(limit)
+        if not m:
+            raise ValueError(f"Invalid rate limit: {limit!r}")
+        count, period = int(m.group(1)), _PERIODS[m.group(2)]
+        return cls(rate=count / period, burst=float(count))
+
+
+class BucketStore(Protocol):
+    blocking: bool  # acquire may block, so call it off the event loop
+
+    def acquire(self, key: str, spec: BucketSpec, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take `cost` tokens. Returns (allowed, seconds until enough tokens)."""
+        ...
+
+
+def _refill(tokens: float, updated: float, now: float, spec: BucketSpec) -> float:
+    return min(spec.burst, tokens + (now - updated) * spec.rate)
+
+
+def _wait(tokens: float, cost: float, spec: BucketSpec) -> float:
+    if spec.rate <= 0:
+        return float("inf")
+    return max(0.0, (cost - tokens) / spec.rate)
+
+
+class MemoryBucketStore:
+    """
+    Per-process buckets in one dict.
+    Called only from the event loop, so no locking is needed.
+    """
+
+    blocking = False
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def acquire(self, key: str, spec: BucketSpec, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (spec.burst, now))
+        tokens = _refill(tokens, updated, now, spec)
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            return True, 0.0
+        self._buckets[key] = (tokens, now)
+        return False, _wait(tokens, cost, spec)
+
+
+class SQLiteBucketStore:
+    """
+    Buckets in WAL-mode SQLite files under `directory`, one file per
+    shard, so workers contend only on the shard that owns a key.
+    Each acquire is a single BEGIN IMMEDIATE read-modify-write, which
+    may wait on other workers, so RouteRateLimiter runs it off the loop.
+    """
+
+    blocking = True
+
+    def __init__(self, directory: str | Path, shards: int = 4):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conns = [self._connect(self.directory / f"buckets-{i}.db") for i in range(shards)]
+        # one transaction per connection at a time across threads
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=1.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")  # limiter state need not survive power loss
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL,
+                updated REAL
+            )
+        """)
+        return conn
+
+    def acquire(self, key: str, spec: BucketSpec, cost: float = 1.0) -> Tuple[bool, float]:
+        shard = zlib.crc32(key.encode()) % len(self._conns)
+        with self._locks[shard]:
+            return self._acquire(self._conns[shard], key, spec, cost)
+
+    @staticmethod
+    def _acquire(conn: sqlite3.Connection, key: str, spec: BucketSpec,
+                 cost: float) -> Tuple[bool, float]:
+        now = time.time()  # wall clock: shared between processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = _refill(*row, now, spec) if row else spec.burst
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, 0.0 if allowed else _wait(tokens, cost, spec)
+
+
+def create_bucket_store(uri: str) -> BucketStore:
+    """
+    Build a backend from 'memory://', 'sqlite:///relative/dir' or
+    'sqlite:////absolute/dir'.
+    """
+    if uri.startswith("memory://"):
+        return MemoryBucketStore()
+    if uri.startswith("sqlite://"):
+        path = uri[len("sqlite://"):]
+        if path.startswith("/"):
+            path = path[1:]  # the separator before the path, not its root
+        return SQLiteBucketStore(path or "ratelimit")
+    raise ValueError(f"Unsupported rate limit backend: {uri!r}")
+
+
+class RouteRateLimiter:
+    """
+    Token-bucket limits per route, charged to the caller's API key
+    (remote address when no key is sent).
+
+    routes:    {"oracle": "10/minute", ...}
+    overrides: {<api key id>: {"oracle": "100/minute"}} where the id is
+               key_id(api_key); lets trusted keys get larger buckets
+    """
+
+    def __init__(
+        self,
+        store: BucketStore,
+        routes: Dict[str, str],
+        overrides: Optional[Dict[str, Dict[str, str]]] = None,
+    ):
+        self.store = store
+        self.routes = {name: BucketSpec.parse(v) for name, v in routes.items()}
+        self.overrides: Dict[str, Dict[str, BucketSpec]] = {}
+        self.set_overrides(overrides or {})
+
+    def set_overrides(self, overrides: Dict[str, Dict[str, str]]) -> None:
+        """Replace all per-key overrides (e.g. after an API key reload)."""
+        self.overrides = {
+            kid: {name: BucketSpec.parse(v) for name, v in limits.items()}
+            for kid, limits in overrides.items()
+        }
+
+    def check(self, route: str, identity: str, cost: float = 1.0) -> None:
+        """
+        Raise HTTP 429 with Retry-After if `identity` is over its bucket.
+
+        - a store that cannot be reached in time (SQLite "database is
+          locked" under worker contention) also answers 429, with a
+          one-second Retry-After, rather than failing the request with 500
+        """
+        spec = self.overrides.get(identity, {}).get(route) or self.routes[route]
+        try:
+            allowed, wait = self.store.acquire(f"{route}:{identity}", spec, cost)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"[ratelimit] bucket store unavailable for {route}: {e}")
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limiter busy for {route}",
+                headers={"Retry-After": "1"},
+            )
+        if not allowed:
+            retry_after = max(1, int(wait + 0.999)) if wait != float("inf") else 3600
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded for {route}",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    async def acheck(self, route: str, identity: str, cost: float = 1.0) -> None:
+        """check() from the event loop; blocking stores run in a thread."""
+        if self.store.blocking:
+            await asyncio.to_thread(self.check, route, identity, cost)
+        else:
+            self.check(route, identity, cost)
+
+    def limit(self, route: str):
+        """FastAPI dependency charging one token from `route`'s bucket."""
+        if route not in self.routes:
+            raise KeyError(f"No rate limit configured for route {route!r}")
+
+        async def dependency(request: Request) -> None:
+            await self.acheck(route, identity_of(request))
+
+        return dependency
+
+
+def key_id(api_key: str) -> str:
+    """Stable, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def identity_of(request: Request) -> str:
+    record = getattr(request.state, "api_key", None)
+    if record is not None:
+        return record.key_id  # already hashed by require_api_key
+    api_key = request.headers.get("X-API-Key")
+    if api_key:
+        return key_id(api_key)
+    return f"ip:{request.client.host if request.client else 'unknown'}"
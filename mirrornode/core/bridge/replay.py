@@ -0,0 +1,293 @@
+# mirrornode/core/bridge/replay.py
+
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import time
+
+from pydantic import ValidationError
+
+from mirrornode.core.bridge.router import EventRouter
+from mirrornode.core.events.log import EventLog, LogPosition
+from mirrornode.core.events.schema import MirrorNodeEvent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayStats:
+    replayed: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    position: Optional[LogPosition] = None
+    elapsed_s: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class EventReplayer:
+    """
+    Re-dispatches persisted events from an EventLog through an EventRouter.
+
+    - `speed` scales the original inter-event gaps (1.0 = real time,
+      10.0 = ten times faster, None = as fast as possible)
+    - events are re-dispatched with record=False, so history and the
+      log are not written twice; `adapters` narrows the fan-out and
+      `publish` controls whether live subscribers see replayed events
+    - repeated trace_ids are dropped (bounded by `dedupe_window`)
+    - progress is checkpointed to `checkpoint_path` every
+      `checkpoint_every` events so an interrupted replay can resume
+    - the dedupe window lives in an append-only sidecar next to the
+      checkpoint: each checkpoint appends only the trace_ids seen since
+      the last one and records the sidecar length, so bytes written
+      after that length (a crash mid-checkpoint) are dropped on resume;
+      the sidecar is compacted into a new generation once it holds
+      twice the window
+    """
+
+    def __init__(
+        self,
+        log: EventLog,
+        router: EventRouter,
+        speed: Optional[float] = 1.0,
+        adapters: Optional[Iterable[str]] = None,
+        publish: bool = False,
+        checkpoint_path: Optional[str | Path] = None,
+        checkpoint_every: int = 500,
+        max_in_flight: int = 64,
+        dedupe_window: int = 100_000,
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None for max")
+        self.log = log
+        self.router = router
+        self.speed = speed
+        self.adapters = list(adapters) if adapters is not None else None
+        self.publish = publish
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_every = checkpoint_every
+        self.max_in_flight = max_in_flight
+        self.dedupe_window = dedupe_window
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._unsaved: List[str] = []
+        self._seen_gen = 0
+        self._seen_bytes = 0
+        self._seen_lines = 0
+        self._rewrite_seen = False
+
+    # --------------------------------------------------------
+    # RUN
+    # --------------------------------------------------------
+
+    async def run(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        trace_ids: Optional[Iterable[str]] = None,
+        resume: bool = True,
+    ) -> ReplayStats:
+        """Replay [start, end), optionally only the given trace_ids."""
+        stats = ReplayStats()
+        wanted: Optional[Set[str]] = set(trace_ids) if trace_ids is not None else None
+        after = self.load_checkpoint() if resume else None
+        if after is not None:
+            logger.info(f"[replay] resuming after {after}")
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        anchor_ts: Optional[int] = None
+        in_flight: List[asyncio.Task] = []
+        gate = asyncio.Semaphore(self.max_in_flight)
+
+        async def send(event: MirrorNodeEvent) -> None:
+            try:
+                await self.router.dispatch(
+                    event,
+                    adapters=self.adapters,
+                    record=False,
+                    publish=self.publish,
+                )
+            finally:
+                gate.release()
+
+        for position, ts_us, record in self.log.scan(start, end, after=after):
+            stats.position = position
+            try:
+                event = MirrorNodeEvent.model_validate_json(record)
+            except ValidationError:
+                stats.skipped += 1
+                continue
+
+            if wanted is not None and event.trace_id not in wanted:
+                continue
+            if self._is_duplicate(event.trace_id):
+                stats.duplicates += 1
+                continue
+
+            # pace against the original timeline
+            if self.speed is not None:
+                if anchor_ts is None:
+                    anchor_ts = ts_us
+                delay = (ts_us - anchor_ts) / 1e6 / self.speed - (loop.time() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await gate.acquire()
+            in_flight.append(asyncio.create_task(send(event)))
+            stats.replayed += 1
+
+            if stats.replayed % self.checkpoint_every == 0:
+                await asyncio.gather(*in_flight)
+                in_flight.clear()
+                self.save_checkpoint(position, stats)
+
+        await asyncio.gather(*in_flight)
+        stats.elapsed_s = loop.time() - started
+        if stats.position is not None:
+            self.save_checkpoint(stats.position, stats)
+        logger.info(
+            f"[replay] replayed={stats.replayed} duplicates={stats.duplicates} "
+            f"skipped={stats.skipped} in {stats.elapsed_s:.2f}s"
+        )
+        return stats
+
+    def _is_duplicate(self, trace_id: Optional[str]) -> bool:
+        if not trace_id:
+            return False
+        if trace_id in self._seen:
+            return True
+        self._seen[trace_id] = None
+        if self.dedupe_window:
+            self._unsaved.append(trace_id)
+        if len(self._seen) > self.dedupe_window:
+            self._seen.popitem(last=False)
+        return False
+
+    # --------------------------------------------------------
+    # CHECKPOINTS
+    # --------------------------------------------------------
+
+    def load_checkpoint(self) -> Optional[LogPosition]:
+        """Position to resume after; also restores the dedupe window."""
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return None
+        data = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        if "seen_gen" in data:
+            self._seen_gen = data["seen_gen"]
+            seen = self._read_sidecar(data.get("seen_bytes", 0))
+        else:
+            # checkpoints written before the sidecar carry the window inline
+            seen = data.get("seen", [])
+            self._rewrite_seen = True
+        self._seen_lines = len(seen)
+        seen = seen[-self.dedupe_window:] if self.dedupe_window else []
+        self._seen = OrderedDict.fromkeys(seen)
+        self._unsaved = []
+        return LogPosition(*data["position"])
+
+    def save_checkpoint(self, position: LogPosition, stats: ReplayStats) -> None:
+        if self.checkpoint_path is None:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        previous = self._seen_gen
+        self._save_sidecar()
+        tmp = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + ".tmp")
+        tmp.write_text(json.dumps({
+            "position": list(position),
+            "replayed": stats.replayed,
+            "duplicates": stats.duplicates,
+            "seen_gen": self._seen_gen,
+            "seen_bytes": self._seen_bytes,
+            "saved_at": time.time(),
+        }), encoding="utf-8")
+        os.replace(tmp, self.checkpoint_path)
+        if self._seen_gen != previous:
+            self._sidecar(previous).unlink(missing_ok=True)
+
+    def _sidecar(self, gen: int) -> Path:
+        return self.checkpoint_path.with_name(f"{self.checkpoint_path.name}.seen.{gen}")
+
+    def _read_sidecar(self, length: int) -> List[str]:
+        """Trace_ids in the first `length` bytes; anything past it is cut off."""
+        path = self._sidecar(self._seen_gen)
+        try:
+            with path.open("rb+") as fh:
+                fh.truncate(length)
+                raw = fh.read()
+        except FileNotFoundError:
+            raw = b""
+        self._seen_bytes = len(raw)
+        return raw.decode("utf-8").splitlines()
+
+    def _save_sidecar(self) -> None:
+        """Append the trace_ids seen since the last checkpoint, compacting when due."""
+        if self._rewrite_seen or self._seen_lines + len(self._unsaved) > 2 * self.dedupe_window:
+            self._seen_gen += 1
+            chunk = "".join(f"{trace_id}\n" for trace_id in self._seen).encode("utf-8")
+            self._sidecar(self._seen_gen).write_bytes(chunk)
+            self._seen_bytes = len(chunk)
+            self._seen_lines = len(self._seen)
+            self._rewrite_seen = False
+        elif self._unsaved or self._seen_bytes == 0:
+            chunk = "".join(f"{trace_id}\n" for trace_id in self._unsaved).encode("utf-8")
+            with self._sidecar(self._seen_gen).open("ab" if self._seen_bytes else "wb") as fh:
+                fh.write(chunk)
+            self._seen_bytes += len(chunk)
+            self._seen_lines += len(self._unsaved)
+        self._unsaved.clear()
+
+
+# ------------------------------------------------------------
+# CLI ENTRYPOINT
+# ------------------------------------------------------------
+
+def run_replay(args) -> int:
+    """`python -m mirrornode replay` — replay a log into fresh adapters."""
+    from mirrornode.core.adapters import (
+        GptAdapter,
+        ClaudeAdapter,
+        GrokAdapter,
+        TheiaAdapter,
+    )
+
+    available = {
+        "claude": ClaudeAdapter,
+        "theia": TheiaAdapter,
+        "grok": GrokAdapter,
+        "gpt": GptAdapter,
+    }
+    names = args.adapters.split(",") if args.adapters else list(available)
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        print(f"unknown adapters: {', '.join(unknown)}")
+        return 2
+
+    router = EventRouter(history_size=1)
+    for name in names:
+        router.register_adapter(name, available[name]())
+
+    log = EventLog(args.log)
+    replayer = EventReplayer(
+        log,
+        router,
+        speed=None if args.speed == "max" else float(args.speed),
+        checkpoint_path=args.checkpoint,
+    )
+    stats = asyncio.run(replayer.run(
+        start=datetime.fromisoformat(args.since) if args.since else None,
+        end=datetime.fromisoformat(args.until) if args.until else None,
+        trace_ids=args.trace or None,
+    ))
+    router.close()
+    log.close()
+
+    print(json.dumps(stats.to_dict(), indent=2))
+    return 0
@@ -1,11 +1,18 @@
 # mirrornode/core/bridge/router.py
 
 from __future__ import annotations
-from typing import Dict, List, Callable, Coroutine, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, List, Callable, Coroutine, Any, Optional, Set
 import asyncio
+import inspect
 import logging
+import time
 
-from mirrornode.core.events.schema import MirrorNodeEvent
+from mirrornode.core.contracts.adapter_response import AdapterResponse, AdapterStatus
+from mirrornode.core.events.schema import MirrorNodeEvent, EventType
+from mirrornode.core.events.log import EventLog
+from mirrornode.core.bridge.history import EventHistory
+from mirrornode.core.bridge.subscription import OverflowPolicy, Subscription
 
 logger = logging.getLogger(__name__)
 
@@ -14,14 +21,31 @@ class EventRouter:
     """
     Central in-memory router for MirrorNodeEvent objects.
 
-    - keeps a bounded list of recent events
-    - fans out events to registered subscribers via queues
+    - keeps a bounded, indexed ring buffer of recent events
+    - optionally appends every event to a durable EventLog
+    - fans out events to registered subscribers and to bounded
+      per-client subscription queues
     - can be extended to route by node, event_type, etc.
     """
 
-    def __init__(self, history_size: int = 1000):
-        self.history: List[MirrorNodeEvent] = []
+    def __init__(
+        self,
+        history_size: int = 1000,
+        adapter_timeout: float = 10.0,
+        max_workers: int = 4,
+        event_log: Optional[EventLog] = None,
+    ):
+        self.history = EventHistory(capacity=history_size)
         self.history_size = history_size
+        self.event_log = event_log
+
+        # per-adapter deadline (seconds) and bounded pool for sync adapters
+        self.adapter_timeout = adapter_timeout
+        self.adapter_timeouts: Dict[str, float] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="router-adapter",
+        )
 
         # subscribers: name -> coroutine(event)
         self.subscribers: Dict[str, Callable[[MirrorNodeEvent], 
@@ -30,6 +54,9 @@ Coroutine[Any, Any, None]]] = {}
         # adapters: name -> callable(event)
         self.adapters: Dict[str, Callable[[MirrorNodeEvent], Any]] = {}
 
+        # live streams: one bounded queue per client
+        self.subscriptions: Set[Subscription] = set()
+
     # --------------------------------------------------------
     # SUBSCRIBE & ADAPTER REGISTRATION
     # --------------------------------------------------------
@@ -42,60 +69,242 @@ Coroutine[Any, Any, None]]] = {}
         logger.info(f"[router] Registered subscriber: {name}")
         self.subscribers[name] = handler
 
+    def open_subscription(
+        self,
+        maxsize: int = 256,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        name: Optional[str] = None,
+        predicate: Optional[Callable[[MirrorNodeEvent], bool]] = None,
+    ) -> Subscription:
+        """
+        Attach a bounded queue that receives every dispatched event
+        matching `predicate` (all events if None).
+        Caller must pass it to close_subscription() when done.
+        """
+        sub = Subscription(maxsize=maxsize, policy=policy, name=name, predicate=predicate)
+        self.subscriptions.add(sub)
+        logger.info(f"[router] Opened subscription: {name or id(sub)} ({sub.policy.value})")
+        return sub
+
+    def close_subscription(self, sub: Subscription) -> None:
+        sub.close()
+        self.subscriptions.discard(sub)
+        logger.info(f"[router] Closed subscription: {sub.name or id(sub)} (lagged={sub.lagged})")
+
+    async def subscribe(
+        self,
+        maxsize: int = 256,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        name: Optional[str] = None,
+        predicate: Optional[Callable[[MirrorNodeEvent], bool]] = None,
+    ) -> AsyncIterator[MirrorNodeEvent]:
+        """
+        Async generator yielding events as they are dispatched.
+
+        A slow consumer never blocks dispatch: its queue overflows per
+        `policy`, and DISCONNECT raises SubscriberOverflow to the consumer.
+        """
+        sub = self.open_subscription(
+            maxsize=maxsize, policy=policy, name=name, predicate=predicate
+        )
+        try:
+            async for event in sub:
+                yield event
+        finally:
+            self.close_subscription(sub)
+
     def register_adapter(
         self,
         name: str,
-        adapter: Callable[[MirrorNodeEvent], Any]
+        adapter: Callable[[MirrorNodeEvent], Any],
+        timeout: Optional[float] = None,
     ) -> None:
         """
         Adapters receive events but do NOT need to be async.
         They return transformed output or None.
+
+        `adapter` may be a callable or an object exposing `handle(event)`.
+        Coroutine handlers are awaited on the loop; sync handlers run in
+        the router's thread pool. `timeout` overrides adapter_timeout.
         """
         logger.info(f"[router] Registered adapter: {name}")
         self.adapters[name] = adapter
+        if timeout is not None:
+            self.adapter_timeouts[name] = timeout
 
     # --------------------------------------------------------
     # EVENT DISPATCH
     # --------------------------------------------------------
 
-    async def dispatch(self, event: MirrorNodeEvent) -> Dict[str, Any]:
+    async def dispatch(
+        self,
+        event: MirrorNodeEvent,
+        *,
+        adapters: Optional[Iterable[str]] = None,
+        record: bool = True,
+        publish: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
         """
         Dispatch an event to:
-        - all async subscribers
-        - all sync adapters
+        - all live subscription queues and async subscribers (publish)
+        - all adapters, or only those named in `adapters`, concurrently,
+          each under its own timeout
+
+        `record=False` skips history and the event log; replays use it
+        so re-dispatched events are not persisted twice.
 
-        Returns a dict containing adapter results.
+        Returns a dict of adapter name -> outcome:
+            {"status": "ok" | "timeout" | "error",
+             "result": <adapter return value or None>,
+             "latency_ms": float,
+             "error": <message or None>}
         """
         logger.debug(f"[router] Dispatching event: {event.event_type}")
 
-        # save to history
-        self.history.append(event)
-        if len(self.history) > self.history_size:
-            self.history.pop(0)
+        # encode once; history readers, streams and persistence reuse it
+        event.json_bytes()
+
+        # save to history (and the durable log, group-committed off-loop)
+        if record:
+            self.history.append(event)
+            if self.event_log is not None:
+                self.event_log.append(event.json_bytes(), event.timestamp)
+
+        if publish:
+            # feed live streams (never blocks)
+            self._publish(event)
 
-        responses: Dict[str, Any] = {}
+            # fire async subscribers
+            await asyncio.gather(
+                *(handler(event) for handler in self.subscribers.values()),
+                return_exceptions=False
+            )
 
-        # fire async subscribers
-        await asyncio.gather(
-            *(handler(event) for handler in self.subscribers.values()),
-            return_exceptions=False
+        # fan out to adapters
+        names = list(self.adapters) if adapters is None else [
+            name for name in adapters if name in self.adapters
+        ]
+        outcomes = await asyncio.gather(
+            *(self._run_adapter(name, self.adapters[name], event) for name in names)
         )
+        return dict(zip(names, outcomes))
 
-        # run sync adapters
-        for name, adapter in self.adapters.items():
-            try:
-                responses[name] = adapter(event)
-            except Exception as ex:
-                logger.error(f"[router] Adapter '{name}' error: {ex}")
-                responses[name] = None
+    async def dispatch_many(
+        self,
+        events: List[MirrorNodeEvent],
+        *,
+        adapters: Optional[Iterable[str]] = None,
+        record: bool = True,
+        publish: bool = True,
+        max_concurrency: int = 64,
+    ) -> List[Dict[str, Dict[str, Any]]]:
+        """
+        Dispatch a batch in one pass.
+
+        History and the event log are written once for the whole batch
+        (a single group commit); subscribers see the events in order;
+        adapter fan-out runs for at most `max_concurrency` events at a
+        time. Returns one dispatch() outcome dict per event, in order.
+        """
+        logger.debug(f"[router] Dispatching batch of {len(events)} events")
+
+        encoded = [event.json_bytes() for event in events]
+
+        if record:
+            self.history.extend(events)
+            if self.event_log is not None:
+                self.event_log.append_many(
+                    [(data, event.timestamp) for data, event in zip(encoded, events)]
+                )
+
+        if publish:
+            for event in events:
+                self._publish(event)
+            if self.subscribers:
+                for event in events:
+                    await asyncio.gather(
+                        *(handler(event) for handler in self.subscribers.values())
+                    )
+
+        gate = asyncio.Semaphore(max_concurrency)
+
+        async def fan_out(event: MirrorNodeEvent) -> Dict[str, Dict[str, Any]]:
+            async with gate:
+                return await self.dispatch(
+                    event, adapters=adapters, record=False, publish=False
+                )
+
+        return list(await asyncio.gather(*(fan_out(event) for event in events)))
 
-        return responses
+    def _publish(self, event: MirrorNodeEvent) -> None:
+        for sub in list(self.subscriptions):
+            if not sub.offer(event):
+                if sub.overflowed:
+                    logger.warning(
+                        f"[router] Subscription {sub.name or id(sub)} overflowed; disconnecting"
+                    )
+                self.subscriptions.discard(sub)
+
+    async def _run_adapter(
+        self,
+        name: str,
+        adapter: Callable[[MirrorNodeEvent], Any],
+        event: MirrorNodeEvent,
+    ) -> Dict[str, Any]:
+        handler = getattr(adapter, "handle", adapter)
+        timeout = self.adapter_timeouts.get(name, self.adapter_timeout)
+        start = time.perf_counter()
+
+        try:
+            result = await asyncio.wait_for(self._call(handler, event), timeout)
+            status, error = "ok", None
+            if isinstance(result, AdapterResponse) and result.status is not AdapterStatus.OK:
+                status = "error"
+                error = (result.error or {}).get("message") or result.status.value
+        except asyncio.TimeoutError:
+            logger.warning(f"[router] Adapter '{name}' timed out after {timeout}s")
+            result, status, error = None, "timeout", f"timed out after {timeout}s"
+        except Exception as ex:
+            logger.error(f"[router] Adapter '{name}' error: {ex}")
+            result, status, error = None, "error", str(ex)
+
+        return {
+            "status": status,
+            "result": result,
+            "latency_ms": (time.perf_counter() - start) * 1000,
+            "error": error,
+        }
+
+    async def _call(self, handler: Callable[[MirrorNodeEvent], Any], event: MirrorNodeEvent) -> Any:
+        if inspect.iscoroutinefunction(handler):
+            return await handler(event)
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._executor, handler, event)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def close(self) -> None:
+        """Release the adapter thread pool and flush the event log."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.event_log is not None:
+            self.event_log.close()
 
     # --------------------------------------------------------
     # UTILITIES
     # --------------------------------------------------------
 
-    def get_recent(self, limit: int = 50) -> List[MirrorNodeEvent]:
-        """Return last N events from history."""
-        return self.history[-limit:]
+    def get_recent(
+        self,
+        limit: int = 50,
+        node: Optional[str] = None,
+        event_type: Optional[EventType | str] = None,
+    ) -> List[MirrorNodeEvent]:
+        """Return last N events from history, optionally by node/event_type."""
+        return self.history.recent(limit, node=node, event_type=event_type)
+
+    def get_trace(self, trace_id: str) -> List[MirrorNodeEvent]:
+        """Return all retained events for a trace_id."""
+        return self.history.by_trace(trace_id)
 
@@ -0,0 +1,273 @@
+# mirrornode/core/bridge/scheduler.py
+
+from __future__ import annotations
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+
+from mirrornode.core.bridge.router import EventRouter
+from mirrornode.core.events.schema import MirrorNodeEvent
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerSaturated(Exception):
+    """
+    Raised by submit() when an event is refused admission.
+    status_code is 429 for a single noisy source, 503 when the whole
+    scheduler is full; retry_after is a whole number of seconds.
+    """
+
+    def __init__(self, status_code: int, message: str, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class DispatchScheduler:
+    """
+    Admission-controlled, priority-aware front door for EventRouter.dispatch.
+
+    - higher MirrorNodeEvent.priority is always served first
+      (None counts as `default_priority`)
+    - within a priority level, sources (source["node"]) share workers
+      by weight using start-time fair queuing
+    - at most `workers` dispatches run at once
+    - a source with `per_source_limit` queued events gets 429, a
+      scheduler with `max_queue` queued events gets 503, both with a
+      Retry-After derived from recent throughput
+    - submit_many() queues a batch as units of up to `batch_chunk`
+      events, grouped by priority and source; a unit costs its event
+      count in fair-share time and is admitted all-or-nothing
+    """
+
+    def __init__(
+        self,
+        router: EventRouter,
+        workers: int = 4,
+        max_queue: int = 1000,
+        per_source_limit: int = 250,
+        weights: Optional[Dict[str, float]] = None,
+        default_priority: int = 0,
+        batch_chunk: int = 16,
+    ):
+        self.router = router
+        self.workers = workers
+        self.max_queue = max_queue
+        self.per_source_limit = per_source_limit
+        self.weights: Dict[str, float] = dict(weights or {})
+        self.default_priority = default_priority
+        self.batch_chunk = batch_chunk
+
+        # (-priority, virtual_start, seq, source, run, future); run() dispatches the unit
+        self._heap: List[Tuple[int, float, int, str, Callable[[], Awaitable[Any]], asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._last_finish: Dict[str, float] = defaultdict(float)
+        self._queued: Dict[str, int] = defaultdict(int)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+        self._rate = 0.0            # EWMA of completed dispatches per second
+        self._last_done: Optional[float] = None
+        self._active = 0            # units popped and not yet finished
+
+    # --------------------------------------------------------
+    # SUBMISSION
+    # --------------------------------------------------------
+
+    async def submit(self, event: MirrorNodeEvent, **dispatch_kwargs: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Queue an event and wait for its dispatch outcomes.
+        Raises SchedulerSaturated instead of queueing when full.
+        """
+        self._ensure_started()
+        source = self._source(event)
+        self._admit({source: 1})
+        future = self._push(
+            self._priority(event), source, 1,
+            lambda: self.router.dispatch(event, **dispatch_kwargs),
+        )
+        async with self._ready:
+            self._ready.notify()
+        return await future
+
+    async def submit_many(
+        self, events: List[MirrorNodeEvent], **dispatch_kwargs: Any
+    ) -> List[Dict[str, Dict[str, Any]]]:
+        """
+        Queue a batch and wait for every event's dispatch outcomes, in
+        input order. Each unit runs EventRouter.dispatch_many (one
+        history/log write per unit). Raises SchedulerSaturated, queueing
+        nothing, when the whole batch does not fit.
+        """
+        self._ensure_started()
+        groups: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+        for i, event in enumerate(events):
+            groups[(self._priority(event), self._source(event))].append(i)
+        units = [
+            (priority, source, indices[n:n + self.batch_chunk])
+            for (priority, source), indices in groups.items()
+            for n in range(0, len(indices), self.batch_chunk)
+        ]
+        demand: Dict[str, int] = defaultdict(int)
+        for _, source, _ in units:
+            demand[source] += 1
+        self._admit(demand)
+
+        def run(chunk: List[MirrorNodeEvent]) -> Callable[[], Awaitable[Any]]:
+            return lambda: self.router.dispatch_many(
+                chunk, max_concurrency=len(chunk), **dispatch_kwargs
+            )
+
+        futures = [
+            (indices, self._push(priority, source, len(indices), run([events[i] for i in indices])))
+            for priority, source, indices in units
+        ]
+        async with self._ready:
+            self._ready.notify(len(futures))
+
+        try:
+            results = await asyncio.gather(*(future for _, future in futures))
+        except BaseException:
+            for _, future in futures:
+                future.cancel()  # workers skip units nobody waits for
+            raise
+
+        outcomes: List[Dict[str, Dict[str, Any]]] = [{} for _ in events]
+        for (indices, _), unit in zip(futures, results):
+            for i, result in zip(indices, unit):
+                outcomes[i] = result
+        return outcomes
+
+    def depth(self) -> Dict[str, int]:
+        """Queued units (events, or batch chunks) per source."""
+        return {k: v for k, v in self._queued.items() if v}
+
+    def _source(self, event: MirrorNodeEvent) -> str:
+        return str(event.source.get("node") or event.node)
+
+    def _priority(self, event: MirrorNodeEvent) -> int:
+        return event.priority if event.priority is not None else self.default_priority
+
+    def _admit(self, demand: Dict[str, int]) -> None:
+        """Refuse unless `demand` ({source: units}) fits as a whole."""
+        total = sum(demand.values())
+        if len(self._heap) + total > self.max_queue:
+            raise SchedulerSaturated(
+                503, "Dispatch queue is full", self._retry_after(len(self._heap) + total)
+            )
+        for source, units in demand.items():
+            if self._queued[source] + units > self.per_source_limit:
+                raise SchedulerSaturated(
+                    429,
+                    f"Too many queued events from source '{source}'",
+                    self._retry_after(self._queued[source] + units),
+                )
+
+    def _push(
+        self, priority: int, source: str, cost: int, run: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Future:
+        weight = self.weights.get(source, 1.0)
+        start = max(self._vtime, self._last_finish[source])
+        self._last_finish[source] = start + cost / weight
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (-priority, start, next(self._seq), source, run, future))
+        self._queued[source] += 1
+        return future
+
+    # --------------------------------------------------------
+    # WORKERS
+    # --------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._loop is loop:
+            return
+        # first use, or the previous loop is gone (e.g. test clients)
+        self._loop = loop
+        self._heap.clear()
+        self._queued.clear()
+        self._active = 0
+        self._ready = asyncio.Condition()
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"dispatch-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"[scheduler] Started {self.workers} dispatch workers")
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            async with self._ready:
+                await self._ready.wait_for(lambda: bool(self._heap))
+                _, start, _, source, run, future = heapq.heappop(self._heap)
+                self._active += 1
+            self._queued[source] -= 1
+            self._vtime = max(self._vtime, start)
+
+            try:
+                if future.cancelled():
+                    continue
+                try:
+                    outcomes = await run()
+                except Exception as exc:
+                    logger.error(f"[scheduler] worker {n} dispatch error: {exc}")
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(outcomes)
+                self._record_completion()
+            finally:
+                self._active -= 1
+                async with self._ready:
+                    self._ready.notify_all()  # stop() may be waiting to drain
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Let queued and running dispatches finish for up to `timeout`
+        seconds, then cancel the workers and whatever is left.
+        """
+        if self._tasks and self._loop is asyncio.get_running_loop():
+            try:
+                async with self._ready:
+                    await asyncio.wait_for(
+                        self._ready.wait_for(lambda: not self._heap and not self._active),
+                        timeout,
+                    )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"[scheduler] Stopping with {len(self._heap)} queued and "
+                    f"{self._active} running dispatches"
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for *_, future in self._heap:
+            if not future.done():
+                future.cancel()
+        self._heap.clear()
+        self._queued.clear()
+
+    # --------------------------------------------------------
+    # ADMISSION HELPERS
+    # --------------------------------------------------------
+
+    def _record_completion(self) -> None:
+        now = time.monotonic()
+        if self._last_done is not None:
+            gap = max(now - self._last_done, 1e-6)
+            self._rate = 0.8 * self._rate + 0.2 * (1.0 / gap)
+        self._last_done = now
+
+    def _retry_after(self, backlog: int) -> int:
+        if self._rate <= 0:
+            return 1
+        return max(1, math.ceil(backlog / self._rate))
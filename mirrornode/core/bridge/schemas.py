@@ -6,10 +6,12 @@ Authority: THOTH Security Commander
 Date: 2025-01-09
 """
 from pydantic import BaseModel, Field, validator
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 from uuid import UUID, uuid4
 import json
 
+from mirrornode.core.events.schema import EventType, MirrorNodeEvent
+
 class AuditRequest(BaseModel):
     """
     Osiris audit job submission.
@@ -60,3 +62,66 @@ class AuditResponse(BaseModel):
     status: str  # "queued" | "processing" | "completed" | "failed"
     timestamp: str
     message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+class StreamFilter(BaseModel):
+    """
+    Server-side event filter for /stream subscribers.
+    
+    Sent by the client in its auth message. All given criteria must match;
+    omitted criteria match everything. Events without a priority count as 0.
+    """
+    node: Optional[List[str]] = Field(None, max_length=100)
+    event_type: Optional[List[EventType]] = None
+    min_priority: Optional[int] = None
+    payload_equals: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Top-level payload keys that must equal the given values"
+    )
+    payload_exists: List[str] = Field(
+        default_factory=list,
+        max_length=100,
+        description="Top-level payload keys that must be present"
+    )
+    
+    def compile(self) -> Optional[Callable[[MirrorNodeEvent], bool]]:
+        """
+        Build a predicate for the router to evaluate once per event.
+        Returns None when the filter matches everything.
+        """
+        nodes = frozenset(self.node) if self.node else None
+        types = frozenset(self.event_type) if self.event_type else None
+        floor = self.min_priority
+        equals = tuple(self.payload_equals.items())
+        exists = tuple(self.payload_exists)
+        
+        if nodes is None and types is None and floor is None and not equals and not exists:
+            return None
+        
+        def predicate(event: MirrorNodeEvent) -> bool:
+            if nodes is not None and event.node not in nodes:
+                return False
+            if types is not None and event.event_type not in types:
+                return False
+            if floor is not None and (event.priority or 0) < floor:
+                return False
+            payload = event.payload
+            for key in exists:
+                if key not in payload:
+                    return False
+            for key, value in equals:
+                if key not in payload or payload[key] != value:
+                    return False
+            return True
+        
+        return predicate
+
+class StreamBatchConfig(BaseModel):
+    """
+    Micro-batching settings for /stream frames.
+    
+    Events are coalesced until max_size is reached or flush_ms elapses
+    after the first event of a batch, whichever comes first.
+    """
+    max_size: int = Field(100, ge=1, le=1000)
+    flush_ms: int = Field(50, ge=0, le=5000)
@@ -6,15 +6,26 @@ Authority: THOTH Security Commander
 Date: 2025-01-09
 Status: LOCKDOWN PASS ACTIVE
 """
+import hashlib
+import hmac
+import json
+import logging
 import os
-from typing import Optional
-from fastapi import HTTPException, Security
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional
+from fastapi import HTTPException, Request, Security
 from fastapi.security import APIKeyHeader
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # API Key configuration
 API_KEY_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
@@ -36,11 +47,181 @@ def get_api_key() -> str:
         )
     return key
 
-def require_api_key(api_key: Optional[str] = Security(api_key_header)) -> str:
+@dataclass(frozen=True)
+class ApiKeyRecord:
+    """
+    A registered API key, identified by the SHA-256 digest of the key.
+    
+    scopes: route groups the key may call ("oracle", "events", "audit",
+            "stream"); "*" grants all
+    quotas: per-route rate limit overrides, e.g. {"oracle": "100/minute"}
+    """
+    name: str
+    digest: str
+    scopes: FrozenSet[str] = frozenset({"*"})
+    quotas: Dict[str, str] = field(default_factory=dict)
+    
+    @property
+    def key_id(self) -> str:
+        """Short identifier used for rate limit buckets and logs."""
+        return self.digest[:16]
+    
+    def allows(self, scope: str) -> bool:
+        return "*" in self.scopes or scope in self.scopes
+
+def _digest(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+class KeyRegistry:
+    """
+    Hashed API key registry, loaded once and reloaded on SIGHUP or when
+    the keys file changes.
+    
+    Sources:
+        - MIRRORNODE_API_KEY: single key with all scopes
+        - MIRRORNODE_API_KEYS_FILE: JSON list of
+          {"name": ..., "sha256": <hex digest> | "key": <plaintext>,
+           "scopes": [...], "quotas": {...}}
+    
+    Verification hashes the presented key and compares the digest with
+    every stored digest using hmac.compare_digest, so neither a lookup
+    on the secret nor an early exit leaks which key was close. Plaintext
+    keys are never kept.
+    """
+    
+    def __init__(
+        self,
+        keys_file: Optional[str] = None,
+        check_interval: float = 5.0,
+    ):
+        self.keys_file = Path(keys_file) if keys_file else None
+        self.check_interval = check_interval
+        self._records: Dict[str, ApiKeyRecord] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._listeners: List[Callable[["KeyRegistry"], None]] = []
+    
+    def load(self) -> None:
+        """(Re)load all key sources."""
+        records: Dict[str, ApiKeyRecord] = {}
+        
+        env_key = os.getenv("MIRRORNODE_API_KEY")
+        if env_key:
+            rec = ApiKeyRecord(name="env", digest=_digest(env_key))
+            records[rec.digest] = rec
+        
+        mtime = None
+        if self.keys_file and self.keys_file.exists():
+            mtime = self.keys_file.stat().st_mtime
+            for entry in json.loads(self.keys_file.read_text(encoding="utf-8")):
+                digest = entry.get("sha256") or _digest(entry["key"])
+                records[digest] = ApiKeyRecord(
+                    name=entry.get("name", digest[:8]),
+                    digest=digest,
+                    scopes=frozenset(entry.get("scopes", ["*"])),
+                    quotas=dict(entry.get("quotas", {})),
+                )
+        
+        with self._lock:
+            self._records = records
+            self._mtime = mtime
+            self._loaded = True
+        logger.info(f"[security] Loaded {len(records)} API keys")
+        for listener in self._listeners:
+            listener(self)
+    
+    def on_reload(self, listener: Callable[["KeyRegistry"], None]) -> None:
+        """Call `listener(registry)` after every load."""
+        self._listeners.append(listener)
+    
+    def install_sighup(self) -> None:
+        """
+        Reload on SIGHUP (main thread, POSIX only).
+        
+        The handler only writes a byte to a pipe; a reload thread does the
+        load(). Running load() in the handler could deadlock on _lock,
+        which the interrupted thread may hold.
+        """
+        if not hasattr(signal, "SIGHUP"):
+            return
+        read_fd, write_fd = os.pipe()
+        try:
+            signal.signal(signal.SIGHUP, lambda *_: os.write(write_fd, b"\0"))
+        except ValueError:
+            os.close(read_fd)
+            os.close(write_fd)
+            logger.warning("[security] SIGHUP reload unavailable outside main thread")
+            return
+        
+        def reloader() -> None:
+            while os.read(read_fd, 64):
+                try:
+                    self.load()
+                except Exception:
+                    logger.exception("[security] SIGHUP reload failed")
+        
+        threading.Thread(target=reloader, name="key-reload", daemon=True).start()
+    
+    def quotas(self) -> Dict[str, Dict[str, str]]:
+        """Per-key rate limit overrides, keyed by key_id."""
+        return {r.key_id: r.quotas for r in self._records.values() if r.quotas}
+    
+    def verify(self, api_key: str) -> Optional[ApiKeyRecord]:
+        """
+        Return the record for a valid key, None otherwise.
+        
+        Raises:
+            RuntimeError: If no keys are configured at all
+        """
+        self._maybe_reload()
+        records = self._records  # replaced, never mutated, by load()
+        if not records:
+            raise RuntimeError(
+                "No API keys configured. Set MIRRORNODE_API_KEY "
+                "(generate with: openssl rand -hex 32) or MIRRORNODE_API_KEYS_FILE"
+            )
+        
+        digest = _digest(api_key).encode()
+        found = None
+        for record in records.values():
+            if hmac.compare_digest(record.digest.encode(), digest):
+                found = record
+        return found
+    
+    def _maybe_reload(self) -> None:
+        if not self._loaded:
+            self.load()
+            return
+        if self.keys_file is None:
+            return
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        try:
+            mtime = self.keys_file.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._mtime:
+            self.load()
+
+# Process-wide registry; main.py installs the SIGHUP handler
+key_registry = KeyRegistry(keys_file=os.getenv("MIRRORNODE_API_KEYS_FILE"))
+
+def require_api_key(
+    request: Request,
+    api_key: Optional[str] = Security(api_key_header),
+) -> str:
     """
     Dependency that validates API key from X-API-Key header.
     
+    The matching ApiKeyRecord is stored on request.state.api_key for
+    scope checks and per-key rate limits.
+    
     Args:
+        request: Current request (injected by FastAPI)
         api_key: API key from request header (injected by FastAPI)
     
     Raises:
@@ -49,8 +230,6 @@ def require_api_key(api_key: Optional[str] = Security(api_key_header)) -> str:
     Returns:
         str: Validated API key
     """
-    expected_key = get_api_key()
-    
     if not api_key:
         raise HTTPException(
             status_code=401,
@@ -58,15 +237,38 @@ def require_api_key(api_key: Optional[str] = Security(api_key_header)) -> str:
             headers={"WWW-Authenticate": "ApiKey"}
         )
     
-    if api_key != expected_key:
+    record = key_registry.verify(api_key)
+    if record is None:
         raise HTTPException(
             status_code=401,
             detail="Invalid API key",
             headers={"WWW-Authenticate": "ApiKey"}
         )
     
+    request.state.api_key = record
     return api_key
 
+def require_scope(scope: str) -> Callable[..., ApiKeyRecord]:
+    """
+    Dependency factory: validated key that must also carry `scope`.
+    
+    Raises:
+        HTTPException: 401 as require_api_key, 403 if scope missing
+    """
+    def dependency(
+        request: Request,
+        api_key: str = Security(require_api_key),
+    ) -> ApiKeyRecord:
+        record: ApiKeyRecord = request.state.api_key
+        if not record.allows(scope):
+            raise HTTPException(
+                status_code=403,
+                detail=f"API key not authorized for '{scope}'",
+            )
+        return record
+    
+    return dependency
+
 def require_admin_key(api_key: str = Security(require_api_key)) -> str:
     """
     Dependency for admin-only endpoints (future use).
@@ -0,0 +1,165 @@
+# mirrornode/core/bridge/subscription.py
+
+from __future__ import annotations
+from typing import Callable, List, Optional
+import asyncio
+import enum
+
+from mirrornode.core.events.schema import MirrorNodeEvent
+
+
+class OverflowPolicy(str, enum.Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
+class SubscriberOverflow(Exception):
+    """Raised to a DISCONNECT-policy subscriber whose queue overflowed."""
+
+
+_CLOSED = object()
+
+
+class Subscription:
+    """
+    Per-client bounded event queue fed by EventRouter.
+
+    - `offer()` never blocks the router; a full queue applies the policy
+    - an optional `predicate` is checked before enqueueing, so filtered
+      events never reach the queue or the serializer
+    - `lagged` counts events this subscriber lost to overflow
+    - iterate with `async for event in sub` or pull with `get()`
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        name: Optional[str] = None,
+        predicate: Optional[Callable[[MirrorNodeEvent], bool]] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.name = name
+        self.predicate = predicate
+        self.policy = OverflowPolicy(policy)
+        self.lagged = 0
+        self.closed = False
+        self.overflowed = False
+        # one spare slot so the close sentinel always fits
+        self._maxsize = maxsize
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize + 1)
+
+    # --------------------------------------------------------
+    # PRODUCER SIDE (router)
+    # --------------------------------------------------------
+
+    def offer(self, event: MirrorNodeEvent) -> bool:
+        """
+        Enqueue without blocking.
+        Returns False once the subscription is closed and should be dropped.
+        """
+        if self.closed:
+            return False
+        if self.predicate is not None and not self.predicate(event):
+            return True
+
+        if self._queue.qsize() < self._maxsize:
+            self._queue.put_nowait(event)
+            return True
+
+        self.lagged += 1
+        if self.policy is OverflowPolicy.DROP_OLDEST:
+            self._queue.get_nowait()
+            self._queue.put_nowait(event)
+        elif self.policy is OverflowPolicy.DISCONNECT:
+            self.overflowed = True
+            self.close()
+            return False
+        # DROP_NEWEST: discard the incoming event
+        return True
+
+    def close(self) -> None:
+        """Stop the subscription and wake any pending consumer."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.overflowed:
+            # nothing queued is worth delivering to a disconnected client
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        self._queue.put_nowait(_CLOSED)
+
+    # --------------------------------------------------------
+    # CONSUMER SIDE (client)
+    # --------------------------------------------------------
+
+    async def get(self) -> MirrorNodeEvent:
+        """
+        Wait for the next event.
+        Raises SubscriberOverflow after a DISCONNECT overflow and
+        StopAsyncIteration once closed normally.
+        """
+        item = await self._queue.get()
+        return self._unwrap(item)
+
+    def get_nowait(self) -> Optional[MirrorNodeEvent]:
+        """Return the next queued event, or None if the queue is empty."""
+        if self._queue.empty():
+            return None
+        return self._unwrap(self._queue.get_nowait())
+
+    async def get_batch(
+        self,
+        max_size: int = 100,
+        flush_interval: float = 0.05,
+    ) -> List[MirrorNodeEvent]:
+        """
+        Wait for at least one event, then keep collecting until
+        `max_size` events are gathered or `flush_interval` seconds have
+        passed since the first one arrived.
+        """
+        batch = [await self.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + flush_interval
+
+        try:
+            while len(batch) < max_size:
+                event = self.get_nowait()
+                if event is not None:
+                    batch.append(event)
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except StopAsyncIteration:
+            # closed mid-batch: deliver what we have, the next call stops
+            pass
+
+        return batch
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> MirrorNodeEvent:
+        return await self.get()
+
+    def _unwrap(self, item: object) -> MirrorNodeEvent:
+        if item is _CLOSED:
+            # keep the sentinel so later reads see the same outcome
+            self._queue.put_nowait(_CLOSED)
+            if self.overflowed:
+                raise SubscriberOverflow(
+                    f"subscriber {self.name or id(self)} fell behind by more than "
+                    f"{self._maxsize} events"
+                )
+            raise StopAsyncIteration
+        return item  # type: ignore[return-value]
@@ -1,6 +1,8 @@
+import time
 from enum import Enum
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
 
 
 class AdapterStatus(Enum):
@@ -13,8 +15,21 @@ class AdapterStatus(Enum):
 class AdapterResponse:
     """
     Canonical Adapter Response Envelope — LOCKED
+
+    Slotted; the creation time is kept as epoch nanoseconds and only
+    formatted to ISO 8601 when metadata / to_dict() is first read.
+
+    - `latency_ms` is measured by the adapters on the monotonic clock
+      (time.perf_counter), so it cannot jump with NTP adjustments
+    - `created_ns` is wall-clock time.time_ns(): a monotonic reading has
+      no fixed epoch and could not be rendered as the ISO `timestamp`
+      that consumers compare across processes
+    - `metadata` is built once, on first read, and the same read-only
+      mapping is returned afterwards; setting `latency_ms` drops it
     """
 
+    __slots__ = ("status", "node_id", "payload", "error", "_latency_ms", "created_ns", "_metadata")
+
     def __init__(
         self,
         status: AdapterStatus,
@@ -23,17 +38,42 @@ class AdapterResponse:
         error: Optional[Dict[str, Any]] = None,
         latency_ms: Optional[float] = None,
     ):
-        if status == AdapterStatus.OK and error is not None:
+        if status is AdapterStatus.OK and error is not None:
             raise ValueError("error must be null when status is 'ok'")
 
         self.status = status
         self.node_id = node_id
         self.payload = payload
         self.error = error
-        self.metadata = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "latency_ms": latency_ms,
-        }
+        self._latency_ms = latency_ms
+        self.created_ns = time.time_ns()
+        self._metadata: Optional[Mapping[str, Any]] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is AdapterStatus.OK
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.created_ns / 1e9, timezone.utc).isoformat()
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        return self._latency_ms
+
+    @latency_ms.setter
+    def latency_ms(self, value: Optional[float]) -> None:
+        self._latency_ms = value
+        self._metadata = None
+
+    @property
+    def metadata(self) -> Mapping[str, Any]:
+        if self._metadata is None:
+            self._metadata = MappingProxyType({
+                "timestamp": self.timestamp,
+                "latency_ms": self._latency_ms,
+            })
+        return self._metadata
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -41,6 +81,8 @@ class AdapterResponse:
             "node_id": self.node_id,
             "payload": self.payload,
             "error": self.error,
-            "metadata": self.metadata,
+            "metadata": dict(self.metadata),
         }
 
+    def __repr__(self) -> str:
+        return f"AdapterResponse({self.node_id!r}, {self.status.value!r}, latency_ms={self.latency_ms})"
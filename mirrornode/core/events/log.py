@@ -0,0 +1,450 @@
+# mirrornode/core/events/log.py
+
+from __future__ import annotations
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+import calendar
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# index record: byte offset in segment, record length, timestamp (µs since epoch)
+INDEX_RECORD = struct.Struct("<QIq")
+
+SEGMENT_SUFFIX = ".ndjson"
+INDEX_SUFFIX = ".idx"
+
+# records are filed under the UTC day they were written, not the day of
+# their timestamp; range scans also read this far either side
+RANGE_SLACK_US = 86_400 * 1_000_000
+
+
+class LogPosition(NamedTuple):
+    """Address of one record: UTC day, segment number, index within segment."""
+    day: str
+    segment: int
+    index: int
+
+
+class EventLog:
+    """
+    Durable, segment-rotated, append-only NDJSON log.
+
+    Layout:
+        <root>/<YYYY-MM-DD>/<NNNNNN>.ndjson   one JSON record per line
+        <root>/<YYYY-MM-DD>/<NNNNNN>.idx      fixed-width INDEX_RECORD per line
+
+    - `append()` only enqueues; a writer thread group-commits pending
+      records, fsyncing the segment before its index entries
+    - segments rotate at `max_segment_bytes` and at each UTC day boundary
+      of write time; a record is filed under the day it was written
+    - readers go through the index and mmap, so a tail or a day page
+      touches only the records it returns
+    - on open, a torn tail left by a crash is truncated back to the last
+      indexed record
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        flush_interval: float = 0.05,
+        max_batch: int = 1024,
+        fsync: bool = True,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.fsync = fsync
+
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[bytes, int]] = []
+        self._appended = 0   # records accepted by append()
+        self._durable = 0    # records the writer is done with, written or not
+        # (first seq, last seq, error) of recently failed batches
+        self._failures: deque = deque(maxlen=64)
+        self._closed = False
+
+        # current segment (writer thread only)
+        self._day: Optional[str] = None
+        self._seg_no = 0
+        self._seg: Optional[BinaryIO] = None
+        self._idx: Optional[BinaryIO] = None
+        self._seg_size = 0
+
+        self._writer = threading.Thread(
+            target=self._run, name="event-log-writer", daemon=True
+        )
+        self._writer.start()
+
+    # --------------------------------------------------------
+    # WRITE
+    # --------------------------------------------------------
+
+    def append(self, data: bytes, timestamp: Optional[datetime] = None) -> int:
+        """
+        Enqueue one JSON record (must not contain a newline).
+        Returns the record's append sequence number; see flush().
+        """
+        ts_us = _to_us(timestamp) if timestamp is not None else time.time_ns() // 1000
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("EventLog is closed")
+            self._pending.append((data, ts_us))
+            self._appended += 1
+            seq = self._appended
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+        return seq
+
+    def append_many(self, records: List[Tuple[bytes, Optional[datetime]]]) -> int:
+        """Enqueue several records under one lock; returns the last sequence number."""
+        now_us = time.time_ns() // 1000
+        batch = [
+            (data, _to_us(ts) if ts is not None else now_us)
+            for data, ts in records
+        ]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("EventLog is closed")
+            self._pending.extend(batch)
+            self._appended += len(batch)
+            self._cond.notify_all()
+            return self._appended
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until everything appended so far is durable.
+        Returns False on timeout.
+        
+        Raises:
+            OSError: If the writer failed to write a record that was
+                pending when flush() was called
+        """
+        with self._cond:
+            start, target = self._durable, self._appended
+            self._cond.notify_all()
+            if not self._cond.wait_for(lambda: self._durable >= target, timeout):
+                return False
+            for first, last, exc in self._failures:
+                if first <= target and last > start:
+                    raise OSError(f"event log failed to write records {first}-{last}") from exc
+            return True
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._close_segment()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                # group-commit window: let concurrent appends pile up
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                closing = self._closed
+
+            if batch:
+                error = None
+                try:
+                    self._write(batch)
+                except Exception as exc:
+                    logger.exception("[eventlog] failed to write %d records", len(batch))
+                    self._close_segment()  # reopen and recover on the next batch
+                    self._day = None
+                    error = exc
+                with self._cond:
+                    if error is not None:
+                        self._failures.append(
+                            (self._durable + 1, self._durable + len(batch), error)
+                        )
+                    self._durable += len(batch)
+                    self._cond.notify_all()
+            elif closing:
+                return
+
+    def _write(self, batch: List[Tuple[bytes, int]]) -> None:
+        data_buf: List[bytes] = []
+        idx_buf: List[bytes] = []
+
+        day = _day_of(time.time())
+        for data, ts_us in batch:
+            if (
+                self._seg is None
+                or day != self._day
+                or self._seg_size >= self.max_segment_bytes
+            ):
+                self._commit(data_buf, idx_buf)
+                self._rotate(day)
+
+            line = data + b"\n"
+            data_buf.append(line)
+            idx_buf.append(INDEX_RECORD.pack(self._seg_size, len(data), ts_us))
+            self._seg_size += len(line)
+
+        self._commit(data_buf, idx_buf)
+
+    def _commit(self, data_buf: List[bytes], idx_buf: List[bytes]) -> None:
+        if not data_buf:
+            return
+        self._seg.write(b"".join(data_buf))
+        self._seg.flush()
+        if self.fsync:
+            os.fsync(self._seg.fileno())
+        # index last: an indexed record is always fully on disk
+        self._idx.write(b"".join(idx_buf))
+        self._idx.flush()
+        if self.fsync:
+            os.fsync(self._idx.fileno())
+        data_buf.clear()
+        idx_buf.clear()
+
+    def _rotate(self, day: str) -> None:
+        self._close_segment()
+        day_dir = self.root / day
+        day_dir.mkdir(parents=True, exist_ok=True)
+
+        existing = _segment_numbers(day_dir)
+        seg_no = existing[-1] if existing else 1
+        if self._day == day:
+            seg_no = self._seg_no + 1
+
+        seg_path = day_dir / f"{seg_no:06d}{SEGMENT_SUFFIX}"
+        idx_path = day_dir / f"{seg_no:06d}{INDEX_SUFFIX}"
+        size = _recover(seg_path, idx_path)
+        if size >= self.max_segment_bytes:
+            seg_no += 1
+            seg_path = day_dir / f"{seg_no:06d}{SEGMENT_SUFFIX}"
+            idx_path = day_dir / f"{seg_no:06d}{INDEX_SUFFIX}"
+            size = 0
+
+        self._seg = open(seg_path, "ab")
+        self._idx = open(idx_path, "ab")
+        self._seg_size = size
+        self._day = day
+        self._seg_no = seg_no
+        logger.debug(f"[eventlog] writing {seg_path} at offset {size}")
+
+    def _close_segment(self) -> None:
+        for f in (self._seg, self._idx):
+            if f is not None:
+                f.close()
+        self._seg = self._idx = None
+
+    # --------------------------------------------------------
+    # READ
+    # --------------------------------------------------------
+
+    def days(self) -> List[str]:
+        """UTC days that have log segments, oldest first."""
+        return sorted(
+            p.name for p in self.root.iterdir()
+            if p.is_dir() and _is_day(p.name)
+        )
+
+    def read_day(
+        self,
+        day: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[bytes]:
+        """Return records for a UTC day (YYYY-MM-DD), oldest first."""
+        out: List[bytes] = []
+        skip = offset
+        for seg_no in _segment_numbers(self.root / day):
+            seg_path, idx_path = self._paths(day, seg_no)
+            count = _index_count(idx_path)
+            if skip >= count:
+                skip -= count
+                continue
+            want = None if limit is None else limit - len(out)
+            end = count if want is None else min(count, skip + want)
+            out.extend(_read_records(seg_path, idx_path, skip, end))
+            skip = 0
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    def tail(self, limit: int = 100) -> List[bytes]:
+        """Return the last `limit` durable records across all days, oldest first."""
+        chunks: List[List[bytes]] = []
+        remaining = limit
+        for day in reversed(self.days()):
+            for seg_no in reversed(_segment_numbers(self.root / day)):
+                seg_path, idx_path = self._paths(day, seg_no)
+                count = _index_count(idx_path)
+                start = max(0, count - remaining)
+                chunks.append(_read_records(seg_path, idx_path, start, count))
+                remaining -= count - start
+                if remaining <= 0:
+                    break
+            if remaining <= 0:
+                break
+        return [rec for chunk in reversed(chunks) for rec in chunk]
+
+    def iter_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield (timestamp_us, record) for records with start <= ts < end,
+        in log order. Days more than RANGE_SLACK_US outside the range are
+        skipped without reading, so a record written over a day away from
+        its own timestamp is only found by an unbounded scan.
+        """
+        for _, ts_us, record in self.scan(start, end):
+            yield ts_us, record
+
+    def scan(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[LogPosition] = None,
+    ) -> Iterator[Tuple[LogPosition, int, bytes]]:
+        """
+        Like iter_range, but also yields each record's LogPosition and can
+        resume strictly after a previously returned position.
+        """
+        start_us = _to_us(start) if start is not None else None
+        end_us = _to_us(end) if end is not None else None
+        first_day = _day_of((start_us - RANGE_SLACK_US) / 1e6) if start_us is not None else None
+        last_day = _day_of((end_us + RANGE_SLACK_US) / 1e6) if end_us is not None else None
+        if after is not None:
+            after = LogPosition(*after)
+            if first_day is None or after.day > first_day:
+                first_day = after.day
+
+        for day in self.days():
+            if first_day is not None and day < first_day:
+                continue
+            if last_day is not None and day > last_day:
+                break
+            for seg_no in _segment_numbers(self.root / day):
+                first = 0
+                if after is not None and day == after.day:
+                    if seg_no < after.segment:
+                        continue
+                    if seg_no == after.segment:
+                        first = after.index + 1
+                seg_path, idx_path = self._paths(day, seg_no)
+                for i, (ts_us, record) in enumerate(
+                    _iter_records(seg_path, idx_path, first), start=first
+                ):
+                    if start_us is not None and ts_us < start_us:
+                        continue
+                    if end_us is not None and ts_us >= end_us:
+                        continue
+                    yield LogPosition(day, seg_no, i), ts_us, record
+
+    def _paths(self, day: str, seg_no: int) -> Tuple[Path, Path]:
+        base = self.root / day / f"{seg_no:06d}"
+        return base.with_suffix(SEGMENT_SUFFIX), base.with_suffix(INDEX_SUFFIX)
+
+
+# ------------------------------------------------------------
+# HELPERS
+# ------------------------------------------------------------
+
+def _to_us(ts: datetime) -> int:
+    """Microseconds since epoch; naive datetimes are taken as UTC."""
+    if ts.tzinfo is None:
+        return calendar.timegm(ts.timetuple()) * 1_000_000 + ts.microsecond
+    return int(ts.timestamp() * 1_000_000)
+
+
+def _day_of(epoch_s: float) -> str:
+    return datetime.fromtimestamp(epoch_s, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _is_day(name: str) -> bool:
+    try:
+        datetime.strptime(name, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def _segment_numbers(day_dir: Path) -> List[int]:
+    if not day_dir.is_dir():
+        return []
+    return sorted(
+        int(p.stem) for p in day_dir.glob(f"*{SEGMENT_SUFFIX}") if p.stem.isdigit()
+    )
+
+
+def _index_count(idx_path: Path) -> int:
+    try:
+        return idx_path.stat().st_size // INDEX_RECORD.size
+    except FileNotFoundError:
+        return 0
+
+
+def _read_index(idx_path: Path, start: int, end: int) -> List[Tuple[int, int, int]]:
+    if end <= start:
+        return []
+    with open(idx_path, "rb") as f:
+        f.seek(start * INDEX_RECORD.size)
+        raw = f.read((end - start) * INDEX_RECORD.size)
+    return list(INDEX_RECORD.iter_unpack(raw[: len(raw) - len(raw) % INDEX_RECORD.size]))
+
+
+def _read_records(seg_path: Path, idx_path: Path, start: int, end: int) -> List[bytes]:
+    entries = _read_index(idx_path, start, end)
+    if not entries:
+        return []
+    with open(seg_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [mm[off:off + length] for off, length, _ in entries]
+
+
+def _iter_records(seg_path: Path, idx_path: Path, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+    entries = _read_index(idx_path, start, _index_count(idx_path))
+    if not entries:
+        return
+    with open(seg_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for off, length, ts_us in entries:
+            yield ts_us, mm[off:off + length]
+
+
+def _recover(seg_path: Path, idx_path: Path) -> int:
+    """
+    Make a segment consistent with its index after an unclean shutdown.
+    Returns the segment size to continue appending at.
+    """
+    if not seg_path.exists():
+        return 0
+
+    count = _index_count(idx_path)
+    if idx_path.exists() and idx_path.stat().st_size != count * INDEX_RECORD.size:
+        with open(idx_path, "r+b") as f:
+            f.truncate(count * INDEX_RECORD.size)
+
+    end = 0
+    if count:
+        off, length, _ = _read_index(idx_path, count - 1, count)[0]
+        end = off + length + 1
+    if seg_path.stat().st_size != end:
+        logger.warning(f"[eventlog] truncating torn tail of {seg_path} to {end} bytes")
+        with open(seg_path, "r+b") as f:
+            f.truncate(end)
+    return end
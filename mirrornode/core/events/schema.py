@@ -2,7 +2,7 @@
 from __future__ import annotations
 import enum
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime
 import uuid
 
@@ -38,12 +38,32 @@ class MirrorNodeEvent(BaseModel):
     timestamp: Optional[datetime] = None
     priority: Optional[int] = None
 
+    # encode-once JSON cache, shared by history, /stream and persistence
+    _json: Optional[bytes] = PrivateAttr(default=None)
+    # key id of the API key that submitted the event (usage metering); not serialized
+    _api_key_id: Optional[str] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            super().__setattr__("_json", None)
+
     def ensure_metadata(self) -> None:
         if not self.trace_id:
             self.trace_id = str(uuid.uuid4())
         if not self.timestamp:
             self.timestamp = datetime.utcnow()
 
+    def json_bytes(self) -> bytes:
+        """
+        Serialized JSON for this event, computed once and cached.
+        Reassigning a field drops the cache; in-place payload mutation
+        after dispatch does not, so treat dispatched events as frozen.
+        """
+        if self._json is None:
+            self._json = self.__pydantic_serializer__.to_json(self)
+        return self._json
+
 
 def create_event(
     event_type: EventType | str,
@@ -0,0 +1,329 @@
+import contextvars
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIN_COMPLETION_TOKENS = 16  # below this a downgraded call is not worth making
+
+# completion cap for the provider call running in this context (None = adapter default)
+_token_cap: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "mirrornode_token_cap", default=None
+)
+
+
+def token_cap(default: int) -> int:
+    """max_tokens for the current provider call, after any budget downgrade."""
+    cap = _token_cap.get()
+    return default if cap is None else min(default, cap)
+
+
+class BudgetExceeded(Exception):
+    """Raised by UsageMeter.admit() when a key has no token budget left."""
+
+
+@dataclass
+class Reservation:
+    """Tokens held against a key's budget for one in-flight provider call."""
+    key: str
+    tokens: int
+    cap: Optional[contextvars.Token] = None
+
+
+@dataclass
+class UsageCounters:
+    requests: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+
+    def add(self, other: "UsageCounters") -> None:
+        self.requests += other.requests
+        self.errors += other.errors
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.latency_ms += other.latency_ms
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["total_tokens"] = self.prompt_tokens + self.completion_tokens
+        data["avg_latency_ms"] = round(self.latency_ms / self.requests, 3) if self.requests else None
+        data["latency_ms"] = round(self.latency_ms, 3)
+        return data
+
+
+class UsageMeter:
+    """
+    Token and latency accounting for provider calls.
+
+    - in-memory counters per adapter, per API key id and per trace
+      (the most recent `max_traces` traces)
+    - deltas roll up into SQLite (`db_path`) every `flush_interval`
+      seconds on a background thread, bucketed by UTC day
+    - `budgets` maps key id (or "*" for every key) to tokens per UTC day;
+      admit() reserves the call's worst case (estimated prompt plus
+      completion cap) so concurrent calls cannot overspend, rejects keys
+      that are out of budget and caps max_tokens for keys that are
+      nearly out; record() settles the reservation against actual usage
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        budgets: Optional[Dict[str, int]] = None,
+        flush_interval: float = 30.0,
+        max_traces: int = 10_000,
+    ):
+        self.db_path = Path(db_path) if db_path else None
+        self.budgets: Dict[str, int] = dict(budgets or {})
+        self.flush_interval = flush_interval
+        self.max_traces = max_traces
+
+        self._lock = threading.Lock()
+        self._adapters: Dict[str, UsageCounters] = defaultdict(UsageCounters)
+        self._keys: Dict[str, UsageCounters] = defaultdict(UsageCounters)
+        self._traces: "OrderedDict[str, UsageCounters]" = OrderedDict()
+        self._spent_today: Dict[str, int] = defaultdict(int)
+        self._reserved: Dict[str, int] = defaultdict(int)
+        self._day = _today()
+        # (dimension, key, day) -> counters not yet in SQLite
+        self._pending: Dict[Tuple[str, str, str], UsageCounters] = defaultdict(UsageCounters)
+
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if self.db_path is not None:
+            self._init_db()
+            self._load_spent_today()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="usage-meter", daemon=True
+            )
+            self._flusher.start()
+
+    # --------------------------------------------------------
+    # BUDGETS
+    # --------------------------------------------------------
+
+    def _budget(self, key_id: Optional[str]) -> Optional[int]:
+        return self.budgets.get(key_id or "", self.budgets.get("*"))
+
+    def remaining(self, key_id: Optional[str]) -> Optional[int]:
+        """
+        Tokens left today for `key_id` after spent and reserved tokens,
+        or None when unbudgeted.
+        """
+        budget = self._budget(key_id)
+        if budget is None:
+            return None
+        key = key_id or "anonymous"
+        with self._lock:
+            self._roll_day()
+            return budget - self._spent_today[key] - self._reserved[key]
+
+    def admit(self, key_id: Optional[str], prompt: str, max_tokens: int) -> Optional[Reservation]:
+        """
+        Reserve budget for a provider call before it is made.
+
+        Holds the estimated prompt tokens plus the completion cap. Raises
+        BudgetExceeded when no useful completion fits; caps max_tokens
+        (via token_cap()) when less than a full completion fits. Returns
+        the Reservation to pass to record() and release(), or None when
+        the key is unbudgeted.
+        """
+        budget = self._budget(key_id)
+        if budget is None:
+            return None
+        key = key_id or "anonymous"
+        prompt_tokens = estimate_tokens(prompt)
+        with self._lock:
+            self._roll_day()
+            available = budget - self._spent_today[key] - self._reserved[key] - prompt_tokens
+            if available < MIN_COMPLETION_TOKENS:
+                raise BudgetExceeded(f"token budget exhausted for key {key_id}")
+            completion = min(max_tokens, available)
+            reservation = Reservation(key, prompt_tokens + completion)
+            self._reserved[key] += reservation.tokens
+        if completion < max_tokens:
+            logger.info(f"[metering] key {key_id} downgraded to max_tokens={completion}")
+            reservation.cap = _token_cap.set(completion)
+        return reservation
+
+    def release(self, reservation: Optional[Reservation]) -> None:
+        """
+        Drop whatever `reservation` still holds (call failed or was
+        cancelled before record()) and restore the caller's token cap.
+        Safe to call after record().
+        """
+        if reservation is None:
+            return
+        with self._lock:
+            self._unreserve(reservation)
+        if reservation.cap is not None:
+            _token_cap.reset(reservation.cap)
+            reservation.cap = None
+
+    def _unreserve(self, reservation: Reservation) -> None:
+        if reservation.tokens:
+            self._reserved[reservation.key] -= reservation.tokens
+            reservation.tokens = 0
+
+    # --------------------------------------------------------
+    # RECORDING
+    # --------------------------------------------------------
+
+    def record(
+        self,
+        adapter: str,
+        key_id: Optional[str],
+        trace_id: Optional[str],
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        latency_ms: float = 0.0,
+        error: bool = False,
+        reservation: Optional[Reservation] = None,
+    ) -> None:
+        """Count one provider call; settles `reservation` in the same step."""
+        usage = UsageCounters(
+            requests=1,
+            errors=int(error),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=latency_ms,
+        )
+        key = key_id or "anonymous"
+        with self._lock:
+            self._roll_day()
+            if reservation is not None:
+                self._unreserve(reservation)
+            self._adapters[adapter].add(usage)
+            self._keys[key].add(usage)
+            self._spent_today[key] += prompt_tokens + completion_tokens
+            if trace_id:
+                counters = self._traces.pop(trace_id, None) or UsageCounters()
+                counters.add(usage)
+                self._traces[trace_id] = counters
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            if self.db_path is not None:
+                self._pending[("adapter", adapter, self._day)].add(usage)
+                self._pending[("api_key", key, self._day)].add(usage)
+
+    def snapshot(self, trace_id: Optional[str] = None) -> Dict[str, object]:
+        """Counters since process start, plus today's budget state."""
+        with self._lock:
+            data: Dict[str, object] = {
+                "adapters": {k: v.to_dict() for k, v in self._adapters.items()},
+                "api_keys": {k: v.to_dict() for k, v in self._keys.items()},
+                "budgets": {
+                    k: {
+                        "daily": b,
+                        "used_today": self._spent_today.get(k, 0),
+                        "reserved": self._reserved.get(k, 0),
+                    }
+                    for k, b in self.budgets.items() if k != "*"
+                },
+            }
+            if trace_id is not None:
+                trace = self._traces.get(trace_id)
+                data["trace"] = trace.to_dict() if trace else None
+        return data
+
+    # --------------------------------------------------------
+    # SQLITE ROLL-UP
+    # --------------------------------------------------------
+
+    def _init_db(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS usage (
+                    dimension TEXT,
+                    key TEXT,
+                    day TEXT,
+                    requests INTEGER,
+                    errors INTEGER,
+                    prompt_tokens INTEGER,
+                    completion_tokens INTEGER,
+                    latency_ms REAL,
+                    PRIMARY KEY (dimension, key, day)
+                )
+            """)
+
+    def _load_spent_today(self) -> None:
+        # budgets survive restarts within the same day
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT key, prompt_tokens + completion_tokens FROM usage "
+                "WHERE dimension = 'api_key' AND day = ?",
+                (self._day,),
+            ).fetchall()
+        for key, tokens in rows:
+            self._spent_today[key] = tokens
+
+    def flush(self) -> None:
+        """Write pending deltas to SQLite."""
+        if self.db_path is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(UsageCounters)
+        if not pending:
+            return
+        try:
+            self._write(pending)
+        except Exception:
+            # keep the deltas for the next flush so persisted spend never drifts low
+            with self._lock:
+                for bucket, counters in pending.items():
+                    self._pending[bucket].add(counters)
+            raise
+
+    def _write(self, pending: Dict[Tuple[str, str, str], UsageCounters]) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("""
+                INSERT INTO usage
+                (dimension, key, day, requests, errors, prompt_tokens, completion_tokens, latency_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (dimension, key, day) DO UPDATE SET
+                    requests = requests + excluded.requests,
+                    errors = errors + excluded.errors,
+                    prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                    completion_tokens = completion_tokens + excluded.completion_tokens,
+                    latency_ms = latency_ms + excluded.latency_ms
+            """, [
+                (dim, key, day, c.requests, c.errors, c.prompt_tokens, c.completion_tokens, c.latency_ms)
+                for (dim, key, day), c in pending.items()
+            ])
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("[metering] flush failed")
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5)
+        self.flush()
+
+    def _roll_day(self) -> None:
+        today = _today()
+        if today != self._day:
+            self._day = today
+            self._spent_today.clear()  # reservations carry over until settled
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token for English; for budgeting, not billing."""
+    return len(text) // 4 + 1
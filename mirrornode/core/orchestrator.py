@@ -1,7 +1,7 @@
-import ray
+import asyncio
 import logging
 import os
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Union
 
 from mirrornode.core.events.schema import (
     MirrorNodeEvent,
@@ -16,59 +16,81 @@ from mirrornode.core.adapters import (
 )
 from mirrornode.core.contracts.adapter_response import AdapterResponse
 from mirrornode.core.aggregation.aggregate import aggregate_responses
+from mirrornode.core.backends import ExecutionBackend, create_backend
+from mirrornode.core.quorum import LatencyTracker, QuorumPolicy, gather_quorum
 
 logger = logging.getLogger(__name__)
 
 
-@ray.remote
-class DistributedAdapter:
-    def __init__(self, adapter_class, api_keys: Dict[str, str]):
-        for key, value in api_keys.items():
-            if value:
-                os.environ[key] = value
+ADAPTERS = {
+    "gpt": GptAdapter,
+    "claude": ClaudeAdapter,
+    "grok": GrokAdapter,
+    "theia": TheiaAdapter,
+}
 
-        self.adapter = adapter_class()
-        self.name = self.adapter.node_id
 
-    async def handle(self, event: MirrorNodeEvent) -> AdapterResponse:
-        return await self.adapter.handle(event)
+class MirrorNodeOrchestrator:
+    """
+    Fans events out to the adapter lattice.
 
+    `backend` decides where adapters run: "ray" (actors), "asyncio"
+    (in-process) or "process" (worker pool), or an ExecutionBackend.
+    Defaults to MIRRORNODE_ORCHESTRATOR_BACKEND, else "ray".
+    """
 
-class MirrorNodeOrchestrator:
-    def __init__(self):
-        self.adapters: Dict[str, ray.ObjectRef] = {}
+    def __init__(
+        self,
+        backend: Union[ExecutionBackend, str, None] = None,
+        consensus_policy: Optional[QuorumPolicy] = None,
+    ):
+        self.backend = (
+            backend if isinstance(backend, ExecutionBackend) else create_backend(backend)
+        )
         self.initialized = False
+        self.consensus_policy = consensus_policy or QuorumPolicy()
+        self.latencies = LatencyTracker()
 
-    def initialize(self):
-        if not ray.is_initialized():
-            ray.init(ignore_reinit_error=True)
+    @property
+    def adapters(self) -> List[str]:
+        return self.backend.names()
 
-        logger.info("Deploying MirrorNode lattice")
+    def initialize(self):
+        logger.info("Deploying MirrorNode lattice (%s backend)", self.backend.name)
 
         api_keys = {
             "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY", ""),
             "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", ""),
         }
 
-        self.adapters = {
-            "gpt": DistributedAdapter.remote(GptAdapter, api_keys),
-            "claude": DistributedAdapter.remote(ClaudeAdapter, api_keys),
-            "grok": DistributedAdapter.remote(GrokAdapter, api_keys),
-            "theia": DistributedAdapter.remote(TheiaAdapter, api_keys),
-        }
+        self.backend.start(ADAPTERS, api_keys)
 
         self.initialized = True
         logger.info(
-            "Deployed %d distributed adapters",
+            "Deployed %d adapters",
             len(self.adapters),
         )
         return self
 
+    def _calls(self, event: MirrorNodeEvent):
+        return {
+            name: (lambda name=name: self.backend.call(name, event))
+            for name in self.adapters
+        }
+
     async def route_event(
         self,
         event: MirrorNodeEvent,
         target: Optional[str] = None,
+        timeout: Optional[float] = None,
     ):
+        """
+        Send `event` to one adapter or to all of them.
+
+        Fan-out results are collected as each actor finishes, without
+        blocking the event loop; adapters still running after `timeout`
+        seconds are cancelled and left out of the aggregate.
+        """
         if not self.initialized:
             raise RuntimeError(
                 "Orchestrator not initialized"
@@ -77,54 +99,91 @@ class MirrorNodeOrchestrator:
         event.ensure_metadata()
 
         if target:
-            adapter = self.adapters.get(target)
-            if not adapter:
+            if target not in self.adapters:
                 raise ValueError("Unknown adapter")
 
-            return await adapter.handle.remote(event)
+            return await asyncio.wait_for(self.backend.call(target, event), timeout)
 
-        futures = [
-            adapter.handle.remote(event)
-            for adapter in self.adapters.values()
-        ]
+        outcome = await gather_quorum(
+            self._calls(event),
+            QuorumPolicy(deadline=timeout),
+            self.latencies,
+        )
+        if outcome.timed_out:
+            logger.warning(
+                "route_event %s: %d adapters missed the %.1fs deadline",
+                event.trace_id,
+                outcome.cancelled,
+                timeout,
+            )
 
-        responses: List[AdapterResponse] = ray.get(futures)
+        responses: List[AdapterResponse] = list(outcome.responses.values())
         return aggregate_responses(responses)
 
     async def request_consensus(
         self,
         event: MirrorNodeEvent,
+        policy: Optional[QuorumPolicy] = None,
     ) -> ConsensusResult:
+        """
+        Ask every adapter to vote and decide under `policy` (defaults to
+        self.consensus_policy: wait for all). With a quorum or deadline,
+        slow providers no longer set the latency; their calls are cancelled.
+        """
         if not self.initialized:
             raise RuntimeError(
                 "Orchestrator not initialized"
             )
 
+        policy = policy or self.consensus_policy
         event.ensure_metadata()
         event.request_consensus = True
 
-        futures = [
-            adapter.handle.remote(event)
-            for adapter in self.adapters.values()
-        ]
+        outcome = await gather_quorum(
+            self._calls(event),
+            policy,
+            self.latencies,
+        )
+
+        if policy.quorum:
+            reached = outcome.quorum_met
+            agreed = (
+                {"vote": outcome.winning_vote, "agreeing": outcome.agreeing}
+                if outcome.winning_vote is not None else None
+            )
+        else:
+            aggregate = aggregate_responses(list(outcome.responses.values()))
+            reached = aggregate["success"]
+            agreed = aggregate["agreed_payload"]
 
-        responses: List[AdapterResponse] = ray.get(futures)
-        aggregate = aggregate_responses(responses)
+        logger.info(
+            "Consensus %s: %d/%d responded, %d agreeing, %.0fms%s",
+            event.trace_id,
+            len(outcome.responses),
+            len(self.adapters),
+            outcome.agreeing,
+            outcome.elapsed_ms,
+            " (deadline)" if outcome.timed_out else "",
+        )
 
         return ConsensusResult(
-            consensus_reached=aggregate["success"],
+            consensus_reached=reached,
             votes={
-                r.node_id: r.to_dict()
-                for r in responses
+                name: r.to_dict()
+                for name, r in outcome.responses.items()
             },
+            agreed_payload=agreed,
             trace_id=event.trace_id,
         )
 
     def shutdown(self):
         logger.info("Shutting down MirrorNode lattice")
-        ray.shutdown()
+        self.backend.shutdown()
+        self.initialized = False
 
 
-def create_orchestrator() -> MirrorNodeOrchestrator:
-    return MirrorNodeOrchestrator().initialize()
+def create_orchestrator(
+    backend: Union[ExecutionBackend, str, None] = None,
+) -> MirrorNodeOrchestrator:
+    return MirrorNodeOrchestrator(backend).initialize()
 
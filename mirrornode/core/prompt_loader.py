@@ -1,9 +1,20 @@
+import json
+import logging
+import os
 import requests
 import re
+import tempfile
+import threading
+import time
 from typing import Dict, Optional
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 GIST_URL = "https://gist.githubusercontent.com/mirrornode/dae6a79f28dd78258d5f58e3c3ecc5cd/raw"  # Raw MD
+PROMPT_SEED_FILE = Path("cache/prompts.md")  # tracked snapshot; read, never written
+PROMPT_CACHE_FILE = Path(os.getenv("MIRRORNODE_PROMPT_CACHE", "cache/prompts.local.md"))  # used by adapters
+PROMPT_TTL = float(os.getenv("MIRRORNODE_PROMPT_TTL", "300"))  # seconds before revalidating
 
 def fetch_gist() -> str:
     """Fetch raw Gist content."""
@@ -25,39 +36,176 @@ def parse_prompts(md_content: str) -> Dict[str, str]:
             prompts[name] = prompt_block.group(1).strip()
     return prompts
 
+class PromptHandbook:
+    """
+    Parsed prompt handbook, shared per cache file.
+
+    - parsed once into {agent: prompt}; lookups are dict reads
+    - fresh for `ttl` seconds after the last check; once stale, callers
+      keep getting the cached prompts while one background thread
+      revalidates with If-None-Match / If-Modified-Since
+    - fetched copies are written atomically to `cache_file`, validators
+      to `<cache_file>.meta`; a cold start reads the disk copy, and the
+      disk copy keeps serving while the Gist is unreachable
+    - with no disk copy yet, `seed_file` is served (stale, so the first
+      lookup revalidates); it is never written
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[Path] = None,
+        url: str = GIST_URL,
+        ttl: float = PROMPT_TTL,
+        timeout: float = 5,
+        seed_file: Optional[Path] = None,
+    ):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.seed_file = Path(seed_file) if seed_file else None
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._prompts: Optional[Dict[str, str]] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._checked_at = 0.0  # wall clock of the last revalidation attempt
+        self._refreshing = False
+
+    @property
+    def _meta_file(self) -> Path:
+        return self.cache_file.with_name(self.cache_file.name + ".meta")
+
+    def prompts(self) -> Dict[str, str]:
+        """All prompts; blocks on the network only when nothing is cached."""
+        with self._lock:
+            if self._prompts is None:
+                self._load_disk()
+        if self._prompts is None:
+            self.refresh()
+        elif self.stale():
+            self._refresh_in_background()
+        return self._prompts
+
+    def get(self, agent_name: str) -> str:
+        prompts = self.prompts()
+        if agent_name not in prompts and self.stale():
+            self.refresh()
+            prompts = self._prompts
+        if agent_name not in prompts:
+            raise ValueError(f"Prompt '{agent_name}' not in Gist.")
+        return prompts[agent_name]
+
+    def stale(self) -> bool:
+        return time.time() - self._checked_at >= self.ttl
+
+    def refresh(self) -> bool:
+        """
+        Revalidate against the Gist now. Returns True if the handbook
+        changed. Raises RuntimeError only when offline with nothing cached.
+        """
+        headers = {}
+        if self._prompts is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        try:
+            resp = requests.get(self.url, headers=headers, timeout=self.timeout)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+        except Exception as e:
+            self._checked_at = time.time()
+            if self._prompts is None:
+                raise RuntimeError(f"Gist fetch failed: {e}")
+            logger.warning(f"[prompts] revalidation failed, serving cached handbook: {e}")
+            return False
+
+        changed = resp.status_code != 304
+        with self._lock:
+            self._checked_at = time.time()
+            self._etag = resp.headers.get("ETag") or self._etag
+            self._last_modified = resp.headers.get("Last-Modified") or self._last_modified
+            if changed:
+                self._prompts = parse_prompts(resp.text)
+        if self.cache_file:
+            if changed:
+                _atomic_write(self.cache_file, resp.text)
+            _atomic_write(self._meta_file, json.dumps({
+                "etag": self._etag,
+                "last_modified": self._last_modified,
+                "checked_at": self._checked_at,
+            }))
+        return changed
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"[prompts] background revalidation failed: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="prompt-revalidate", daemon=True).start()
+
+    def _load_disk(self) -> None:
+        if not self.cache_file or not self.cache_file.exists():
+            if self.seed_file and self.seed_file.exists():
+                self._prompts = parse_prompts(self.seed_file.read_text())
+            return
+        self._prompts = parse_prompts(self.cache_file.read_text())
+        self._checked_at = self.cache_file.stat().st_mtime
+        try:
+            meta = json.loads(self._meta_file.read_text())
+        except (OSError, ValueError):
+            return
+        self._etag = meta.get("etag")
+        self._last_modified = meta.get("last_modified")
+        self._checked_at = meta.get("checked_at", self._checked_at)
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+_handbooks: Dict[Optional[Path], PromptHandbook] = {}
+_handbooks_lock = threading.Lock()
+
+def handbook(cache_file: Optional[Path] = None) -> PromptHandbook:
+    """Shared PromptHandbook for `cache_file` (None = in-memory only)."""
+    key = Path(cache_file) if cache_file else None
+    with _handbooks_lock:
+        if key not in _handbooks:
+            seed = PROMPT_SEED_FILE if key and key != PROMPT_SEED_FILE else None
+            _handbooks[key] = PromptHandbook(key, seed_file=seed)
+        return _handbooks[key]
+
 def load_prompt(agent_name: str, cache_file: Optional[Path] = None) -> str:
     """
     Load prompt for agent.
-    Caches to file for offline Ray; refreshes from Gist.
+    Served from the shared in-memory handbook; `cache_file` persists it
+    for offline use. Revalidates against the Gist in the background.
     """
-    if cache_file and cache_file.exists():
-        with open(cache_file, 'r') as f:
-            cached = f.read()
-        prompts = parse_prompts(cached)
-        if agent_name in prompts:
-            return prompts[agent_name]
-    
-    md = fetch_gist()
-    prompts = parse_prompts(md)
-    
-    if agent_name not in prompts:
-        raise ValueError(f"Prompt '{agent_name}' not in Gist.")
-    
-    if cache_file:
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(cache_file, 'w') as f:
-            f.write(md)
-    
-    return prompts[agent_name]
+    return handbook(cache_file).get(agent_name)
 
 def load_handbook(path: Optional[Path] = None) -> Dict[str, str]:
     """
-    Load the full handbook (all prompts) from Gist.
+    Load the full handbook (all prompts).
     Alias used by canon_loader and sweep gates.
     """
-    md = fetch_gist()
-    if path:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, 'w') as f:
-            f.write(md)
-    return parse_prompts(md)
+    return dict(handbook(path).prompts())
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from mirrornode.core.aggregation.aggregate import AGREE_THRESHOLD, similarity_matrix
+from mirrornode.core.contracts.adapter_response import AdapterResponse
+
+logger = logging.getLogger(__name__)
+
+AdapterCall = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class QuorumPolicy:
+    """
+    How request_consensus decides it has heard enough.
+
+    quorum:         stop once this many votes agree (None = wait for all)
+    threshold:      shingle cosine similarity at which two votes agree;
+                    the same bar aggregate_responses uses
+    deadline:       seconds; decide from whatever has arrived by then
+    hedge:          send a duplicate request to a provider still running
+                    past its `hedge_quantile` latency
+    hedge_min_samples: latency samples needed before a provider is hedged
+    """
+    quorum: Optional[int] = None
+    threshold: float = AGREE_THRESHOLD
+    deadline: Optional[float] = None
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+
+
+@dataclass
+class QuorumOutcome:
+    responses: Dict[str, Any] = field(default_factory=dict)
+    winning_vote: Optional[str] = None
+    agreeing: int = 0
+    quorum_met: bool = False
+    timed_out: bool = False
+    cancelled: int = 0
+    elapsed_ms: float = 0.0
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies per provider."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, name: str, seconds: float) -> None:
+        self._samples[name].append(seconds)
+
+    def quantile(self, name: str, q: float, min_samples: int = 1) -> Optional[float]:
+        samples = self._samples.get(name)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def vote_of(response: Any) -> Optional[str]:
+    """Normalized vote of a successful AdapterResponse, or None."""
+    if not isinstance(response, AdapterResponse) or not response.ok:
+        return None
+    vote = response.payload.get("vote") or response.payload.get("content")
+    if vote is None:
+        return None
+    return " ".join(str(vote).split()).casefold()
+
+
+def _leading_vote(votes: List[str], threshold: float) -> Tuple[Optional[str], int]:
+    """The vote with the most others within `threshold`, and that count."""
+    if not votes:
+        return None, 0
+    sim = similarity_matrix(votes)
+    counts = [sum(1 for x in row if x >= threshold) for row in sim]
+    best = max(range(len(votes)), key=lambda i: (counts[i], -i))
+    return votes[best], counts[best]
+
+
+async def gather_quorum(
+    calls: Dict[str, AdapterCall],
+    policy: QuorumPolicy,
+    latencies: Optional[LatencyTracker] = None,
+) -> QuorumOutcome:
+    """
+    Run one call per provider and return as soon as `policy` is met.
+    Calls still running at that point (including hedges) are cancelled.
+    """
+    latencies = latencies or LatencyTracker()
+    outcome = QuorumOutcome()
+    started = time.perf_counter()
+
+    tasks = {
+        asyncio.create_task(_hedged(name, call, policy, latencies)): name
+        for name, call in calls.items()
+    }
+    votes: List[str] = []
+    leading, agreeing = None, 0
+    deadline = started + policy.deadline if policy.deadline is not None else None
+    pending = set(tasks)
+
+    try:
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                outcome.timed_out = True
+                break
+            for task in done:
+                name = tasks[task]
+                if task.exception() is not None:
+                    logger.warning("[quorum] %s failed: %s", name, task.exception())
+                    continue
+                response = task.result()
+                outcome.responses[name] = response
+                vote = vote_of(response)
+                if vote is not None:
+                    votes.append(vote)
+                    leading, agreeing = _leading_vote(votes, policy.threshold)
+            if policy.quorum and agreeing >= policy.quorum:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        outcome.cancelled = len(pending)
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    outcome.winning_vote, outcome.agreeing = leading, agreeing
+    outcome.quorum_met = bool(policy.quorum) and outcome.agreeing >= policy.quorum
+    outcome.elapsed_ms = (time.perf_counter() - started) * 1000
+    return outcome
+
+
+async def _hedged(
+    name: str,
+    call: AdapterCall,
+    policy: QuorumPolicy,
+    latencies: LatencyTracker,
+) -> Any:
+    """Primary call, plus one backup if the primary outlives the provider's p95."""
+    started = time.perf_counter()
+    primary = asyncio.create_task(call())
+    attempts = {primary}
+    try:
+        delay = (
+            latencies.quantile(name, policy.hedge_quantile, policy.hedge_min_samples)
+            if policy.hedge else None
+        )
+        if delay is not None:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                logger.info("[quorum] hedging %s after %.0fms", name, delay * 1000)
+                attempts.add(asyncio.create_task(call()))
+
+        error: Optional[BaseException] = None
+        while attempts:
+            done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    result = task.result()
+                    # only healthy answers shape the p95; a fast circuit_open
+                    # or error envelope would pull the hedge delay down
+                    if not isinstance(result, AdapterResponse) or result.ok:
+                        latencies.record(name, time.perf_counter() - started)
+                    return result
+                error = task.exception()
+        raise error
+    finally:
+        for task in attempts:
+            task.cancel()
@@ -44,8 +44,8 @@ def run_sweep(args) -> int:
 
     # GATE 02: Canon loader
     try:
-        from mirrornode.core.prompt_loader import load_prompt
-        prompts = {"merlin": load_prompt("merlin")}
+        from mirrornode.core.prompt_loader import PROMPT_CACHE_FILE, load_prompt
+        prompts = {"merlin": load_prompt("merlin", PROMPT_CACHE_FILE)}
         ok = isinstance(prompts, dict) and len(prompts) > 0
         _check(result, "canon_loader", ok, detail={"keys": list(prompts.keys())})
     except Exception as e:
@@ -77,6 +77,24 @@ def run_sweep(args) -> int:
     except Exception as e:
         _check(result, "tests", False, error=str(e))
 
+    # GATE 05: Orchestrator backend (--ray off|validate|local)
+    try:
+        from mirrornode.core.backends import backend_for_ray_flag, ray_installed
+        from mirrornode.core.orchestrator import create_orchestrator
+        flag = getattr(args, "ray", "validate")
+        backend = backend_for_ray_flag(flag)
+        orchestrator = create_orchestrator(backend)
+        try:
+            adapters = orchestrator.adapters
+        finally:
+            orchestrator.shutdown()
+        detail = {"backend": backend, "adapters": adapters}
+        if flag == "validate":
+            detail["ray_installed"] = ray_installed()
+        _check(result, "orchestrator", len(adapters) > 0, detail=detail)
+    except Exception as e:
+        _check(result, "orchestrator", False, error=str(e))
+
     result["duration_ms"] = int((time.time() - started) * 1000)
 
     # Write artifacts
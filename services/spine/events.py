@@ -1,10 +1,34 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.responses import Response
 from pydantic import BaseModel
-from datetime import datetime
-import hashlib, json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import hashlib, json, os, threading
+
+from mirrornode.core.events.log import EventLog
 
 router = APIRouter()
 
+LOG_DIR = Path(os.getenv(
+    "MIRRORNODE_SPINE_LOG_DIR",
+    Path(__file__).resolve().parents[2] / "logs/events",
+))
+_log: Optional[EventLog] = None
+_log_lock = threading.Lock()  # sync endpoints run in the threadpool
+
+def get_log() -> Optional[EventLog]:
+    """Open the spine event log on first use; None where the disk is read-only."""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                try:
+                    _log = EventLog(LOG_DIR)
+                except OSError as e:
+                    print(f"CANON EVENT LOG UNAVAILABLE: {e}")
+    return _log
+
 class Event(BaseModel):
     source: str
     event_type: str
@@ -20,8 +44,20 @@ def log_event(event: Event):
     }
     sha = hashlib.sha256(json.dumps(entry).encode()).hexdigest()
     print(f"CANON EVENT: {json.dumps(entry)}")  # Vercel runtime logs
+    log = get_log()
+    if log is not None:
+        log.append(json.dumps({**entry, "sha256": sha}).encode())
     return {"status": "logged", "sha256": sha, "entry": entry}
 
 @router.get("/events/today")
-def get_events_today():
-    return {"events": [], "note": "persistent storage coming soon"}
+def get_events_today(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    log = get_log()
+    if log is None:
+        return {"events": [], "note": "event log unavailable"}
+    day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    records = log.read_day(day, offset=offset, limit=limit)
+    body = b'{"date":"%s","events":[%s]}' % (day.encode(), b",".join(records))
+    return Response(content=body, media_type="application/json")
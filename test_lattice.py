@@ -14,8 +14,8 @@ event = create_event(
 print(f"\n🌐 Broadcasting event {event.trace_id} to lattice...")
 results = asyncio.run(orchestrator.route_event(event))
 
-print(f"\n✅ All {len(results)} adapters handled the event")
-for result in results:
+print(f"\n✅ All {len(results['responses'])} adapters handled the event")
+for result in results["responses"]:
     print(f"  - {result['node']}: {result['status']}")
 
 orchestrator.shutdown()
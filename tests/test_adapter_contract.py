@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from mirrornode.core.contracts.adapter_response import (
     AdapterResponse,
@@ -25,3 +27,36 @@ def test_all_statuses_produce_envelope():
         )
         assert resp is not None
         assert resp.status == status
+
+def test_envelope_is_slotted_with_lazy_timestamp():
+    """Timestamp is stored as an int and formatted on read"""
+    resp = AdapterResponse(status=AdapterStatus.OK, node_id="test", payload={}, latency_ms=1.5)
+    assert not hasattr(resp, "__dict__")
+    assert isinstance(resp.created_ns, int)
+    meta = resp.to_dict()["metadata"]
+    assert meta["latency_ms"] == 1.5 and meta["timestamp"].endswith("+00:00")
+    assert abs(resp.created_ns - time.time_ns()) < 5e9  # wall clock, not monotonic
+    with pytest.raises(TypeError):
+        resp.metadata["latency_ms"] = 2.0
+    assert resp.metadata is resp.metadata  # built once, not per read
+    resp.latency_ms = 2.0
+    assert resp.metadata["latency_ms"] == 2.0
+
+def test_every_adapter_returns_envelope(monkeypatch):
+    """All adapters share the BaseAdapter contract"""
+    import asyncio
+    from mirrornode.core.adapters import ClaudeAdapter, GptAdapter, GrokAdapter, TheiaAdapter
+    from mirrornode.core.events.schema import EventType, create_event
+
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    event = create_event(
+        event_type=EventType.INTEGRATION,
+        node="test-node",
+        source={"node": "terminal", "surface": "cli", "origin": "tests"},
+        payload={"message": "hi"},
+    )
+    for cls in (ClaudeAdapter, GptAdapter, GrokAdapter, TheiaAdapter):
+        resp = asyncio.run(cls().handle(event))
+        assert isinstance(resp, AdapterResponse)
+        assert resp.node_id == cls.name
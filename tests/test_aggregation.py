@@ -0,0 +1,75 @@
+import asyncio
+
+from mirrornode.core import orchestrator as orch
+from mirrornode.core.adapters.base import BaseAdapter
+from mirrornode.core.aggregation import aggregate_responses, similarity_matrix
+from mirrornode.core.contracts.adapter_response import AdapterResponse, AdapterStatus
+from mirrornode.core.events.schema import EventType, create_event
+
+
+def _ok(node, text, latency_ms=100.0):
+    return AdapterResponse(
+        status=AdapterStatus.OK,
+        node_id=node,
+        payload={"content": text},
+        latency_ms=latency_ms,
+    )
+
+
+def test_similar_texts_score_higher():
+    sim = similarity_matrix([
+        "The gate opens at dawn",
+        "the gate opens at  DAWN.",
+        "Bananas are yellow",
+    ])
+    assert sim[0][1] > 0.8 > sim[0][2]
+
+
+def test_majority_answer_wins_with_support():
+    result = aggregate_responses([
+        _ok("gpt", "The gate opens at dawn"),
+        _ok("claude", "The gate opens at dawn."),
+        _ok("grok", "Bananas are yellow"),
+        None,
+        AdapterResponse(
+            status=AdapterStatus.UNAVAILABLE, node_id="theia",
+            payload={"content": None}, error={"code": "x"},
+        ),
+    ])
+    agreed = result["agreed_payload"]
+    assert result["success"]
+    assert agreed["vote"].startswith("The gate opens at dawn")
+    assert set(agreed["supporters"]) == {"gpt", "claude"}
+    assert 0.6 < agreed["support"] < 0.7
+    assert [r["node"] for r in result["responses"]] == ["gpt", "claude", "grok", "theia"]
+
+
+def test_reliability_weights_break_ties():
+    responses = [_ok("a", "yes it will"), _ok("b", "no never")]
+    result = aggregate_responses(responses, reliability={"b": 3.0})
+    assert result["agreed_payload"]["node"] == "b"
+    assert not aggregate_responses([])["success"]
+
+
+class _Voter(BaseAdapter):
+    name = "voter"
+
+    async def _ainvoke(self, prompt, system=()):
+        return {"content": "the gate opens", "model": None, "tokens_used": None}
+
+
+def test_request_consensus_on_asyncio_backend(monkeypatch):
+    monkeypatch.setattr(orch, "ADAPTERS", {"a": _Voter, "b": _Voter})
+    lattice = orch.create_orchestrator("asyncio")
+    event = create_event(
+        event_type=EventType.INTEGRATION,
+        node="test-node",
+        source={"node": "terminal", "surface": "cli", "origin": "tests"},
+        payload={"message": "vote"},
+    )
+    result = asyncio.run(lattice.request_consensus(event))
+    lattice.shutdown()
+
+    assert result.consensus_reached
+    assert result.agreed_payload["vote"] == "the gate opens"
+    assert set(result.votes) == {"a", "b"}
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from mirrornode.core.bridge.jobs import AuditJobQueue, SQLiteAuditJobStore
+from mirrornode.core.bridge.router import EventRouter
+from mirrornode.core.bridge.scheduler import DispatchScheduler, SchedulerSaturated
+
+
+def _pipeline(tmp_path, adapter):
+    router = EventRouter()
+    router.register_adapter("probe", adapter)
+    store = SQLiteAuditJobStore(str(tmp_path / "jobs.db"))
+    return router, store, AuditJobQueue(store, DispatchScheduler(router), router)
+
+
+async def _run_job(jobs, router, trace_id):
+    sub = router.open_subscription(maxsize=16)
+    job = await jobs.submit(trace_id, "security_scan", {"checks": ["auth"]}, "pytest")
+    statuses = [job["status"]]
+    while statuses[-1] not in ("completed", "failed"):
+        statuses.append((await sub.get()).payload.get("audit_status") or statuses[-1])
+    await jobs.stop()
+    return statuses
+
+
+def test_audit_job_moves_through_statuses(tmp_path):
+    router, store, jobs = _pipeline(tmp_path, lambda event: event.payload["audit_event"])
+
+    statuses = asyncio.run(_run_job(jobs, router, "job-1"))
+    assert statuses[0] == "queued" and statuses[-1] == "completed"
+    assert "processing" in statuses
+
+    job = store.load("job-1")
+    assert job["status"] == "completed"
+    assert job["result"]["adapters"]["probe"]["status"] == "ok"
+    router.close()
+
+
+def test_audit_job_fails_when_every_adapter_fails(tmp_path):
+    def boom(event):
+        raise RuntimeError("provider down")
+
+    router, store, jobs = _pipeline(tmp_path, boom)
+    assert asyncio.run(_run_job(jobs, router, "job-2"))[-1] == "failed"
+    assert store.load("job-2")["error"] == "all adapters failed"
+    assert store.unfinished() == []
+    router.close()
+
+
+def test_restart_recovers_unfinished_jobs_once(tmp_path):
+    calls = []
+
+    def probe(event):
+        calls.append(event.trace_id)
+        return "ok"
+
+    router, store, jobs = _pipeline(tmp_path, probe)
+    store.create("left-queued", "security_scan", {}, "pytest")
+    store.create("left-processing", "security_scan", {}, "pytest")
+    store.set_status("left-processing", "processing")
+
+    async def restart():
+        # startup hook and a first request racing to start the queue
+        await asyncio.gather(jobs.start(), jobs.start(), jobs.start())
+        while store.unfinished():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await jobs.stop()
+
+    asyncio.run(restart())
+    assert sorted(calls) == ["left-processing", "left-queued"]
+    assert store.load("left-queued")["status"] == "completed"
+    assert store.load("left-processing")["status"] == "completed"
+    router.close()
+
+
+def test_full_queue_refuses_before_persisting(tmp_path, monkeypatch):
+    router, store, _ = _pipeline(tmp_path, lambda event: "ok")
+    jobs = AuditJobQueue(store, DispatchScheduler(router), router, workers=0, max_pending=1)
+    create = store.create
+
+    def slow_create(*args):
+        time.sleep(0.05)  # both submits are past the admission check meanwhile
+        create(*args)
+
+    monkeypatch.setattr(store, "create", slow_create)
+
+    async def race():
+        results = await asyncio.gather(
+            jobs.submit("a", "security_scan", {}, "pytest"),
+            jobs.submit("b", "security_scan", {}, "pytest"),
+            return_exceptions=True,
+        )
+        await jobs.stop()
+        return results
+
+    results = asyncio.run(race())
+    refused = [r for r in results if isinstance(r, SchedulerSaturated)]
+    assert len(refused) == 1 and refused[0].status_code == 503
+    assert len(store.unfinished()) == 1
+    router.close()
+
+
+def test_importing_the_app_opens_no_audit_db(tmp_path):
+    code = "import mirrornode.core.bridge.main"
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])}
+    env.pop("MIRRORNODE_AUDIT_DB", None)
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True,
+                   capture_output=True)
+    assert not list(tmp_path.glob("mirrornode_audit.db*"))
@@ -0,0 +1,60 @@
+import asyncio
+import os
+
+import pytest
+
+from mirrornode.core.backends import (
+    AsyncioBackend,
+    ProcessPoolBackend,
+    backend_for_ray_flag,
+    create_backend,
+)
+from mirrornode.core.events.schema import create_event, EventType
+
+
+class EchoAdapter:
+    name = "echo"
+
+    async def handle(self, event):
+        return {"node": self.name, "pid": os.getpid(), "msg": event.payload["message"],
+                "key": os.getenv("MIRRORNODE_TEST_KEY")}
+
+
+def _event():
+    return create_event(
+        event_type=EventType.INTEGRATION,
+        node="test-node",
+        source={"node": "terminal", "surface": "cli", "origin": "tests"},
+        payload={"message": "hi"},
+    )
+
+
+@pytest.mark.parametrize("backend", [AsyncioBackend(), ProcessPoolBackend(max_workers=1)])
+def test_backends_run_adapters(backend):
+    backend.start({"echo": EchoAdapter}, {"MIRRORNODE_TEST_KEY": "k"})
+    try:
+        assert backend.names() == ["echo"]
+        result = asyncio.run(backend.call("echo", _event()))
+    finally:
+        backend.shutdown()
+
+    assert result["msg"] == "hi"
+    if backend.name == "process":
+        assert result["pid"] != os.getpid() and result["key"] == "k"
+
+
+def test_backend_selection():
+    assert create_backend("asyncio").name == "asyncio"
+    assert backend_for_ray_flag("off") == "asyncio"
+    assert backend_for_ray_flag("local") == "ray"
+    assert backend_for_ray_flag("validate") == "asyncio"
+    with pytest.raises(ValueError):
+        create_backend("carrier-pigeon")
+
+
+def test_default_backend_without_ray(monkeypatch):
+    monkeypatch.delenv("MIRRORNODE_ORCHESTRATOR_BACKEND", raising=False)
+    monkeypatch.setattr("mirrornode.core.backends.ray_installed", lambda: False)
+    assert create_backend().name == "asyncio"
+    monkeypatch.setenv("MIRRORNODE_ORCHESTRATOR_BACKEND", "process")
+    assert create_backend().name == "process"
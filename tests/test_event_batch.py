@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mirrornode.core.bridge import main
+from mirrornode.core.bridge.router import EventRouter
+from mirrornode.core.events.log import EventLog
+
+
+def _event(i):
+    return {
+        "event_type": "INTEGRATION",
+        "node": "collector",
+        "source": {"node": "collector", "surface": "batch", "origin": "tests"},
+        "payload": {"n": i},
+    }
+
+
+class Counter:
+    def __init__(self):
+        self.seen = []
+
+    async def handle(self, event):
+        self.seen.append(event.payload["n"])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("MIRRORNODE_API_KEY", "test-key")
+    counter = Counter()
+    monkeypatch.setattr(main.router, "adapters", {"counter": counter})
+    main.key_registry.load()
+    return TestClient(main.app), counter
+
+
+def test_json_array_batch_reports_per_item_results(client):
+    http, counter = client
+    body = [_event(0), {"node": "missing-fields"}, _event(2)]
+    resp = http.post("/events/batch", json=body, headers={"X-API-Key": "test-key"})
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["accepted"] == 2 and data["rejected"] == 1
+    assert [item["status"] for item in data["items"]] == ["routed", "invalid", "routed"]
+    assert data["adapters"] == {"counter": {"ok": 2, "timeout": 0, "error": 0}}
+    assert sorted(counter.seen) == [0, 2]
+
+    traces = {e.trace_id for e in main.router.get_recent(limit=5)}
+    assert data["items"][0]["trace_id"] in traces
+
+
+def test_ndjson_batch(client):
+    http, counter = client
+    lines = "\n".join(json.dumps(_event(i)) for i in range(5)) + "\nnot json\n"
+    resp = http.post(
+        "/events/batch",
+        content=lines,
+        headers={"X-API-Key": "test-key", "Content-Type": "application/x-ndjson"},
+    )
+
+    data = resp.json()
+    assert data["accepted"] == 5 and data["items"][-1]["status"] == "invalid"
+    assert sorted(counter.seen) == list(range(5))
+
+
+def test_oversized_batch_is_rejected(client, monkeypatch):
+    http, _ = client
+    monkeypatch.setattr(main, "MAX_BATCH_EVENTS", 2)
+    resp = http.post("/events/batch", json=[_event(i) for i in range(3)],
+                     headers={"X-API-Key": "test-key"})
+    assert resp.status_code == 413
+
+
+def test_shutdown_flushes_the_event_log(tmp_path, monkeypatch):
+    log = EventLog(tmp_path, flush_interval=60)  # nothing is written until close
+    monkeypatch.setattr(main, "router", EventRouter(event_log=log))
+    log.append(b'{"n": 1}')
+
+    asyncio.run(main.close_provider_pool())
+    assert EventLog(tmp_path).tail(1) == [b'{"n": 1}']
@@ -0,0 +1,42 @@
+from mirrornode.core.bridge.history import EventHistory
+from mirrornode.core.events.schema import create_event, EventType
+
+SOURCE = {"node": "test", "surface": "cli", "origin": "pytest"}
+
+
+def _event(node="osiris", event_type=EventType.ANALYSIS, trace_id=None, n=0):
+    return create_event(event_type, node, SOURCE, payload={"n": n}, trace_id=trace_id)
+
+
+def test_ring_buffer_overwrites_oldest():
+    h = EventHistory(capacity=3)
+    for i in range(5):
+        h.append(_event(n=i))
+    assert len(h) == 3
+    assert [e.payload["n"] for e in h] == [2, 3, 4]
+    assert [e.payload["n"] for e in h.recent(2)] == [3, 4]
+
+
+def test_indexed_lookups_by_node_and_type():
+    h = EventHistory(capacity=10)
+    h.append(_event(node="osiris", event_type=EventType.ANALYSIS, n=1))
+    h.append(_event(node="theia", event_type=EventType.ANALYSIS, n=2))
+    h.append(_event(node="osiris", event_type=EventType.EXECUTION, n=3))
+    h.append(_event(node="osiris", event_type=EventType.ANALYSIS, n=4))
+
+    assert [e.payload["n"] for e in h.recent(50, node="osiris")] == [1, 3, 4]
+    assert [e.payload["n"] for e in h.recent(50, event_type="ANALYSIS")] == [1, 2, 4]
+    hits = h.recent(1, node="osiris", event_type=EventType.ANALYSIS)
+    assert [e.payload["n"] for e in hits] == [4]
+
+
+def test_eviction_drops_index_entries():
+    h = EventHistory(capacity=2)
+    h.append(_event(trace_id="t-1", node="osiris", n=1))
+    h.append(_event(trace_id="t-2", node="theia", n=2))
+    h.append(_event(trace_id="t-3", node="theia", n=3))
+
+    assert h.by_trace("t-1") == []
+    assert h.recent(10, node="osiris") == []
+    assert h.latest_for_trace("t-3").payload["n"] == 3
+    assert [e.payload["n"] for e in h.recent(10, node="theia")] == [2, 3]
@@ -0,0 +1,91 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from mirrornode.core.events.log import EventLog
+
+
+def _records(n, start=0):
+    return [json.dumps({"n": i}).encode() for i in range(start, start + n)]
+
+
+def test_append_flush_and_read_back(tmp_path):
+    log = EventLog(tmp_path, flush_interval=0.001)
+    for rec in _records(10):
+        log.append(rec)
+    assert log.flush(timeout=5)
+
+    assert [json.loads(r)["n"] for r in log.tail(3)] == [7, 8, 9]
+    day = log.days()[-1]
+    assert [json.loads(r)["n"] for r in log.read_day(day, offset=2, limit=3)] == [2, 3, 4]
+    log.close()
+
+
+def test_segments_rotate_and_tail_spans_them(tmp_path):
+    log = EventLog(tmp_path, max_segment_bytes=40, flush_interval=0.001)
+    log.append_many([(rec, None) for rec in _records(12)])
+    log.close()
+
+    day = log.days()[-1]
+    assert len(list((tmp_path / day).glob("*.ndjson"))) > 1
+    assert [json.loads(r)["n"] for r in log.tail(5)] == [7, 8, 9, 10, 11]
+    assert len(log.read_day(day)) == 12
+
+
+def test_iter_range_filters_by_timestamp(tmp_path):
+    log = EventLog(tmp_path, flush_interval=0.001)
+    base = datetime.utcnow()
+    for i, rec in enumerate(_records(5)):
+        log.append(rec, base + timedelta(seconds=i))
+    log.close()
+
+    hits = log.iter_range(base + timedelta(seconds=1), base + timedelta(seconds=3))
+    assert [json.loads(r)["n"] for _, r in hits] == [1, 2]
+
+
+def test_reopen_truncates_torn_tail(tmp_path):
+    log = EventLog(tmp_path, flush_interval=0.001)
+    log.append_many([(rec, None) for rec in _records(3)])
+    log.close()
+
+    day = log.days()[-1]
+    segment = next((tmp_path / day).glob("*.ndjson"))
+    with open(segment, "ab") as f:
+        f.write(b'{"n": 99, "torn')
+
+    log = EventLog(tmp_path, flush_interval=0.001)
+    log.append(_records(1, start=3)[0])
+    log.close()
+
+    assert [json.loads(r)["n"] for r in log.read_day(day)] == [0, 1, 2, 3]
+
+
+def test_range_finds_records_filed_under_the_write_day(tmp_path):
+    log = EventLog(tmp_path, flush_interval=0.001)
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    late = today - timedelta(minutes=1)  # yesterday, written today
+    log.append(_records(1)[0], late)
+    log.close()
+
+    hits = log.iter_range(late - timedelta(hours=1), late + timedelta(seconds=30))
+    assert [json.loads(r)["n"] for _, r in hits] == [0]
+
+
+def test_failed_write_is_reported_to_flush(tmp_path, monkeypatch):
+    log = EventLog(tmp_path, flush_interval=0.001)
+    write = log._write
+
+    def fail_once(batch):
+        monkeypatch.setattr(log, "_write", write)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(log, "_write", fail_once)
+    log.append(_records(1)[0])
+    with pytest.raises(OSError):
+        log.flush(timeout=5)
+
+    log.append(_records(1, start=1)[0])
+    assert log.flush(timeout=5)
+    log.close()
+    assert [json.loads(r)["n"] for r in log.tail(5)] == [1]
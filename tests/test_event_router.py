@@ -0,0 +1,233 @@
+import asyncio
+import time
+
+import pytest
+
+from mirrornode.core.bridge.router import EventRouter
+from mirrornode.core.events.schema import create_event, EventType
+
+SOURCE = {"node": "test", "surface": "cli", "origin": "pytest"}
+
+
+def _event(node="osiris", **kwargs):
+    return create_event(EventType.ANALYSIS, node, SOURCE, **kwargs)
+
+
+class _AsyncAdapter:
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def handle(self, event):
+        await asyncio.sleep(self.delay)
+        return event.node
+
+
+def test_dispatch_runs_adapters_concurrently():
+    router = EventRouter(adapter_timeout=1.0)
+    router.register_adapter("a", _AsyncAdapter(0.2))
+    router.register_adapter("b", _AsyncAdapter(0.2))
+    router.register_adapter("sync", lambda event: event.trace_id)
+
+    event = _event()
+    start = time.perf_counter()
+    outcomes = asyncio.run(router.dispatch(event))
+    elapsed = time.perf_counter() - start
+    router.close()
+
+    assert elapsed < 0.35
+    assert outcomes["a"]["status"] == "ok" and outcomes["a"]["result"] == "osiris"
+    assert outcomes["sync"]["result"] == event.trace_id
+    assert outcomes["b"]["latency_ms"] >= 200
+
+
+def test_dispatch_enforces_per_adapter_timeout():
+    def boom(event):
+        raise RuntimeError("provider down")
+
+    router = EventRouter(adapter_timeout=1.0)
+    router.register_adapter("slow", _AsyncAdapter(5.0), timeout=0.05)
+    router.register_adapter("fast", _AsyncAdapter(0.0))
+    router.register_adapter("broken", boom)
+
+    outcomes = asyncio.run(router.dispatch(_event()))
+    router.close()
+
+    assert outcomes["slow"]["status"] == "timeout"
+    assert outcomes["fast"]["status"] == "ok"
+    assert outcomes["broken"] == {
+        "status": "error",
+        "result": None,
+        "latency_ms": outcomes["broken"]["latency_ms"],
+        "error": "provider down",
+    }
+
+
+def test_subscribe_yields_dispatched_events():
+    router = EventRouter()
+
+    async def scenario():
+        received = []
+
+        async def consume():
+            async for event in router.subscribe(maxsize=8):
+                received.append(event.payload["n"])
+                if len(received) == 3:
+                    break
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        for n in range(3):
+            await router.dispatch(_event(payload={"n": n}))
+        await task
+        return received
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
+    assert router.subscriptions == set()
+
+
+def test_slow_subscriber_overflow_policies():
+    from mirrornode.core.bridge.subscription import SubscriberOverflow
+
+    router = EventRouter()
+
+    async def scenario():
+        oldest = router.open_subscription(maxsize=2, policy="drop_oldest")
+        newest = router.open_subscription(maxsize=2, policy="drop_newest")
+        strict = router.open_subscription(maxsize=2, policy="disconnect")
+        for n in range(4):
+            await router.dispatch(_event(payload={"n": n}))
+
+        kept_oldest = [(await oldest.get()).payload["n"] for _ in range(2)]
+        kept_newest = [(await newest.get()).payload["n"] for _ in range(2)]
+        try:
+            await strict.get()
+            disconnected = False
+        except SubscriberOverflow:
+            disconnected = True
+        return kept_oldest, kept_newest, disconnected, oldest.lagged
+
+    kept_oldest, kept_newest, disconnected, lagged = asyncio.run(scenario())
+    assert kept_oldest == [2, 3]
+    assert kept_newest == [0, 1]
+    assert disconnected
+    assert lagged == 2
+    assert len(router.subscriptions) == 2
+
+
+def test_filtered_subscription_batches_matching_events():
+    from mirrornode.core.bridge.schemas import StreamFilter
+
+    predicate = StreamFilter(
+        node=["osiris"],
+        min_priority=5,
+        payload_exists=["audit_event"],
+    ).compile()
+    router = EventRouter()
+
+    async def scenario():
+        sub = router.open_subscription(maxsize=16, predicate=predicate)
+        await router.dispatch(_event(priority=9, payload={"audit_event": "a"}))
+        await router.dispatch(_event(priority=1, payload={"audit_event": "b"}))
+        await router.dispatch(_event(node="theia", priority=9, payload={"audit_event": "c"}))
+        await router.dispatch(_event(priority=7, payload={"other": "d"}))
+        await router.dispatch(_event(priority=5, payload={"audit_event": "e"}))
+        batch = await sub.get_batch(max_size=10, flush_interval=0.01)
+        return [e.payload["audit_event"] for e in batch], sub.qsize()
+
+    assert asyncio.run(scenario()) == (["a", "e"], 0)
+
+
+def test_dispatch_encodes_event_once():
+    import json
+
+    router = EventRouter()
+    event = _event(payload={"n": 1})
+    asyncio.run(router.dispatch(event))
+
+    cached = event.json_bytes()
+    assert event.json_bytes() is cached
+    assert json.loads(cached)["payload"] == {"n": 1}
+
+    event.priority = 3
+    assert json.loads(event.json_bytes())["priority"] == 3
+
+
+def test_scheduler_orders_by_priority_and_refuses_when_full():
+    from mirrornode.core.bridge.scheduler import DispatchScheduler, SchedulerSaturated
+
+    order = []
+    router = EventRouter()
+    router.register_adapter("probe", lambda event: order.append(event.payload["n"]))
+    scheduler = DispatchScheduler(router, workers=1, max_queue=4, per_source_limit=3)
+
+    async def scenario():
+        blocker = asyncio.create_task(scheduler.submit(_event(payload={"n": "first"})))
+        await asyncio.sleep(0)
+        jobs = [
+            asyncio.create_task(scheduler.submit(_event(priority=p, payload={"n": p})))
+            for p in (1, 5, 3)
+        ]
+        await asyncio.sleep(0)
+        try:
+            await scheduler.submit(_event(payload={"n": "rejected"}))
+        except SchedulerSaturated as exc:
+            status = exc.status_code
+        await asyncio.gather(blocker, *jobs)
+        await scheduler.stop()
+        return status
+
+    assert asyncio.run(scenario()) == 429
+    assert order == ["first", 5, 3, 1]
+    router.close()
+
+
+def test_scheduler_interleaves_batches_with_interactive_events():
+    from mirrornode.core.bridge.scheduler import DispatchScheduler, SchedulerSaturated
+
+    order = []
+    router = EventRouter()
+    router.register_adapter("probe", lambda event: order.append(event.payload["n"]))
+    scheduler = DispatchScheduler(router, workers=1, max_queue=6, per_source_limit=6, batch_chunk=2)
+    bulk = {**SOURCE, "node": "bulk"}
+
+    async def scenario():
+        blocker = asyncio.create_task(scheduler.submit(_event(payload={"n": "first"})))
+        await asyncio.sleep(0)
+        batch = asyncio.create_task(scheduler.submit_many(
+            [create_event(EventType.ANALYSIS, "osiris", bulk, payload={"n": f"b{i}"}) for i in range(6)]
+        ))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(scheduler.submit(_event(payload={"n": "hud"})))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerSaturated) as refused:
+            await scheduler.submit_many([create_event(EventType.ANALYSIS, "osiris", bulk)] * 6)
+        outcomes = await batch
+        await asyncio.gather(blocker, interactive)
+        await scheduler.stop()
+        return outcomes, refused.value.status_code
+
+    outcomes, status = asyncio.run(scenario())
+    assert status == 503 and len(outcomes) == 6 and all("probe" in o for o in outcomes)
+    assert order == ["first", "b0", "b1", "hud", "b2", "b3", "b4", "b5"]
+    router.close()
+
+
+def test_scheduler_stop_drains_queued_dispatches():
+    from mirrornode.core.bridge.scheduler import DispatchScheduler
+
+    done = []
+    router = EventRouter()
+    router.register_adapter("slow", _AsyncAdapter(0.01))
+    router.register_adapter("probe", lambda event: done.append(event.payload["n"]))
+    scheduler = DispatchScheduler(router, workers=1)
+
+    async def scenario():
+        jobs = [asyncio.create_task(scheduler.submit(_event(payload={"n": i}))) for i in range(3)]
+        await asyncio.sleep(0)
+        await scheduler.stop()
+        return await asyncio.gather(*jobs, return_exceptions=True)
+
+    outcomes = asyncio.run(scenario())
+    assert sorted(done) == [0, 1, 2]
+    assert all(isinstance(o, dict) for o in outcomes)
+    router.close()
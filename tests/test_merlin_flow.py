@@ -7,7 +7,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from mirrornode.core.prompt_loader import load_prompt
+from mirrornode.core.prompt_loader import PROMPT_CACHE_FILE, load_prompt
 
 def test_merlin_orchestration_stub():
     """Test full Merlin-orchestrated flow (stub mode)."""
@@ -15,7 +15,7 @@ def test_merlin_orchestration_stub():
     
     # 1. Load Merlin prompt
     print("[1/5] Loading Merlin prompt from Gist...")
-    merlin_prompt = load_prompt('merlin', Path('cache/prompts.md'))
+    merlin_prompt = load_prompt('merlin', PROMPT_CACHE_FILE)
     assert "sovereign orchestrator" in merlin_prompt.lower(), "Merlin prompt loaded"
     print("  ✓ Merlin prompt loaded and validated")
     
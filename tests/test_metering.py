@@ -0,0 +1,152 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from mirrornode.core.adapters.base import BaseAdapter
+from mirrornode.core.contracts.adapter_response import AdapterStatus
+from mirrornode.core.events.schema import create_event, EventType
+from mirrornode.core.metering import UsageMeter, token_cap
+
+
+class Metered(BaseAdapter):
+    name = "metered"
+
+    def __init__(self):
+        super().__init__()
+        self.caps = []
+
+    async def _ainvoke(self, prompt, system=()):
+        self.caps.append(token_cap(self.max_tokens))
+        return {"content": "ok", "model": "m", "tokens_used": 30,
+                "prompt_tokens": 10, "completion_tokens": 20}
+
+
+def _event(key_id=None, trace_id="t-1"):
+    event = create_event(
+        event_type=EventType.INTEGRATION,
+        node="test-node",
+        source={"node": "terminal", "surface": "cli", "origin": "tests"},
+        payload={"prompt": "hello"},
+    )
+    event.trace_id = trace_id
+    event._api_key_id = key_id
+    return event
+
+
+def test_usage_is_counted_per_adapter_key_and_trace():
+    adapter = Metered()
+    adapter.meter = UsageMeter()
+
+    async def run():
+        await adapter.handle(_event("k1"))
+        await adapter.handle(_event("k1"))
+        await adapter.handle(_event("k2", trace_id="t-2"))
+
+    asyncio.run(run())
+    usage = adapter.meter.snapshot("t-1")
+
+    assert usage["adapters"]["metered"]["requests"] == 3
+    assert usage["api_keys"]["k1"]["total_tokens"] == 60
+    assert usage["api_keys"]["k2"]["completion_tokens"] == 20
+    assert usage["trace"]["requests"] == 2
+
+
+def test_budget_downgrades_then_rejects_before_the_call():
+    adapter = Metered()
+    adapter.meter = UsageMeter(budgets={"k1": 1000})
+
+    first = asyncio.run(adapter.handle(_event("k1")))
+    adapter.meter.record("metered", "k1", None, completion_tokens=950)
+    second = asyncio.run(adapter.handle(_event("k1")))
+    third = asyncio.run(adapter.handle(_event("k1")))
+
+    assert first.ok and second.ok
+    assert adapter.caps[0] == adapter.max_tokens
+    assert adapter.caps[1] < adapter.max_tokens
+    assert third.status == AdapterStatus.UNAVAILABLE
+    assert third.error["code"] == "budget_exceeded"
+    assert len(adapter.caps) == 2
+    assert token_cap(512) == 512  # cap does not leak out of the call
+
+
+class Greedy(BaseAdapter):
+    """Spends every completion token it is allowed."""
+
+    name = "greedy"
+
+    async def _ainvoke(self, prompt, system=()):
+        await asyncio.sleep(0.01)
+        return {"content": "ok", "model": "m", "tokens_used": None,
+                "prompt_tokens": 2, "completion_tokens": token_cap(self.max_tokens)}
+
+
+def test_concurrent_calls_cannot_overspend_the_budget():
+    meter = UsageMeter(budgets={"k1": 600})
+    adapters = [Greedy() for _ in range(10)]
+    for adapter in adapters:
+        adapter.meter = meter
+
+    async def run():
+        return await asyncio.gather(*(a.handle(_event("k1")) for a in adapters))
+
+    responses = asyncio.run(run())
+    admitted = [r for r in responses if r.ok]
+    rejected = [r for r in responses if r.error and r.error["code"] == "budget_exceeded"]
+
+    assert len(admitted) + len(rejected) == 10 and rejected
+    assert meter.snapshot()["api_keys"]["k1"]["total_tokens"] <= 600
+    assert meter.snapshot()["budgets"]["k1"]["reserved"] == 0
+
+
+def test_cancelled_call_returns_its_reservation():
+    adapter = Greedy()
+    adapter.meter = UsageMeter(budgets={"k1": 600})
+
+    async def run():
+        task = asyncio.ensure_future(adapter.handle(_event("k1")))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert adapter.meter.remaining("k1") == 600
+
+
+def test_counters_roll_up_to_sqlite(tmp_path):
+    db = tmp_path / "usage.db"
+    meter = UsageMeter(db_path=str(db), budgets={"*": 1000}, flush_interval=3600)
+    meter.record("gpt", "k1", "t", prompt_tokens=5, completion_tokens=7, latency_ms=12.5)
+    meter.record("gpt", "k1", "t", prompt_tokens=1, completion_tokens=1)
+    meter.close()
+
+    with sqlite3.connect(db) as conn:
+        rows = dict(conn.execute(
+            "SELECT dimension, prompt_tokens + completion_tokens FROM usage"
+        ).fetchall())
+    assert rows == {"adapter": 14, "api_key": 14}
+
+    # spent budget survives a restart within the same day
+    assert UsageMeter(db_path=str(db), budgets={"*": 1000}).remaining("k1") == 986
+
+
+def test_failed_flush_keeps_the_deltas(tmp_path, monkeypatch):
+    db = tmp_path / "usage.db"
+    meter = UsageMeter(db_path=str(db), flush_interval=3600)
+    meter.record("gpt", "k1", None, prompt_tokens=5, completion_tokens=5)
+
+    def locked(pending):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(meter, "_write", locked)
+    with pytest.raises(sqlite3.OperationalError):
+        meter.flush()
+    meter.record("gpt", "k1", None, prompt_tokens=1, completion_tokens=1)
+    monkeypatch.undo()
+    meter.close()
+
+    with sqlite3.connect(db) as conn:
+        rows = dict(conn.execute(
+            "SELECT dimension, prompt_tokens + completion_tokens FROM usage"
+        ).fetchall())
+    assert rows == {"adapter": 12, "api_key": 12}
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+from mirrornode.core.adapters.base import BaseAdapter
+from mirrornode.core.bench import (
+    LatencyModel,
+    MockProviderConfig,
+    MockProviderServer,
+    bench_router,
+    create_mock_provider,
+    measure,
+)
+from mirrornode.core.bridge.router import EventRouter
+
+FAST = LatencyModel("fixed", 0)
+
+
+def _post(app, path, body):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+            return await client.post(path, json=body)
+    return asyncio.run(run())
+
+
+def test_openai_and_anthropic_wire_formats():
+    app = create_mock_provider(MockProviderConfig(latency=FAST, completion_tokens=5))
+
+    chat = _post(app, "/v1/chat/completions", {
+        "model": "gpt-x", "max_tokens": 3, "messages": [{"role": "user", "content": "hi"}],
+    }).json()
+    assert chat["object"] == "chat.completion"
+    assert len(chat["choices"][0]["message"]["content"].split()) == 3
+    assert chat["usage"]["completion_tokens"] == 3
+
+    message = _post(app, "/v1/messages", {
+        "model": "claude-x", "max_tokens": 64, "system": [{"type": "text", "text": "sys"}],
+        "messages": [{"role": "user", "content": "hi"}],
+    }).json()
+    assert message["type"] == "message" and message["content"][0]["type"] == "text"
+    assert message["usage"]["output_tokens"] == 5
+
+
+def test_streams_use_provider_event_framing():
+    app = create_mock_provider(MockProviderConfig(latency=FAST, token_ms=0, completion_tokens=4))
+    request = {"model": "m", "max_tokens": 64, "stream": True,
+               "messages": [{"role": "user", "content": "hi"}]}
+
+    openai_lines = [l for l in _post(app, "/v1/chat/completions", request).text.splitlines() if l]
+    assert openai_lines[-1] == "data: [DONE]"
+    deltas = [json.loads(l[6:])["choices"][0]["delta"].get("content") for l in openai_lines[:-1]]
+    assert len("".join(d for d in deltas if d).split()) == 4
+
+    events = [l[7:] for l in _post(app, "/v1/messages", request).text.splitlines()
+              if l.startswith("event: ")]
+    assert events[0] == "message_start" and events[-1] == "message_stop"
+    assert events.count("content_block_delta") == 4
+
+
+def test_faults_and_latency_are_deterministic_per_seed():
+    config = MockProviderConfig(latency=FAST, rate_429=0.3, rate_5xx=0.3, seed=7)
+    request = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+
+    def statuses():
+        app = create_mock_provider(config)
+        return [_post(app, "/v1/chat/completions", request).status_code for _ in range(20)]
+
+    first = statuses()
+    assert first == statuses()
+    assert {200, 429, 503} <= set(first)
+
+    model = LatencyModel("lognormal", 50, 0.5)
+    assert model.sample(random.Random(1)) == model.sample(random.Random(1))
+    assert LatencyModel.parse("uniform:20:0.1") == LatencyModel("uniform", 20, 0.1)
+
+
+def test_measure_reports_percentiles():
+    async def call(i):
+        await asyncio.sleep(0.001)
+        return i % 10 != 0
+
+    result = asyncio.run(measure("t", call, requests=50, concurrency=8))
+    assert result.requests == 50 and result.errors == 5
+    assert 0 < result.p50_ms <= result.p95_ms <= result.p99_ms <= result.max_ms
+    assert result.throughput_rps > 0
+
+
+class MockChatAdapter(BaseAdapter):
+    """Minimal OpenAI-format client, standing in for the SDK-based adapters."""
+
+    def __init__(self, url):
+        super().__init__("mock-chat")
+        self.url = url
+
+    async def _ainvoke(self, prompt, system=()):
+        async with httpx.AsyncClient(base_url=self.url) as client:
+            response = await client.post("/v1/chat/completions", json={
+                "model": "m", "messages": [{"role": "user", "content": prompt}],
+            })
+        response.raise_for_status()
+        return {"content": response.json()["choices"][0]["message"]["content"]}
+
+
+def test_router_benchmark_against_served_mock():
+    config = MockProviderConfig(latency=LatencyModel("fixed", 5), rate_5xx=0.2, seed=3)
+    with MockProviderServer(config) as server:
+        router = EventRouter(history_size=1)
+        router.register_adapter("mock", MockChatAdapter(server.url))
+        result = asyncio.run(bench_router(router, requests=40, concurrency=8))
+        router.close()
+        stats = server.stats
+
+    assert result.requests == 40
+    assert result.p50_ms >= 5
+    assert stats.get("ok", 0) > 0 and stats.get("5xx", 0) > 0
+
+
+def _sdk_round_trip(adapter_cls, monkeypatch, server):
+    from mirrornode.core.adapters.http import close_http_client
+    from mirrornode.core.bench.harness import bench_event
+
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+    monkeypatch.setenv("OPENAI_BASE_URL", server.url + "/v1")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "mock-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "mock-key")
+    adapter = adapter_cls()
+
+    async def run():
+        try:
+            return await adapter.handle(bench_event(0))
+        finally:
+            await close_http_client()
+
+    return asyncio.run(run())
+
+
+def test_claude_sdk_speaks_to_the_mock(monkeypatch):
+    pytest.importorskip("anthropic")
+    from mirrornode.core.adapters.claude import ClaudeAdapter
+
+    with MockProviderServer(MockProviderConfig(latency=FAST, completion_tokens=4)) as server:
+        response = _sdk_round_trip(ClaudeAdapter, monkeypatch, server)
+    assert response.ok, response.error
+    assert len(response.payload["content"].split()) == 4
+    assert response.payload["completion_tokens"] == 4
+
+
+def test_gpt_sdk_speaks_to_the_mock(monkeypatch):
+    pytest.importorskip("openai")
+    from mirrornode.core.adapters.gpt import GptAdapter
+
+    with MockProviderServer(MockProviderConfig(latency=FAST, completion_tokens=4)) as server:
+        response = _sdk_round_trip(GptAdapter, monkeypatch, server)
+    assert response.ok, response.error
+    assert len(response.payload["content"].split()) == 4
+    assert response.payload["completion_tokens"] == 4
+
+
+def test_cli_parser_does_not_import_the_mock_server():
+    code = (
+        "import sys; from mirrornode.__main__ import main; sys.argv = ['mirrornode', 'bench', '-h']\n"
+        "try: main()\nexcept SystemExit: pass\n"
+        "assert 'fastapi' not in sys.modules, 'fastapi imported'"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=Path(__file__).resolve().parents[1])
+    assert result.returncode == 0, result.stderr
+    assert "--error-429" in result.stdout
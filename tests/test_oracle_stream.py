@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mirrornode.core.adapters.base import BaseAdapter
+from mirrornode.core.bridge import main
+from mirrornode.core.bridge.ratelimit import key_id
+from mirrornode.core.metering import UsageMeter
+
+ORACLE_REQUEST = {
+    "sessionId": "s1",
+    "mode": "oracle",
+    "prompt": "speak",
+    "ritualState": "open",
+}
+
+
+class FakeStreamingAdapter(BaseAdapter):
+    name = "claude"
+
+    async def stream(self, prompt, system=()):
+        for word in ("the ", "mirror ", prompt):
+            yield word
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("MIRRORNODE_API_KEY", "test-key")
+    monkeypatch.setitem(main.router.adapters, "claude", FakeStreamingAdapter())
+    main.key_registry.load()
+    return TestClient(main.app)
+
+
+def _sse_frames(body):
+    frames = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        frames.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return frames
+
+
+def test_sse_streams_tokens_then_done(client):
+    resp = client.post(
+        "/oracle/stream",
+        json=ORACLE_REQUEST,
+        headers={"X-API-Key": "test-key"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+
+    frames = _sse_frames(resp.text)
+    assert [e for e, _ in frames] == ["token", "token", "token", "done"]
+    done = frames[-1][1]
+    assert done["text"] == "the mirror speak"
+    assert done["traceId"] and done["metadata"]["provider"] == "claude"
+    assert done["metadata"]["ttft_ms"] is not None
+
+
+def test_websocket_streams_tokens_then_done(client):
+    with client.websocket_connect("/oracle/stream") as ws:
+        ws.send_json({"api_key": "test-key", "request": ORACLE_REQUEST})
+        frames = [ws.receive_json() for _ in range(4)]
+
+    assert [f["type"] for f in frames] == ["token", "token", "token", "done"]
+    assert frames[-1]["text"] == "the mirror speak"
+
+
+def test_websocket_rejects_bad_key(client):
+    with client.websocket_connect("/oracle/stream") as ws:
+        ws.send_json({"api_key": "wrong", "request": ORACLE_REQUEST})
+        assert ws.receive_json()["code"] == 401
+
+
+
+def test_streams_are_charged_to_the_key_budget(client, monkeypatch):
+    adapter = main.router.adapters["claude"]
+    monkeypatch.setattr(adapter, "meter", UsageMeter(budgets={"*": 200}))
+    monkeypatch.setattr(adapter, "max_tokens", 150)
+
+    first = _sse_frames(client.post(
+        "/oracle/stream", json=ORACLE_REQUEST, headers={"X-API-Key": "test-key"},
+    ).text)
+    assert first[-1][0] == "done"
+    spent = adapter.meter.snapshot()["api_keys"][key_id("test-key")]
+    assert spent["requests"] == 1 and spent["completion_tokens"] > 0
+    assert adapter.meter.remaining(key_id("test-key")) == 200 - spent["total_tokens"]
+
+    adapter.meter.record("claude", key_id("test-key"), None, completion_tokens=190)
+    with client.websocket_connect("/oracle/stream") as ws:
+        ws.send_json({"api_key": "test-key", "request": ORACLE_REQUEST})
+        frame = ws.receive_json()
+    assert frame["type"] == "error" and frame["code"] == "budget_exceeded"
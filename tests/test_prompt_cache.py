@@ -0,0 +1,156 @@
+import asyncio
+from types import SimpleNamespace
+
+from mirrornode.core.adapters.claude import ClaudeAdapter
+from mirrornode.core.adapters.gpt import GptAdapter
+from mirrornode.core.events.schema import create_event, EventType
+
+CANON = "You are Merlin, sovereign orchestrator. " * 50
+
+
+class FakeAnthropic:
+    """Stand-in for AsyncAnthropic that caches system prefixes marked with cache_control."""
+
+    def __init__(self):
+        self.requests = []
+        self.cached = set()
+        self.messages = SimpleNamespace(create=self.create)
+
+    async def create(self, **request):
+        self.requests.append(request)
+        prefix, cacheable = "", None
+        for block in request.get("system", []):
+            prefix += block["text"]
+            if "cache_control" in block:
+                cacheable = prefix
+        prefix_tokens = len(cacheable or "") // 4
+        read = prefix_tokens if cacheable in self.cached else 0
+        write = prefix_tokens - read if cacheable else 0
+        if cacheable:
+            self.cached.add(cacheable)
+        user = request["messages"][-1]["content"]
+        usage = SimpleNamespace(
+            input_tokens=len(user) // 4 + (len(prefix) // 4 - prefix_tokens),
+            output_tokens=3,
+            cache_creation_input_tokens=write,
+            cache_read_input_tokens=read,
+        )
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="ok")], model=request["model"], usage=usage
+        )
+
+
+class FakeOpenAI:
+    def __init__(self):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        self.requests.append(request)
+        usage = SimpleNamespace(
+            prompt_tokens=100, completion_tokens=3, total_tokens=103,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=64),
+        )
+        message = SimpleNamespace(content="ok")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)], model=request["model"], usage=usage
+        )
+
+
+def _event(**payload):
+    return create_event(
+        event_type=EventType.INTEGRATION,
+        node="test-node",
+        source={"node": "terminal", "surface": "cli", "origin": "tests"},
+        payload=payload,
+    )
+
+
+def test_claude_marks_static_prefix_and_reads_it_back(monkeypatch):
+    fake = FakeAnthropic()
+    monkeypatch.setattr(ClaudeAdapter, "client", property(lambda self: fake))
+    adapter = ClaudeAdapter()
+
+    async def run():
+        first = await adapter.handle(_event(system=[CANON, "Be brief."], prompt="hi"))
+        second = await adapter.handle(_event(system=[CANON, "Be brief."], prompt="again"))
+        return first, second
+
+    first, second = asyncio.run(run())
+    request = fake.requests[0]
+    assert [b["text"] for b in request["system"]] == [CANON, "Be brief."]
+    assert "cache_control" not in request["system"][0]
+    assert request["system"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert request["messages"] == [{"role": "user", "content": "hi"}]
+
+    assert first.payload["cached_tokens"] == 0
+    assert second.payload["cached_tokens"] > 0
+    assert second.payload["prompt_tokens"] == second.payload["cached_tokens"] + 1
+
+
+def test_claude_without_system_sends_plain_request(monkeypatch):
+    fake = FakeAnthropic()
+    monkeypatch.setattr(ClaudeAdapter, "client", property(lambda self: fake))
+
+    response = asyncio.run(ClaudeAdapter().handle(_event(prompt="hi")))
+    assert response.ok
+    assert "system" not in fake.requests[0]
+
+
+def test_agent_canon_prompt_leads_gpt_messages(monkeypatch, tmp_path):
+    handbook = tmp_path / "prompts.md"
+    handbook.write_text("### Merlin\n```\n" + CANON + "\n```\n")
+    monkeypatch.setattr("mirrornode.core.prompt_loader.PROMPT_CACHE_FILE", handbook)
+    fake = FakeOpenAI()
+    monkeypatch.setattr(GptAdapter, "client", property(lambda self: fake))
+
+    response = asyncio.run(GptAdapter().handle(_event(agent="merlin", message="hi")))
+
+    messages = fake.requests[0]["messages"]
+    assert messages[0] == {"role": "system", "content": CANON.strip()}
+    assert messages[-1] == {"role": "user", "content": "hi"}
+    assert response.payload["cached_tokens"] == 64
+
+
+def test_unknown_agent_is_an_error_envelope(monkeypatch, tmp_path):
+    handbook = tmp_path / "prompts.md"
+    handbook.write_text("### Merlin\n```\nx\n```\n")
+    monkeypatch.setattr("mirrornode.core.prompt_loader.PROMPT_CACHE_FILE", handbook)
+    monkeypatch.setattr(
+        "mirrornode.core.prompt_loader.requests.get",
+        lambda url, headers=None, timeout=None: SimpleNamespace(
+            status_code=200, headers={}, text=handbook.read_text(),
+            raise_for_status=lambda: None,
+        ),
+    )
+
+    response = asyncio.run(GptAdapter().handle(_event(agent="nobody", prompt="hi")))
+    assert response.error["code"] == "prompt_not_found"
+
+
+def test_system_payload_reaches_every_registered_adapter(monkeypatch):
+    from mirrornode.core.bridge.router import EventRouter
+    from mirrornode.core.orchestrator import ADAPTERS
+
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    router = EventRouter(history_size=1)
+    for name, adapter in ADAPTERS.items():
+        router.register_adapter(name, adapter())
+
+    async def run():
+        return [
+            await router.dispatch(_event(system=["Be brief."], prompt=f"hi {i}"), record=False)
+            for i in range(6)
+        ]
+
+    rounds = asyncio.run(run())
+    router.close()
+
+    for outcomes in rounds:
+        assert set(outcomes) == set(ADAPTERS)
+        for name, outcome in outcomes.items():
+            response = outcome["result"]
+            code = (response.error or {}).get("code")
+            assert code not in ("unknown_error", "circuit_open"), (name, response.error)
+    assert rounds[-1]["grok"]["status"] == "ok" and rounds[-1]["theia"]["status"] == "ok"
@@ -0,0 +1,122 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mirrornode.core import prompt_loader
+from mirrornode.core.prompt_loader import PromptHandbook
+
+HANDBOOK = "### Merlin\n```\nYou are the sovereign orchestrator.\n```\n### Thoth\n```\nScribe.\n```\n"
+
+
+class FakeGist:
+    def __init__(self, text=HANDBOOK, etag='"v1"'):
+        self.text, self.etag = text, etag
+        self.requests = []
+        self.offline = False
+        self.gate = None  # threading.Event holding responses back
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if self.gate is not None:
+            self.gate.wait(2)
+        if self.offline:
+            raise ConnectionError("offline")
+        if headers and headers.get("If-None-Match") == self.etag:
+            return SimpleNamespace(status_code=304, headers={"ETag": self.etag}, text="")
+        return SimpleNamespace(
+            status_code=200, headers={"ETag": self.etag}, text=self.text,
+            raise_for_status=lambda: None,
+        )
+
+
+@pytest.fixture
+def gist(monkeypatch):
+    fake = FakeGist()
+    monkeypatch.setattr(prompt_loader.requests, "get", fake.get)
+    return fake
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_cold_fetch_persists_and_later_lookups_stay_local(gist, tmp_path):
+    cache = tmp_path / "cache" / "prompts.md"
+    book = PromptHandbook(cache, ttl=60)
+
+    assert "sovereign orchestrator" in book.get("merlin")
+    assert book.get("thoth") == "Scribe."
+    assert len(gist.requests) == 1
+    assert cache.read_text() == HANDBOOK
+    assert list(cache.parent.iterdir()) == [cache, cache.with_name("prompts.md.meta")]
+
+    # a new process starts from disk, with the validators, and no fetch
+    restarted = PromptHandbook(cache, ttl=60)
+    assert restarted.get("merlin") == book.get("merlin")
+    assert restarted._etag == '"v1"'
+    assert len(gist.requests) == 1
+
+
+def test_stale_handbook_is_served_while_revalidating(gist, tmp_path):
+    book = PromptHandbook(tmp_path / "prompts.md", ttl=0)
+    book.get("merlin")
+    gist.text = HANDBOOK.replace("Scribe.", "Keeper of records.")
+    gist.etag = '"v2"'
+    gist.gate = threading.Event()
+
+    assert book.get("thoth") == "Scribe."  # stale copy, revalidation in background
+    gist.gate.set()
+    _wait_for(lambda: book._prompts["thoth"] != "Scribe.")
+    assert book.get("thoth") == "Keeper of records."
+    assert gist.requests[1] == {"If-None-Match": '"v1"'}
+
+
+def test_not_modified_keeps_prompts(gist, tmp_path):
+    book = PromptHandbook(tmp_path / "prompts.md", ttl=60)
+    book.get("merlin")
+    assert book.refresh() is False
+    assert book.get("thoth") == "Scribe."
+
+
+def test_offline_falls_back_to_disk(gist, tmp_path):
+    cache = tmp_path / "prompts.md"
+    cache.write_text(HANDBOOK)
+    gist.offline = True
+
+    book = PromptHandbook(cache, ttl=0)
+    assert book.get("thoth") == "Scribe."
+    assert book.refresh() is False
+
+    with pytest.raises(RuntimeError):
+        PromptHandbook(tmp_path / "missing.md").get("merlin")
+
+
+def test_unknown_agent_rechecks_only_when_stale(gist, tmp_path):
+    book = PromptHandbook(tmp_path / "prompts.md", ttl=60)
+    with pytest.raises(ValueError):
+        book.get("nobody")
+    with pytest.raises(ValueError):
+        book.get("nobody")
+    assert len(gist.requests) == 1
+
+
+def test_seed_serves_a_cold_start_and_is_never_written(gist, tmp_path):
+    seed = tmp_path / "prompts.md"
+    seed.write_text(HANDBOOK.replace("Scribe.", "Seeded scribe."))
+    cache = tmp_path / "prompts.local.md"
+    gist.offline = True
+
+    book = PromptHandbook(cache, ttl=60, seed_file=seed)
+    assert book.get("thoth") == "Seeded scribe."
+    assert not cache.exists()
+    _wait_for(lambda: not book._refreshing)  # the seed is stale: one offline revalidation
+
+    gist.offline = False
+    assert book.refresh() is True
+    assert book.get("thoth") == "Scribe."
+    assert cache.read_text() == HANDBOOK
+    assert "Seeded scribe." in seed.read_text()
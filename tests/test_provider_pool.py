@@ -0,0 +1,143 @@
+import asyncio
+
+from mirrornode.core.adapters.base import BaseAdapter
+from mirrornode.core.adapters.http import close_http_client, shared_http_client
+from mirrornode.core.adapters.resilience import Admission, CircuitBreaker, CircuitState, RetryPolicy
+from mirrornode.core.contracts.adapter_response import AdapterStatus
+
+
+def test_shared_client_is_per_loop_and_reused():
+    async def grab():
+        first, second = shared_http_client(), shared_http_client()
+        assert first is second
+        await close_http_client()
+        assert first.is_closed
+        return first
+
+    assert asyncio.run(grab()) is not asyncio.run(grab())
+
+
+class AsyncEcho(BaseAdapter):
+    async def _ainvoke(self, prompt, system=()):
+        if prompt == "fail":
+            raise RuntimeError("429 quota")
+        return {"content": prompt, "model": "echo", "tokens_used": 1}
+
+
+class BlockingEcho(BaseAdapter):
+    def _invoke(self, prompt, system=()):
+        return {"content": prompt, "model": "echo", "tokens_used": 1}
+
+
+def test_ainvoke_wraps_native_and_blocking_adapters():
+    async def run():
+        return (
+            await AsyncEcho("a").ainvoke("hi"),
+            await AsyncEcho("a").ainvoke("fail"),
+            await BlockingEcho("b").ainvoke("hi"),
+        )
+
+    ok, failed, threaded = asyncio.run(run())
+    assert ok.status == AdapterStatus.OK and ok.payload["content"] == "hi"
+    assert failed.status == AdapterStatus.ERROR and failed.error["code"] == "quota_exceeded"
+    assert threaded.status == AdapterStatus.OK
+
+
+class Flaky(BaseAdapter):
+    def __init__(self, errors, **kwargs):
+        super().__init__("flaky", **kwargs)
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def _ainvoke(self, prompt, system=()):
+        self.calls += 1
+        if self.errors:
+            raise RuntimeError(self.errors.pop(0))
+        return {"content": "ok", "model": "flaky", "tokens_used": 1}
+
+
+def test_transient_errors_are_retried():
+    adapter = Flaky(["timeout", "timeout"], retry=RetryPolicy(attempts=3, base_delay=0))
+    resp = asyncio.run(adapter.ainvoke("hi"))
+    assert resp.status == AdapterStatus.OK and adapter.calls == 3
+
+
+def test_quota_error_opens_circuit_and_fails_fast(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("mirrornode.core.adapters.resilience.time.monotonic", lambda: now[0])
+    adapter = Flaky(["429 quota"], breaker=CircuitBreaker(max_open=60))
+
+    first = asyncio.run(adapter.ainvoke("hi"))
+    assert first.error["code"] == "quota_exceeded"
+    assert adapter.breaker.state is CircuitState.OPEN
+
+    blocked = asyncio.run(adapter.ainvoke("hi"))
+    assert blocked.status == AdapterStatus.UNAVAILABLE
+    assert blocked.error == {"code": "circuit_open", "message": "circuit open for flaky", "retry_after": 60}
+    assert adapter.calls == 1
+
+    now[0] += 61  # half-open probe succeeds and closes the circuit
+    assert asyncio.run(adapter.ainvoke("hi")).status == AdapterStatus.OK
+    assert adapter.breaker.state is CircuitState.CLOSED
+
+
+def test_consecutive_failures_trip_threshold():
+    adapter = Flaky(["boom"] * 3, breaker=CircuitBreaker(failure_threshold=3))
+    for _ in range(3):
+        asyncio.run(adapter.ainvoke("hi"))
+    assert adapter.breaker.state is CircuitState.OPEN
+    assert asyncio.run(adapter.ainvoke("hi")).error["code"] == "circuit_open"
+
+
+class Hanging(BaseAdapter):
+    async def _ainvoke(self, prompt, system=()):
+        if prompt == "hang":
+            await asyncio.sleep(10)
+        return {"content": prompt, "model": "hang", "tokens_used": 1}
+
+
+def test_cancelled_probe_releases_half_open_slot():
+    adapter = Hanging("hanging", breaker=CircuitBreaker(reset_timeout=0))
+    adapter.breaker.record_failure("quota_exceeded")  # open, probe due immediately
+
+    async def timed_out_probe():
+        try:
+            await asyncio.wait_for(adapter.ainvoke("hang"), 0.01)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(timed_out_probe())
+    assert adapter.breaker.state is CircuitState.HALF_OPEN
+    assert asyncio.run(adapter.ainvoke("hi")).status == AdapterStatus.OK
+    assert adapter.breaker.state is CircuitState.CLOSED
+
+
+def test_allow_reports_the_probe_slot():
+    breaker = CircuitBreaker(reset_timeout=0)
+    assert breaker.allow() is Admission.ALLOWED
+    breaker.record_failure("quota_exceeded")
+    assert breaker.allow() is Admission.PROBE
+    assert breaker.allow() is Admission.REFUSED and not Admission.REFUSED
+
+
+class Racing(CircuitBreaker):
+    """Lets a call through CLOSED, then another caller trips and probes."""
+
+    def allow(self):
+        admission = super().allow()
+        self.state = CircuitState.HALF_OPEN
+        self._probing = True
+        return admission
+
+
+def test_cancelled_call_keeps_another_callers_probe_slot():
+    adapter = Hanging("hanging", breaker=Racing())
+
+    async def timed_out_call():
+        try:
+            await asyncio.wait_for(adapter.ainvoke("hang"), 0.01)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(timed_out_call())
+    assert adapter.breaker._probing
@@ -0,0 +1,89 @@
+import asyncio
+
+from mirrornode.core.contracts.adapter_response import AdapterResponse, AdapterStatus
+from mirrornode.core.quorum import LatencyTracker, QuorumPolicy, gather_quorum
+
+
+def _ok(vote):
+    return AdapterResponse(status=AdapterStatus.OK, node_id="n", payload={"content": vote})
+
+
+def _voter(vote, delay, log=None):
+    async def call():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append(vote)
+            raise
+        return _ok(vote)
+    return call
+
+
+def test_first_n_agreeing_votes_win_and_losers_are_cancelled():
+    cancelled = []
+    calls = {
+        "a": _voter("yes", 0.01),
+        "b": _voter("no", 0.02),
+        "c": _voter(" YES ", 0.03),
+        "slow": _voter("yes", 5, cancelled),
+    }
+    outcome = asyncio.run(gather_quorum(calls, QuorumPolicy(quorum=2)))
+
+    assert outcome.quorum_met and outcome.winning_vote == "yes"
+    assert set(outcome.responses) == {"a", "b", "c"}
+    assert outcome.cancelled == 1 and cancelled == ["yes"]
+    assert outcome.elapsed_ms < 1000
+
+
+def test_deadline_decides_from_what_arrived():
+    calls = {"fast": _voter("yes", 0.01), "stuck": _voter("no", 5)}
+    outcome = asyncio.run(gather_quorum(calls, QuorumPolicy(deadline=0.1)))
+
+    assert outcome.timed_out
+    assert list(outcome.responses) == ["fast"]
+    assert outcome.winning_vote == "yes"
+
+
+def test_slow_provider_is_hedged_past_its_p95():
+    latencies = LatencyTracker()
+    for _ in range(20):
+        latencies.record("p", 0.01)
+    delays = [5, 0.01]  # primary hangs, hedge is fast
+
+    async def call():
+        await asyncio.sleep(delays.pop(0))
+        return _ok("ok")
+
+    policy = QuorumPolicy(hedge=True, deadline=1)
+    outcome = asyncio.run(gather_quorum({"p": call}, policy, latencies))
+
+    assert not outcome.timed_out
+    assert outcome.responses["p"].payload == {"content": "ok"}
+
+
+def test_near_identical_votes_agree():
+    calls = {
+        "a": _voter("The answer is 42.", 0.01),
+        "b": _voter("The answer is 42", 0.02),
+        "c": _voter("Paris is the capital", 0.03),
+    }
+    outcome = asyncio.run(gather_quorum(calls, QuorumPolicy(quorum=2)))
+
+    assert outcome.quorum_met and outcome.agreeing == 2
+    assert outcome.winning_vote == "the answer is 42."
+    assert "c" not in outcome.responses
+
+
+def test_failed_envelopes_do_not_count_as_latency_samples():
+    latencies = LatencyTracker()
+
+    async def refused():
+        return AdapterResponse(
+            status=AdapterStatus.UNAVAILABLE, node_id="n", payload={},
+            error={"code": "circuit_open", "message": "circuit open"},
+        )
+
+    asyncio.run(gather_quorum({"p": refused, "q": _voter("yes", 0)}, QuorumPolicy(), latencies))
+    assert latencies.quantile("p", 0.5) is None
+    assert latencies.quantile("q", 0.5) is not None
@@ -0,0 +1,94 @@
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from mirrornode.core.bridge.ratelimit import (
+    BucketSpec,
+    MemoryBucketStore,
+    RouteRateLimiter,
+    SQLiteBucketStore,
+    create_bucket_store,
+    key_id,
+)
+
+
+def test_bucket_spec_parse():
+    spec = BucketSpec.parse("30/minute")
+    assert spec.burst == 30 and spec.rate == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        BucketSpec.parse("lots")
+
+
+def test_sqlite_buckets_are_shared_between_workers(tmp_path):
+    spec = BucketSpec.parse("3/hour")
+    worker_a = SQLiteBucketStore(tmp_path, shards=2)
+    worker_b = SQLiteBucketStore(tmp_path, shards=2)
+
+    results = [
+        store.acquire("oracle:k", spec)[0]
+        for store in (worker_a, worker_b, worker_a, worker_b)
+    ]
+    assert results == [True, True, True, False]
+    assert worker_b.acquire("oracle:other", spec)[0]
+
+
+def test_route_limits_charge_per_key_with_overrides():
+    limiter = RouteRateLimiter(
+        MemoryBucketStore(),
+        routes={"oracle": "1/minute"},
+        overrides={key_id("vip"): {"oracle": "5/minute"}},
+    )
+    limiter.check("oracle", key_id("alice"))
+    with pytest.raises(HTTPException) as exc:
+        limiter.check("oracle", key_id("alice"))
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "60"
+
+    limiter.check("oracle", key_id("bob"))
+    for _ in range(5):
+        limiter.check("oracle", key_id("vip"))
+
+
+def test_sqlite_acquire_runs_off_the_event_loop(tmp_path):
+    store = SQLiteBucketStore(tmp_path, shards=1)
+    threads = []
+    acquire = store.acquire
+    store.acquire = lambda *a: threads.append(threading.get_ident()) or acquire(*a)
+    limiter = RouteRateLimiter(store, routes={"oracle": "2/minute"})
+
+    async def run():
+        await asyncio.gather(*(limiter.acheck("oracle", "k") for _ in range(2)))
+        with pytest.raises(HTTPException):
+            await limiter.acheck("oracle", "k")
+
+    asyncio.run(run())
+    assert len(threads) == 3 and threading.get_ident() not in threads
+
+
+def test_sqlite_uri_paths_follow_sqlalchemy(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert create_bucket_store("sqlite:///limits").directory == Path("limits")
+    absolute = create_bucket_store(f"sqlite:///{tmp_path}/abs")
+    assert absolute.directory == tmp_path / "abs"
+    assert (tmp_path / "limits").is_dir()
+
+
+def test_locked_sqlite_store_answers_429(tmp_path):
+    store = SQLiteBucketStore(tmp_path, shards=1)
+    store._conns[0].execute("PRAGMA busy_timeout=10")
+    other = sqlite3.connect(tmp_path / "buckets-0.db", isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")  # another worker holds the write lock
+    limiter = RouteRateLimiter(store, routes={"oracle": "2/minute"})
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(limiter.acheck("oracle", "k"))
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "1"
+
+    other.execute("ROLLBACK")
+    asyncio.run(limiter.acheck("oracle", "k"))
+    other.close()
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import time
+
+from mirrornode.core.bridge.replay import EventReplayer
+from mirrornode.core.bridge.router import EventRouter
+from mirrornode.core.events.log import EventLog
+from mirrornode.core.events.schema import create_event, EventType
+
+SOURCE = {"node": "test", "surface": "cli", "origin": "pytest"}
+
+
+def _persist(tmp_path, trace_ids):
+    log = EventLog(tmp_path / "log", flush_interval=0.001)
+    router = EventRouter(event_log=log)
+    for i, trace_id in enumerate(trace_ids):
+        event = create_event(EventType.ANALYSIS, "osiris", SOURCE, payload={"n": i}, trace_id=trace_id)
+        asyncio.run(router.dispatch(event))
+    log.flush()
+    router.close()
+    return EventLog(tmp_path / "log")
+
+
+def _target():
+    seen = []
+    router = EventRouter()
+    router.register_adapter("probe", lambda event: seen.append(event.payload["n"]))
+    router.register_adapter("other", lambda event: None)
+    return router, seen
+
+
+def test_replay_dedupes_and_checkpoints(tmp_path):
+    log = _persist(tmp_path, ["t-1", "t-2", "t-1", "t-3"])
+    router, seen = _target()
+    checkpoint = tmp_path / "replay.json"
+
+    replayer = EventReplayer(log, router, speed=None, adapters=["probe"], checkpoint_path=checkpoint)
+    stats = asyncio.run(replayer.run())
+    assert (stats.replayed, stats.duplicates) == (3, 1)
+    assert sorted(seen) == [0, 1, 3]
+    assert len(router.history) == 0
+    assert json.loads(checkpoint.read_text())["replayed"] == 3
+
+    # resuming from the checkpoint has nothing left to send
+    again = EventReplayer(log, router, speed=None, checkpoint_path=checkpoint)
+    assert asyncio.run(again.run()).replayed == 0
+    router.close()
+    log.close()
+
+
+def test_resumed_replay_remembers_trace_ids_from_before_the_checkpoint(tmp_path):
+    log = _persist(tmp_path, ["t-1", "t-2"])
+    router, seen = _target()
+    checkpoint = tmp_path / "replay.json"
+    asyncio.run(EventReplayer(log, router, speed=None, checkpoint_path=checkpoint).run())
+    log.close()
+
+    log = _persist(tmp_path, ["t-1", "t-3"])  # t-1 redelivered after the checkpoint
+    stats = asyncio.run(EventReplayer(log, router, speed=None, checkpoint_path=checkpoint).run())
+    assert (stats.replayed, stats.duplicates) == (1, 1)
+    assert (tmp_path / "replay.json.seen.0").read_text().split() == ["t-1", "t-2", "t-3"]
+    router.close()
+    log.close()
+
+
+def test_checkpoints_append_the_dedupe_window_and_drop_torn_tails(tmp_path):
+    log = _persist(tmp_path, ["t-1", "t-2", "t-3", "t-4"])
+    router, seen = _target()
+    checkpoint = tmp_path / "replay.json"
+    sidecar = tmp_path / "replay.json.seen.0"
+    asyncio.run(EventReplayer(log, router, speed=None, checkpoint_path=checkpoint, checkpoint_every=1).run())
+    assert sidecar.read_text().split() == ["t-1", "t-2", "t-3", "t-4"]
+    assert "seen" not in json.loads(checkpoint.read_text())
+    log.close()
+
+    # a crash after appending to the sidecar but before the checkpoint
+    # was replaced must not turn the next event into a duplicate
+    with sidecar.open("a") as fh:
+        fh.write("t-5\n")
+    log = _persist(tmp_path, ["t-5"])
+    stats = asyncio.run(EventReplayer(log, router, speed=None, checkpoint_path=checkpoint).run())
+    assert (stats.replayed, stats.duplicates) == (1, 0)
+    assert sidecar.read_text().split() == ["t-1", "t-2", "t-3", "t-4", "t-5"]
+    router.close()
+    log.close()
+
+
+def test_dedupe_sidecar_is_compacted(tmp_path):
+    log = _persist(tmp_path, [f"t-{i}" for i in range(7)])
+    router, seen = _target()
+    checkpoint = tmp_path / "replay.json"
+    replayer = EventReplayer(
+        log, router, speed=None, checkpoint_path=checkpoint, checkpoint_every=1, dedupe_window=2,
+    )
+    asyncio.run(replayer.run())
+    sidecars = sorted(tmp_path.glob("replay.json.seen.*"))
+    assert len(sidecars) == 1
+    assert len(sidecars[0].read_text().split()) <= 4
+    assert sidecars[0].read_text().split()[-2:] == ["t-5", "t-6"]
+    router.close()
+    log.close()
+
+
+def test_resumes_from_a_checkpoint_with_an_inline_window(tmp_path):
+    log = _persist(tmp_path, ["t-1", "t-2"])
+    router, seen = _target()
+    checkpoint = tmp_path / "replay.json"
+    asyncio.run(EventReplayer(log, router, speed=None, checkpoint_path=checkpoint).run())
+    data = json.loads(checkpoint.read_text())
+    data["seen"] = ["t-1", "t-2"]
+    del data["seen_gen"], data["seen_bytes"]
+    checkpoint.write_text(json.dumps(data))
+    log.close()
+
+    log = _persist(tmp_path, ["t-2", "t-3"])
+    stats = asyncio.run(EventReplayer(log, router, speed=None, checkpoint_path=checkpoint).run())
+    assert (stats.replayed, stats.duplicates) == (1, 1)
+    gen = json.loads(checkpoint.read_text())["seen_gen"]
+    assert (tmp_path / f"replay.json.seen.{gen}").read_text().split() == ["t-1", "t-2", "t-3"]
+    router.close()
+    log.close()
+
+
+def test_replay_trace_selection_and_speed(tmp_path):
+    log = _persist(tmp_path, ["t-1", "t-2", "t-3"])
+    router, seen = _target()
+
+    start = time.perf_counter()
+    stats = asyncio.run(EventReplayer(log, router, speed=10.0).run(trace_ids=["t-2", "t-3"]))
+    assert stats.replayed == 2
+    assert sorted(seen) == [1, 2]
+    assert time.perf_counter() - start < 1.0
+    router.close()
+    log.close()
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from mirrornode.core.bridge.cache import ResponseCache, oracle_cache_key
+
+
+def test_cache_key_ignores_cosmetic_differences():
+    a = oracle_cache_key("oracle", "  What  is\nnext? ", "open", {"b": 1, "a": 2})
+    b = oracle_cache_key("oracle", "What is next?", "open", {"a": 2, "b": 1})
+    assert a == b
+    assert a != oracle_cache_key("shadow", "What is next?", "open", {"a": 2, "b": 1})
+
+
+def test_concurrent_misses_share_one_call():
+    cache = ResponseCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"text": "answer"}
+
+    async def main():
+        first = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+        again = await cache.get_or_compute("k", compute)
+        return first, again
+
+    first, again = asyncio.run(main())
+    assert len(calls) == 1
+    assert sorted(status for _, status in first) == ["coalesced"] * 4 + ["miss"]
+    assert again == ({"text": "answer"}, "hit")
+
+
+def test_failures_are_not_cached():
+    cache = ResponseCache()
+
+    async def boom():
+        raise RuntimeError("provider down")
+
+    async def ok():
+        return {"text": "fine"}
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("k", boom)
+        return await cache.get_or_compute("k", ok)
+
+    assert asyncio.run(main()) == ({"text": "fine"}, "miss")
+
+
+def test_lru_and_byte_cap_evict_oldest():
+    cache = ResponseCache(max_entries=2, max_bytes=10_000)
+    cache.put("a", {"text": "a"})
+    cache.put("b", {"text": "b"})
+    cache.get("a")
+    cache.put("c", {"text": "c"})
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+
+    small = ResponseCache(max_bytes=40)
+    small.put("x", {"text": "x" * 20})
+    small.put("y", {"text": "y" * 20})
+    assert small.get("x") is None and small.get("y")
+    assert small.stats()["bytes"] <= 40
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("mirrornode.core.bridge.cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=10)
+    cache.put("k", {"text": "v"})
+    now[0] += 11
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cancelling_the_leader_leaves_waiters_their_answer():
+    cache = ResponseCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"text": "answer"}
+
+    async def main():
+        leader = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.get_or_compute("k", compute)) for _ in range(3)]
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters), cache.get("k")
+
+    results, cached = asyncio.run(main())
+    assert results == [({"text": "answer"}, "coalesced")] * 3
+    assert cached == {"text": "answer"} and len(calls) == 1
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import signal
+import threading
+
+import pytest
+
+from mirrornode.core.bridge.ratelimit import key_id
+from mirrornode.core.bridge.security import KeyRegistry
+
+
+def _write_keys(path, entries):
+    path.write_text(json.dumps(entries), encoding="utf-8")
+
+
+def test_env_key_and_file_keys_verify(tmp_path, monkeypatch):
+    monkeypatch.setenv("MIRRORNODE_API_KEY", "env-secret")
+    keys = tmp_path / "keys.json"
+    _write_keys(keys, [
+        {"name": "hud", "key": "hud-secret", "scopes": ["events", "stream"]},
+        {"name": "ops", "sha256": hashlib.sha256(b"ops-secret").hexdigest(),
+         "quotas": {"oracle": "100/minute"}},
+    ])
+    registry = KeyRegistry(keys_file=str(keys))
+
+    assert registry.verify("env-secret").allows("oracle")
+    hud = registry.verify("hud-secret")
+    assert hud.name == "hud" and hud.allows("stream") and not hud.allows("oracle")
+    assert registry.verify("ops-secret").key_id == key_id("ops-secret")
+    assert registry.verify("nope") is None
+    assert registry.quotas() == {key_id("ops-secret"): {"oracle": "100/minute"}}
+
+
+def test_reload_revokes_cached_keys(tmp_path, monkeypatch):
+    monkeypatch.delenv("MIRRORNODE_API_KEY", raising=False)
+    keys = tmp_path / "keys.json"
+    _write_keys(keys, [{"name": "a", "key": "a-secret"}])
+    registry = KeyRegistry(keys_file=str(keys), check_interval=0)
+    reloads = []
+    registry.on_reload(lambda r: reloads.append(len(r.quotas())))
+
+    assert registry.verify("a-secret") is not None
+    _write_keys(keys, [{"name": "b", "key": "b-secret"}])
+    registry.load()  # what SIGHUP or an mtime change triggers
+
+    assert registry.verify("a-secret") is None
+    assert registry.verify("b-secret").name == "b"
+    assert len(reloads) == 2
+
+
+def test_verify_keeps_no_plaintext_keys(tmp_path, monkeypatch):
+    monkeypatch.delenv("MIRRORNODE_API_KEY", raising=False)
+    keys = tmp_path / "keys.json"
+    _write_keys(keys, [{"name": "a", "key": "a-secret"}, {"name": "b", "key": "b-secret"}])
+    registry = KeyRegistry(keys_file=str(keys))
+
+    for _ in range(3):
+        assert registry.verify("a-secret").name == "a"
+        assert registry.verify("a-secreT") is None
+    assert "a-secret" not in repr(vars(registry))
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="POSIX only")
+def test_sighup_while_lock_is_held_reloads_without_deadlock(tmp_path, monkeypatch):
+    monkeypatch.delenv("MIRRORNODE_API_KEY", raising=False)
+    keys = tmp_path / "keys.json"
+    _write_keys(keys, [{"name": "a", "key": "a-secret"}])
+    registry = KeyRegistry(keys_file=str(keys), check_interval=0)
+    reloaded = threading.Event()
+    registry.on_reload(lambda r: reloaded.set())
+    previous = signal.getsignal(signal.SIGHUP)
+    try:
+        registry.install_sighup()
+        _write_keys(keys, [{"name": "b", "key": "b-secret"}])
+        with registry._lock:  # the handler interrupts a thread mid-load
+            os.kill(os.getpid(), signal.SIGHUP)
+            assert not reloaded.wait(0.05)
+        assert reloaded.wait(2)
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+
+    assert registry.verify("b-secret").name == "b"
+
+
+def test_no_keys_configured_is_an_error(monkeypatch):
+    monkeypatch.delenv("MIRRORNODE_API_KEY", raising=False)
+    with pytest.raises(RuntimeError):
+        KeyRegistry().verify("anything")